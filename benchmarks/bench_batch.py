@@ -0,0 +1,55 @@
+# benchmarks/bench_batch.py
+# Compara chamadas individuais com as APIs em lote (combine_orders_many e
+# get_top_N_many) em milhares de jobs pequenos, em série e com pools.
+#
+# Uso: python benchmarks/bench_batch.py [jobs]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.contract import Contract
+from src.contracts import Contracts
+from src.orders import Orders
+
+EXECUTORS = [None, 'thread', 'process']
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    rng = random.Random(1)
+
+    packing_jobs = [([rng.randint(1, 500) for _ in range(rng.randint(20, 200))], 1000)
+                    for _ in range(count)]
+    renegotiated = list(range(0, 100000, 7))
+    top_n_jobs = [([Contract(rng.randint(1, 100000), rng.randint(1, 10 ** 6)) for _ in range(100)],
+                   renegotiated, 10) for _ in range(count)]
+
+    orders = Orders()
+    contracts = Contracts()
+
+    print('{} jobs'.format(count))
+    print('{:>22} {:>12} {:>12}'.format('modo', 'combine', 'top N'))
+    print('{:>22} {:>11.3f}s {:>11.3f}s'.format(
+        'chamadas individuais',
+        timed(lambda: [orders.combine_orders(*job) for job in packing_jobs]),
+        timed(lambda: [contracts.get_top_N_open_contracts(*job) for job in top_n_jobs])))
+
+    for executor in EXECUTORS:
+        print('{:>22} {:>11.3f}s {:>11.3f}s'.format(
+            'lote ({})'.format(executor or 'série'),
+            timed(lambda: orders.combine_orders_many(packing_jobs, executor=executor)),
+            timed(lambda: contracts.get_top_N_many(top_n_jobs, executor=executor))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_combine_orders.py
+# Escalabilidade de Orders.combine_orders (First Fit Decreasing com árvore de
+# segmentos) de 1e3 a 1e6 pedidos, comparada à implementação original com
+# sum(group) enquanto ela terminar em tempo razoável.
+#
+# Uso: python benchmarks/bench_combine_orders.py [n_maximo]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.orders import Orders
+
+N_MAX = 1000
+# A implementação original é O(n² m); acima disso ela não termina em minutos.
+LEGACY_LIMIT = 10000
+
+
+def legacy_combine_orders(requests, n_max):
+    # Implementação original, com sum(group) para cada grupo candidato.
+    groups = []
+    for request in sorted(requests, reverse=True):
+        if request > n_max:
+            groups.append([request])
+            continue
+        for group in groups:
+            if sum(group) + request <= n_max:
+                group.append(request)
+                break
+        else:
+            groups.append([request])
+    return groups
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return time.perf_counter() - start, result
+
+
+def main():
+    largest = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(1)
+    orders = Orders()
+
+    print('{:>9} {:>9} {:>12} {:>12}'.format('n', 'grupos', 'árvore', 'original'))
+
+    n = 1000
+    while n <= largest:
+        requests = [rng.randint(1, N_MAX // 2) for _ in range(n)]
+        elapsed, groups = timed(lambda: orders.combine_orders(requests, N_MAX))
+
+        legacy = '-'
+        if n <= LEGACY_LIMIT:
+            legacy_elapsed, legacy_groups = timed(lambda: legacy_combine_orders(requests, N_MAX))
+            assert legacy_groups == groups
+            legacy = '{:.3f}s'.format(legacy_elapsed)
+
+        print('{:>9} {:>9} {:>11.3f}s {:>12}'.format(n, len(groups), elapsed, legacy))
+        n *= 10
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,81 @@
+# benchmarks/bench_contract_index.py
+# Carga mista de atualizações e consultas: ContractIndex (incremental) contra
+# recalcular get_top_N_open_contracts do zero a cada consulta.
+#
+# Uso: python benchmarks/bench_contract_index.py [n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.contract import Contract
+from src.contract_index import ContractIndex
+from src.contracts import Contracts
+
+ROUNDS = 20
+UPDATES_PER_ROUND = 2000
+TOP_N = 50
+
+
+def make_operations(n, seed=1):
+    # Gera as rodadas de operações: (tipo, id, débito).
+    rng = random.Random(seed)
+    rounds = []
+    for _ in range(ROUNDS):
+        operations = []
+        for _ in range(UPDATES_PER_ROUND):
+            contract_id = rng.randrange(n)
+            kind = rng.choice(('update', 'update', 'update', 'renegotiate', 'restore'))
+            operations.append((kind, contract_id, round(rng.paretovariate(1.5) * 100, 2)))
+        rounds.append(operations)
+    return rounds
+
+
+def run_index(contracts, rounds):
+    index = ContractIndex(contracts)
+    for operations in rounds:
+        for kind, contract_id, debt in operations:
+            if kind == 'update':
+                index.update_debt(contract_id, debt)
+            elif kind == 'renegotiate':
+                index.mark_renegotiated(contract_id)
+            else:
+                index.unmark_renegotiated(contract_id)
+        index.top_n(TOP_N)
+
+
+def run_recompute(contracts, rounds):
+    manager = Contracts()
+    renegotiated = set()
+    for operations in rounds:
+        for kind, contract_id, debt in operations:
+            if kind == 'update':
+                contracts[contract_id].debt = debt
+            elif kind == 'renegotiate':
+                renegotiated.add(contract_id)
+            else:
+                renegotiated.discard(contract_id)
+        manager.get_top_N_open_contracts(contracts, renegotiated, TOP_N)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    rng = random.Random(0)
+    debts = [round(rng.paretovariate(1.5) * 100, 2) for _ in range(n)]
+    rounds = make_operations(n)
+
+    print('n = {}, {} rodadas de {} alterações + top {}'.format(
+        n, ROUNDS, UPDATES_PER_ROUND, TOP_N))
+
+    for name, run in (('ContractIndex', run_index), ('recalcular', run_recompute)):
+        contracts = [Contract(i, debt) for i, debt in enumerate(debts)]
+        start = time.perf_counter()
+        run(contracts, rounds)
+        print('{:>14}: {:.2f}s'.format(name, time.perf_counter() - start))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+# benchmarks/bench_contract_memory.py
+# Compara bytes por contrato: classe com __dict__ (representação antiga),
+# Contract com __slots__ e ContractBatch colunar.
+#
+# Uso: python benchmarks/bench_contract_memory.py [n]
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.contract import Contract
+from src.contract_batch import ContractBatch
+
+
+class DictContract:
+    # Representação antiga de Contract, com __dict__ por instância.
+
+    def __init__(self, id, debt):
+        self.id = id
+        self.debt = debt
+
+
+def bytes_per_contract(build, n):
+    # Memória retida pela estrutura construída, dividida por n.
+    tracemalloc.start()
+    structure = build(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del structure
+    return current / n
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+
+    cases = [
+        ('dict (antigo)', lambda n: [DictContract(i, i * 1.5) for i in range(n)]),
+        ('__slots__', lambda n: [Contract(i, i * 1.5) for i in range(n)]),
+        ('ContractBatch', lambda n: ContractBatch(range(n), (i * 1.5 for i in range(n)), debt_typecode='d')),
+    ]
+
+    print('n = {}'.format(n))
+    for name, build in cases:
+        print('{:>15}: {:>7.1f} bytes/contrato'.format(name, bytes_per_contract(build, n)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+# benchmarks/bench_counting_packing.py
+# Compara o FFD por contagem (tamanhos inteiros repetidos) ao FFD geral em
+# distribuições com diferentes quantidades de tamanhos distintos, e confere
+# que os grupos são idênticos.
+#
+# Uso: python benchmarks/bench_counting_packing.py [n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.packing import LoadTree, PackingResult, build_groups, first_fit, pack
+
+N_MAX = 10000
+# (descrição, gerador de tamanho)
+DISTRIBUTIONS = [
+    ('10 tamanhos', lambda rng: rng.choice([50, 100, 250, 500, 1000, 1200, 2000, 2500, 4000, 5000])),
+    ('1..100', lambda rng: rng.randint(1, 100)),
+    ('1..1000', lambda rng: rng.randint(1, 1000)),
+    ('1..10000', lambda rng: rng.randint(1, 10000)),
+    ('cauda longa', lambda rng: min(int(rng.paretovariate(1.2) * 20), 20000)),
+]
+
+
+def general_ffd(requests, n_max):
+    # FFD geral (ordenação por comparação + árvore de segmentos), sem o caminho por contagem.
+    sizes = sorted(requests, reverse=True)
+    assignment, loads = first_fit(sizes, n_max, LoadTree(len(sizes)))
+    return PackingResult(build_groups(sizes, assignment, len(loads)), loads, n_max)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    print('{} pedidos, n_max = {}'.format(n, N_MAX))
+    print('{:>14} {:>10} {:>10} {:>10} {:>10} {:>9}'.format(
+        'distribuição', 'distintos', 'geral', 'pack', 'speedup', 'iguais'))
+
+    for name, size in DISTRIBUTIONS:
+        rng = random.Random(1)
+        requests = [size(rng) for _ in range(n)]
+
+        start = time.perf_counter()
+        expected = general_ffd(requests, N_MAX)
+        general_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        result = pack(requests, N_MAX)
+        pack_time = time.perf_counter() - start
+
+        print('{:>14} {:>10} {:>9.3f}s {:>9.3f}s {:>9.1f}x {:>9}'.format(
+            name, len(set(requests)), general_time, pack_time,
+            general_time / pack_time, str(result == expected)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+# benchmarks/bench_loaders.py
+# Mede a vazão (MB/s e linhas/s) da carga de contratos em CSV e JSONL:
+# laço ingênuo (uma linha por vez) contra loaders.read_contracts gerando
+# objetos Contract e lotes colunares.
+#
+# Uso: python benchmarks/bench_loaders.py [linhas]
+
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.contract import Contract
+from src.loaders import read_contracts
+
+
+def naive_csv(path):
+    with open(path, newline='') as file:
+        reader = csv.DictReader(file)
+        return [Contract(int(row['id']), float(row['debt'])) for row in reader]
+
+
+def naive_jsonl(path):
+    with open(path) as file:
+        return [Contract(item['id'], item['debt']) for item in map(json.loads, file)]
+
+
+def measure(name, path, function):
+    size = os.path.getsize(path) / 1e6
+    start = time.perf_counter()
+    rows = function(path)
+    elapsed = time.perf_counter() - start
+    print('{:>28} {:>9.1f} MB/s {:>12,.0f} linhas/s'.format(name, size / elapsed, rows / elapsed))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(1)
+    rows = [(rng.randint(1, 10 ** 9), rng.randint(1, 10 ** 7)) for _ in range(count)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, 'contracts.csv')
+        jsonl_path = os.path.join(directory, 'contracts.jsonl')
+        with open(csv_path, 'w') as file:
+            file.write('id,debt\n')
+            file.writelines('{},{}\n'.format(*row) for row in rows)
+        with open(jsonl_path, 'w') as file:
+            file.writelines('{{"id": {}, "debt": {}}}\n'.format(*row) for row in rows)
+
+        print('{} linhas'.format(count))
+        for label, path, naive in (('CSV', csv_path, naive_csv), ('JSONL', jsonl_path, naive_jsonl)):
+            measure(label + ' ingênuo', path, lambda p: len(naive(p)))
+            measure(label + ' read_contracts', path, lambda p: sum(1 for _ in read_contracts(p)))
+            measure(label + ' lotes colunares', path,
+                    lambda p: sum(len(batch) for batch in read_contracts(p, batches=True)))
+
+
+if __name__ == '__main__':
+    main()
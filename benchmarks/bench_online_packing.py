@@ -0,0 +1,41 @@
+# benchmarks/bench_online_packing.py
+# Compara o agrupamento online (com K grupos abertos) ao FFD offline:
+# número de grupos e tempo.
+#
+# Uso: python benchmarks/bench_online_packing.py [n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.orders import Orders
+
+N_MAX = 1000
+OPEN_GROUPS = [1, 4, 16, 64, 256]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = random.Random(1)
+    requests = [rng.randint(1, 500) for _ in range(n)]
+    orders = Orders()
+
+    start = time.perf_counter()
+    offline = len(orders.combine_orders(requests, N_MAX))
+    print('FFD offline: {} grupos em {:.3f}s'.format(offline, time.perf_counter() - start))
+    print('{:>8} {:>10} {:>12} {:>10}'.format('K', 'grupos', 'vs FFD', 'tempo'))
+
+    for open_groups in OPEN_GROUPS:
+        start = time.perf_counter()
+        count = sum(1 for _ in orders.combine_orders_stream(
+            iter(requests), N_MAX, max_open_groups=open_groups))
+        elapsed = time.perf_counter() - start
+        print('{:>8} {:>10} {:>+11.2%} {:>9.3f}s'.format(
+            open_groups, count, count / offline - 1, elapsed))
+
+
+if __name__ == '__main__':
+    main()
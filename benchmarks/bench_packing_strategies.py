@@ -0,0 +1,49 @@
+# benchmarks/bench_packing_strategies.py
+# Compara as estratégias de empacotamento de Orders nas mesmas entradas:
+# tempo de execução, número de grupos e taxa de ocupação.
+#
+# Uso: python benchmarks/bench_packing_strategies.py [n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.orders import Orders
+from src.packing import available_strategies
+
+N_MAX = 1000
+
+
+def workloads(n, seed=1):
+    # Distribuições de tamanhos de pedidos usadas na comparação.
+    rng = random.Random(seed)
+    return {
+        'uniforme 1-500': [rng.randint(1, 500) for _ in range(n)],
+        'pequenos 1-100': [rng.randint(1, 100) for _ in range(n)],
+        'grandes 300-700': [rng.randint(300, 700) for _ in range(n)],
+        'cauda longa': [min(N_MAX, int(rng.paretovariate(1.2) * 20)) for _ in range(n)],
+    }
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    orders = Orders()
+
+    for name, requests in workloads(n).items():
+        total = sum(requests)
+        print('\n{} (n = {}, limite = {})'.format(name, n, N_MAX))
+        print('{:>10} {:>10} {:>10} {:>10}'.format('estratégia', 'tempo', 'grupos', 'ocupação'))
+
+        for strategy in available_strategies():
+            start = time.perf_counter()
+            groups = orders.combine_orders(requests, N_MAX, strategy=strategy)
+            elapsed = time.perf_counter() - start
+            fill = total / (len(groups) * N_MAX)
+            print('{:>10} {:>9.3f}s {:>10} {:>9.1%}'.format(strategy, elapsed, len(groups), fill))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+# benchmarks/bench_pagination.py
+# Custo de buscar a página p de 100 contratos: top N com top_n = p * 100
+# seguido de fatia, contra o cursor (get_top_N_page) varrendo a lista e
+# sobre um ContractIndex, parado ou com um update_debt antes de cada página.
+#
+# Uso: python benchmarks/bench_pagination.py [n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks import workloads
+from src.contract_index import ContractIndex
+from src.contracts import Contracts
+
+PAGE_SIZE = 100
+PAGES = [1, 10, 100, 1000]
+
+
+def best_time(func, repeat=3):
+    # Menor tempo de várias execuções, em segundos.
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    contracts, renegotiated = workloads.contracts_workload(n)
+    api = Contracts()
+    index = ContractIndex(contracts, renegotiated)
+    start = time.perf_counter()
+    index.page(PAGE_SIZE)
+    ranking_time = time.perf_counter() - start
+
+    # Cursor de cada página, obtido percorrendo as páginas uma vez
+    cursors = {1: None}
+    page = api.get_top_N_page(index, [], PAGE_SIZE)
+    for number in range(2, max(PAGES) + 1):
+        cursors[number] = page.cursor
+        page = api.get_top_N_page(index, [], PAGE_SIZE, page.cursor)
+
+    print('n = {}, página de {} (ordenação do índice: {:.1f}ms, só na primeira página)'.format(
+        n, PAGE_SIZE, ranking_time * 1000))
+    print('{:>7} {:>14} {:>14} {:>14} {:>14}'.format(
+        'página', 'top N + fatia', 'cursor', 'cursor+índice', 'índice+update'))
+    rng = random.Random(2)
+
+    def update_and_page(cursor):
+        # Página do índice depois de uma alteração (carteira viva).
+        index.update_debt(rng.randrange(n), rng.randint(1, 10000))
+        return index.page(PAGE_SIZE, cursor)
+
+    for number in PAGES:
+        cursor = cursors[number]
+        offset = (number - 1) * PAGE_SIZE
+        sliced_time, _ = best_time(lambda: api.get_top_N_open_contracts(
+            contracts, renegotiated, number * PAGE_SIZE)[offset:])
+        scan_time, _ = best_time(lambda: api.get_top_N_page(
+            contracts, renegotiated, PAGE_SIZE, cursor))
+        index_time, _ = best_time(lambda: index.page(PAGE_SIZE, cursor))
+        live_time, _ = best_time(lambda: update_and_page(cursor))
+        print('{:>7} {:>12.2f}ms {:>12.2f}ms {:>12.3f}ms {:>12.3f}ms'.format(
+            number, sliced_time * 1000, scan_time * 1000, index_time * 1000, live_time * 1000))
+
+
+if __name__ == '__main__':
+    main()
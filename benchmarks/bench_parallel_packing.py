@@ -0,0 +1,42 @@
+# benchmarks/bench_parallel_packing.py
+# Speedup do modo paralelo (shards em ProcessPoolExecutor) sobre o FFD serial
+# e a variação no número de grupos.
+#
+# Uso: python benchmarks/bench_parallel_packing.py [n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.orders import Orders
+
+N_MAX = 1000
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    rng = random.Random(1)
+    requests = [rng.randint(1, 500) for _ in range(n)]
+    orders = Orders()
+
+    start = time.perf_counter()
+    serial_groups = len(orders.combine_orders(requests, N_MAX))
+    serial = time.perf_counter() - start
+    print('n = {}, FFD serial: {} grupos em {:.2f}s'.format(n, serial_groups, serial))
+    print('{:>8} {:>10} {:>9} {:>10}'.format('workers', 'tempo', 'speedup', 'grupos'))
+
+    workers = 1
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        groups = len(orders.combine_orders_parallel(requests, N_MAX, workers=workers, shards=max(2, workers)))
+        elapsed = time.perf_counter() - start
+        print('{:>8} {:>9.2f}s {:>8.2f}x {:>+10}'.format(
+            workers, elapsed, serial / elapsed, groups - serial_groups))
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
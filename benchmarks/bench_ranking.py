@@ -0,0 +1,76 @@
+# benchmarks/bench_ranking.py
+# Compara o ranking composto com filtros em uma passada (ranking.py) com a
+# forma encadeada: um filtro por passada seguido de sorted() com chave tupla.
+#
+# Uso: python benchmarks/bench_ranking.py [n] [top_n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.contracts import Contracts
+from src.ranking import Ranking, where
+
+REGIONS = ['SP', 'RJ', 'MG', 'RS', 'BA']
+
+
+class Account:
+    # Contrato com os campos usados pelas equipes de cobrança.
+
+    __slots__ = ('id', 'debt', 'days_overdue', 'region')
+
+    def __init__(self, id, debt, days_overdue, region):
+        self.id = id
+        self.debt = debt
+        self.days_overdue = days_overdue
+        self.region = region
+
+
+def best_time(func, repeat=3):
+    # Menor tempo de várias execuções, em segundos.
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def chained(accounts, renegotiated, top_n):
+    # Forma encadeada: exclusão, filtros e ordenação completa em passadas separadas.
+    selected = [account for account in accounts if account.id not in renegotiated]
+    selected = [account for account in selected if account.region == 'SP']
+    selected = [account for account in selected if account.debt >= 1000]
+    selected.sort(key=lambda account: (-account.debt, -account.days_overdue, account.id))
+    return selected[:top_n]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    top_n = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    rng = random.Random(1)
+    accounts = [Account(i, round(rng.paretovariate(1.2) * 300), rng.randint(0, 720), rng.choice(REGIONS))
+                for i in range(n)]
+    renegotiated = set(rng.sample(range(n), n // 10))
+
+    ranking = Ranking(['-debt', '-days_overdue', 'id'],
+                      filters=[where('region', '==', 'SP'), where('debt', '>=', 1000)])
+    contracts = Contracts()
+
+    chained_time, expected = best_time(lambda: chained(accounts, renegotiated, top_n))
+    ranked_time, result = best_time(
+        lambda: contracts.get_top_N_ranked(accounts, renegotiated, top_n, ranking))
+    assert [account.id for account in result] == [account.id for account in expected]
+
+    print('n = {}, top_n = {}'.format(n, top_n))
+    print('{:<28} {:>10.1f}ms'.format('filtros + sorted()', chained_time * 1000))
+    print('{:<28} {:>10.1f}ms  ({:.1f}x)'.format(
+        'Ranking (uma passada)', ranked_time * 1000, chained_time / ranked_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+# benchmarks/bench_top_n.py
+# Compara as estratégias de seleção de get_top_N_open_contracts para
+# localizar os pontos de cruzamento (heap x quickselect x ordenação).
+#
+# Uso: python benchmarks/bench_top_n.py [n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.contract import Contract
+from src.contracts import Contracts
+from src.selection import STRATEGY_HEAP, STRATEGY_QUICKSELECT, STRATEGY_SORT, choose_strategy
+
+STRATEGIES = [STRATEGY_HEAP, STRATEGY_QUICKSELECT, STRATEGY_SORT]
+RATIOS = [0.0001, 0.001, 0.01, 0.02, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0]
+
+
+def best_time(func, repeat=3):
+    # Menor tempo de várias execuções, em segundos.
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    rng = random.Random(1)
+    contracts = [Contract(i, round(rng.paretovariate(1.5) * 100, 2)) for i in range(n)]
+    renegotiated = rng.sample(range(n), n // 10)
+    manager = Contracts()
+
+    print('n = {}'.format(n))
+    print('{:>10} {:>10} {:>12} {:>12} {:>12}  {}'.format(
+        'top_n', 'ratio', *STRATEGIES, 'auto'))
+
+    for ratio in RATIOS:
+        top_n = max(1, int(n * ratio))
+        timings = []
+        for strategy in STRATEGIES:
+            timings.append(best_time(lambda: manager.get_top_N_open_contracts(
+                contracts, renegotiated, top_n, strategy=strategy)))
+        print('{:>10} {:>10} {:>11.1f}ms {:>11.1f}ms {:>11.1f}ms  {}'.format(
+            top_n, ratio, *[t * 1000 for t in timings], choose_strategy(top_n, n)))
+
+
+if __name__ == '__main__':
+    main()
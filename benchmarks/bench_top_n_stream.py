@@ -0,0 +1,49 @@
+# benchmarks/bench_top_n_stream.py
+# Mede o pico de memória (tracemalloc) de get_top_N_open_contracts com uma
+# lista materializada e com um gerador, para vários tamanhos de portfólio.
+#
+# Uso: python benchmarks/bench_top_n_stream.py
+
+import os
+import random
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.contract import Contract
+from src.contracts import Contracts
+
+TOP_N = 100
+
+
+def generate(n, seed=1):
+    # Gera contratos sob demanda, como um leitor de exportação faria.
+    rng = random.Random(seed)
+    for i in range(n):
+        yield Contract(i, round(rng.paretovariate(1.5) * 100, 2))
+
+
+def peak_kib(func):
+    # Pico de memória alocada durante func(), em KiB.
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main():
+    manager = Contracts()
+    print('{:>10} {:>14} {:>14}'.format('n', 'list (KiB)', 'stream (KiB)'))
+
+    for n in (10000, 100000, 1000000):
+        list_peak = peak_kib(lambda: manager.get_top_N_open_contracts(
+            list(generate(n)), [], TOP_N))
+        stream_peak = peak_kib(lambda: manager.get_top_N_open_contracts(
+            generate(n), [], TOP_N))
+        print('{:>10} {:>14.0f} {:>14.0f}'.format(n, list_peak, stream_peak))
+
+
+if __name__ == '__main__':
+    main()
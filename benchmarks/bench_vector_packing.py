@@ -0,0 +1,40 @@
+# benchmarks/bench_vector_packing.py
+# Mede o empacotamento multidimensional (3 dimensões) para cada combinação de
+# ordenação e posicionamento: número de grupos e tempo.
+#
+# Uso: python benchmarks/bench_vector_packing.py [n]
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.orders import Orders
+
+CAPACITIES = (1000, 500, 50)
+ORDERINGS = [None, 'norm', 'sum', 'max']
+PLACEMENTS = ['first', 'dot']
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = random.Random(1)
+    requests = [(rng.randint(1, 500), rng.randint(1, 200), rng.randint(1, 10)) for _ in range(n)]
+    orders = Orders()
+
+    print('{} pedidos, capacidades {}'.format(n, CAPACITIES))
+    print('{:>10} {:>10} {:>10} {:>10}'.format('ordenação', 'posição', 'grupos', 'tempo'))
+
+    for ordering in ORDERINGS:
+        for placement in PLACEMENTS:
+            start = time.perf_counter()
+            groups = orders.combine_orders_multi(requests, CAPACITIES, ordering, placement)
+            elapsed = time.perf_counter() - start
+            print('{:>10} {:>10} {:>10} {:>9.3f}s'.format(
+                str(ordering), placement, len(groups), elapsed))
+
+
+if __name__ == '__main__':
+    main()
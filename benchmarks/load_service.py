@@ -0,0 +1,130 @@
+# benchmarks/load_service.py
+# Gerador de carga para o serviço JSON por linha (src/service.py): abre várias
+# conexões, mantém um número fixo de pedidos em andamento por conexão e
+# reporta latência p50/p99 e vazão.
+#
+# Sem --port, sobe o serviço em um subprocesso numa porta livre.
+#
+# Uso: python benchmarks/load_service.py [--requests N] [--connections C]
+#      [--inflight K] [--op top_n|combine_orders|mixed] [--host H --port P]
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+
+def make_request(rng, op, request_id):
+    if op == 'mixed':
+        op = rng.choice(['top_n', 'combine_orders'])
+    if op == 'top_n':
+        contracts = [[rng.randint(1, 10 ** 6), rng.randint(1, 10 ** 6)] for _ in range(200)]
+        return {'id': request_id, 'op': 'top_n', 'contracts': contracts,
+                'renegotiated': [contract[0] for contract in contracts[::10]], 'top_n': 10}
+    return {'id': request_id, 'op': 'combine_orders',
+            'requests': [rng.randint(1, 500) for _ in range(100)], 'n_max': 1000}
+
+
+async def connection(host, port, lines, inflight, latencies, errors):
+    # Uma conexão com até inflight pedidos em andamento.
+
+    reader, writer = await asyncio.open_connection(host, port, limit=2 ** 24)
+    sent = {}
+    slots = asyncio.Semaphore(inflight)
+
+    async def receive():
+        for _ in range(len(lines)):
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - sent.pop(response['id']))
+            if not response['ok']:
+                errors.append(response['error'])
+            slots.release()
+
+    receiver = asyncio.ensure_future(receive())
+    for request_id, line in lines:
+        await slots.acquire()
+        sent[request_id] = time.perf_counter()
+        writer.write(line)
+        await writer.drain()
+    await receiver
+    writer.close()
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def run(args):
+    rng = random.Random(1)
+    lines = [(index, json.dumps(make_request(rng, args.op, index)).encode() + b'\n')
+             for index in range(args.requests)]
+    parts = [lines[index::args.connections] for index in range(args.connections)]
+    latencies = []
+    errors = []
+
+    start = time.perf_counter()
+    await asyncio.gather(*[
+        connection(args.host, args.port, part, args.inflight, latencies, errors) for part in parts])
+    elapsed = time.perf_counter() - start
+
+    print('{} pedidos ({}), {} conexões x {} em andamento'.format(
+        args.requests, args.op, args.connections, args.inflight))
+    print('vazão: {:.0f} pedidos/s'.format(len(latencies) / elapsed))
+    print('latência p50: {:.2f} ms  p99: {:.2f} ms'.format(
+        percentile(latencies, 0.50) * 1000, percentile(latencies, 0.99) * 1000))
+    print('erros: {}'.format(len(errors)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def wait_for(host, port, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError('serviço não respondeu em {}:{}'.format(host, port))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Gerador de carga para src/service.py')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int)
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--connections', type=int, default=8)
+    parser.add_argument('--inflight', type=int, default=8)
+    parser.add_argument('--op', choices=['top_n', 'combine_orders', 'mixed'], default='mixed')
+    args = parser.parse_args()
+
+    server = None
+    if args.port is None:
+        args.port = free_port()
+        server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'src', 'service.py'),
+                                   '--host', args.host, '--port', str(args.port)],
+                                  stdout=subprocess.DEVNULL)
+        wait_for(args.host, args.port)
+
+    try:
+        asyncio.run(run(args))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
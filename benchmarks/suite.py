@@ -0,0 +1,341 @@
+# benchmarks/suite.py
+# Suíte de benchmarks de Contracts.get_top_N_open_contracts e
+# Orders.combine_orders com cargas sintéticas de semente fixa (workloads.py).
+#
+# Para cada caso e tamanho de entrada, mede o menor tempo de --repeat execuções
+# e o pico de memória alocada durante uma execução (tracemalloc, sem contar a
+# entrada), estima o expoente de crescimento do tempo em n (inclinação log-log,
+# para conferir as complexidades citadas no README) e grava tudo em JSON.
+#
+# Com um baseline (padrão: benchmarks/baseline.json), compara o run atual com
+# ele e termina com código 1 se algum caso ficou mais lento ou usou mais
+# memória além da tolerância, ou se o resultado mudou (contrato selecionado ou
+# número de grupos diferente). Os tempos são normalizados por um laço de
+# calibração em Python puro, para que um baseline gravado em outra máquina
+# continue comparável.
+#
+# Uso: python benchmarks/suite.py [--quick | --sizes 1000,10000] [--repeat R]
+#      [--cases top_n,combine] [--output resultado.json]
+#      [--baseline arquivo.json | --no-baseline] [--save-baseline]
+#      [--tolerance 0.25] [--memory-tolerance 0.10] [--check-complexity]
+
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from collections import namedtuple
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from benchmarks import workloads
+from src.contracts import Contracts
+from src.orders import Orders
+from src import vectorized
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(HERE, 'baseline.json')
+
+FORMAT_VERSION = 1
+DEFAULT_SIZES = [1000, 10000, 100000]
+QUICK_SIZES = [1000, 10000]
+DEFAULT_REPEAT = 3
+DEFAULT_TOLERANCE = 0.25
+DEFAULT_MEMORY_TOLERANCE = 0.10
+# Diferenças de tempo abaixo disso (segundos) são ruído, não regressão.
+NOISE_FLOOR = 0.002
+# Folga sobre o expoente esperado antes de acusar crescimento acima do citado.
+COMPLEXITY_SLACK = 0.3
+
+N_MAX = 1000
+TOP_N = 100
+
+# Um caso: nome, expoente esperado do tempo em n, função que recebe n e
+# retorna (função medida, função que resume o resultado para conferência).
+Case = namedtuple('Case', 'name expected build')
+
+
+def _ids_check(result):
+    # Resumo de um top N: soma dos IDs selecionados, na ordem.
+    return sum(index * contract.id for index, contract in enumerate(result, 1))
+
+
+def _groups_check(result):
+    # Resumo de um empacotamento: número de grupos.
+    return len(result)
+
+
+def _top_n_case(distribution, renegotiated_ratio, top_n=TOP_N, batch=False):
+    def build(n):
+        if batch:
+            contracts, renegotiated = workloads.contracts_batch_workload(
+                n, renegotiated_ratio, distribution)
+        else:
+            contracts, renegotiated = workloads.contracts_workload(n, renegotiated_ratio, distribution)
+        manager = Contracts()
+        size = top_n(n) if callable(top_n) else top_n
+        return (lambda: manager.get_top_N_open_contracts(contracts, renegotiated, size)), _ids_check
+    return build
+
+
+def _combine_case(mix, strategy='ffd', split_oversize=False):
+    def build(n):
+        requests = workloads.order_sizes(n, N_MAX, mix)
+        orders = Orders()
+        return (lambda: orders.combine_orders(requests, N_MAX, strategy, split_oversize)), _groups_check
+    return build
+
+
+# Top N: O(n log N) com heap, O(n) com quickselect; FFD e BFD: O(n log n).
+CASES = [
+    Case('top_n/pareto/reneg10', 1.0, _top_n_case(workloads.DEBT_PARETO, 0.1)),
+    Case('top_n/pareto/reneg50', 1.0, _top_n_case(workloads.DEBT_PARETO, 0.5)),
+    Case('top_n/lognormal/reneg01', 1.0, _top_n_case(workloads.DEBT_LOGNORMAL, 0.01)),
+    Case('top_n/uniform/tenth', 1.0, _top_n_case(workloads.DEBT_UNIFORM, 0.1, lambda n: n // 10)),
+    Case('top_n/batch/pareto', 1.0, _top_n_case(workloads.DEBT_PARETO, 0.1, batch=True)),
+    Case('combine/uniform/ffd', 1.0, _combine_case(workloads.MIX_UNIFORM)),
+    Case('combine/small/ffd', 1.0, _combine_case(workloads.MIX_SMALL)),
+    Case('combine/large/ffd', 1.0, _combine_case(workloads.MIX_LARGE)),
+    Case('combine/bimodal/bfd', 1.0, _combine_case(workloads.MIX_BIMODAL, 'bfd')),
+    Case('combine/duplicates/ffd', 1.0, _combine_case(workloads.MIX_DUPLICATES)),
+    Case('combine/oversize/split', 1.0, _combine_case(workloads.MIX_OVERSIZE, split_oversize=True)),
+]
+
+
+def calibrate(repeat=5):
+    # Tempo de um laço fixo em Python puro (ordenação, dict e aritmética):
+    # unidade para comparar tempos medidos em máquinas diferentes.
+
+    rng = random.Random(0)
+    values = [rng.random() for _ in range(200000)]
+
+    def work():
+        counts = {}
+        for value in sorted(values):
+            key = int(value * 1000)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+    return best_time(work, repeat)
+
+
+def best_time(func, repeat):
+    # Menor tempo de repeat execuções, em segundos (coleta de lixo desligada).
+
+    best = None
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+    finally:
+        if enabled:
+            gc.enable()
+    return best
+
+
+def peak_memory(func):
+    # Pico de memória alocada por uma execução de func, em bytes, descontando
+    # o que já estava alocado (a entrada).
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        func()
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+
+def growth_exponent(points):
+    # Inclinação da reta de mínimos quadrados de log(tempo) x log(n):
+    # ~1 para O(n) e O(n log n), ~2 para O(n²). None com menos de 2 pontos.
+
+    points = [(math.log(n), math.log(seconds)) for n, seconds in points if seconds > 0]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if not spread:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def run_suite(cases, sizes, repeat, log=print):
+    # Executa os casos e retorna o documento de resultados (dict serializável).
+
+    calibration = calibrate()
+    log('calibração: {:.1f}ms'.format(calibration * 1000))
+    log('{:<26} {:>9} {:>12} {:>12} {:>12}'.format('caso', 'n', 'tempo', 'pico', 'conferência'))
+
+    results = []
+    complexity = {}
+    for case in cases:
+        points = []
+        for n in sizes:
+            func, check = case.build(n)
+            value = check(func())  # aquecimento e conferência
+            seconds = best_time(func, repeat)
+            peak = peak_memory(func)
+            points.append((n, seconds))
+            results.append({'case': case.name, 'n': n, 'seconds': seconds,
+                            'peak_bytes': peak, 'check': value})
+            log('{:<26} {:>9} {:>10.2f}ms {:>10.1f}KB {:>12}'.format(
+                case.name, n, seconds * 1000, peak / 1024, value))
+
+        exponent = growth_exponent(points)
+        complexity[case.name] = {'exponent': exponent, 'expected': case.expected}
+        if exponent is not None:
+            log('{:<26} expoente {:.2f} (esperado ~{:.1f})'.format(case.name, exponent, case.expected))
+
+    return {
+        'version': FORMAT_VERSION,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'numpy': vectorized.available(),
+        'repeat': repeat,
+        'calibration': calibration,
+        'results': results,
+        'complexity': complexity,
+    }
+
+
+def complexity_failures(document, slack=COMPLEXITY_SLACK):
+    # Casos cujo tempo cresce mais rápido que o expoente esperado + slack.
+
+    failures = []
+    for name, fit in sorted(document['complexity'].items()):
+        if fit['exponent'] is not None and fit['exponent'] > fit['expected'] + slack:
+            failures.append('{}: tempo cresce como n^{:.2f}, esperado ~n^{:.1f}'.format(
+                name, fit['exponent'], fit['expected']))
+    return failures
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE, memory_tolerance=DEFAULT_MEMORY_TOLERANCE):
+    # Compara dois documentos de resultados. Retorna (linhas do relatório,
+    # falhas). Os tempos são comparados em unidades de calibração; casos que
+    # só existem em um dos lados são ignorados.
+
+    scale = current['calibration'] / baseline['calibration']
+    previous = {(item['case'], item['n']): item for item in baseline['results']}
+    lines = []
+    failures = []
+
+    if current.get('numpy') != baseline.get('numpy'):
+        lines.append('aviso: NumPy {} no baseline e {} agora; caminhos diferentes podem ser medidos'.format(
+            'presente' if baseline.get('numpy') else 'ausente',
+            'presente' if current.get('numpy') else 'ausente'))
+
+    for item in current['results']:
+        key = (item['case'], item['n'])
+        if key not in previous:
+            continue
+        old = previous[key]
+        expected_seconds = old['seconds'] * scale
+        ratio = item['seconds'] / expected_seconds if expected_seconds else 1.0
+        memory_ratio = item['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else 1.0
+        label = '{}@{}'.format(*key)
+        lines.append('{:<34} tempo x{:.2f}  memória x{:.2f}'.format(label, ratio, memory_ratio))
+
+        if ratio > 1 + tolerance and item['seconds'] - expected_seconds > NOISE_FLOOR:
+            failures.append('{}: {:.2f}ms, baseline {:.2f}ms (x{:.2f}, tolerância {:.0%})'.format(
+                label, item['seconds'] * 1000, expected_seconds * 1000, ratio, tolerance))
+        if memory_ratio > 1 + memory_tolerance and item['peak_bytes'] - old['peak_bytes'] > 64 * 1024:
+            failures.append('{}: pico de {:.1f}KB, baseline {:.1f}KB (x{:.2f}, tolerância {:.0%})'.format(
+                label, item['peak_bytes'] / 1024, old['peak_bytes'] / 1024, memory_ratio, memory_tolerance))
+        if item['check'] != old['check']:
+            failures.append('{}: resultado mudou (conferência {}, baseline {})'.format(
+                label, item['check'], old['check']))
+
+    return lines, failures
+
+
+def select_cases(names):
+    # Casos cujo nome começa com algum dos prefixos (todos, sem filtro).
+
+    if not names:
+        return list(CASES)
+    prefixes = [name.strip() for name in names.split(',') if name.strip()]
+    selected = [case for case in CASES if any(case.name.startswith(prefix) for prefix in prefixes)]
+    if not selected:
+        raise SystemExit('Nenhum caso corresponde a {!r}'.format(names))
+    return selected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Suíte de benchmarks de Contracts e Orders')
+    parser.add_argument('--sizes', help='tamanhos de entrada separados por vírgula')
+    parser.add_argument('--quick', action='store_true', help='apenas tamanhos pequenos')
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT)
+    parser.add_argument('--cases', help='prefixos dos casos, separados por vírgula')
+    parser.add_argument('--output', help='grava os resultados neste arquivo JSON')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--no-baseline', action='store_true', help='não compara com o baseline')
+    parser.add_argument('--save-baseline', action='store_true', help='grava o run como novo baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument('--memory-tolerance', type=float, default=DEFAULT_MEMORY_TOLERANCE)
+    parser.add_argument('--check-complexity', action='store_true',
+                        help='falha se o tempo crescer acima do expoente esperado')
+    args = parser.parse_args(argv)
+
+    if args.sizes:
+        sizes = [int(float(size)) for size in args.sizes.split(',')]
+    else:
+        sizes = QUICK_SIZES if args.quick else DEFAULT_SIZES
+
+    document = run_suite(select_cases(args.cases), sizes, args.repeat)
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(document, file, indent=2)
+        print('resultados gravados em {}'.format(args.output))
+
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(document, file, indent=2)
+        print('baseline gravado em {}'.format(args.baseline))
+        return 0
+
+    failures = complexity_failures(document) if args.check_complexity else []
+
+    if not args.no_baseline:
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as file:
+                baseline = json.load(file)
+            if baseline.get('version') != FORMAT_VERSION:
+                raise SystemExit('Baseline {} em formato desconhecido'.format(args.baseline))
+            print('\ncomparação com {} (tempos normalizados pela calibração):'.format(args.baseline))
+            lines, regressions = compare(document, baseline, args.tolerance, args.memory_tolerance)
+            for line in lines:
+                print(line)
+            failures.extend(regressions)
+        else:
+            print('\nsem baseline em {}; use --save-baseline para criar'.format(args.baseline))
+
+    if failures:
+        print('\n' + '=' * 60)
+        print('REGRESSÕES ({}):'.format(len(failures)))
+        for failure in failures:
+            print('  ' + failure)
+        print('=' * 60)
+        return 1
+
+    print('\nsem regressões')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
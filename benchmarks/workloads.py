@@ -0,0 +1,100 @@
+# benchmarks/workloads.py
+# Geradores de carga sintética com semente fixa para os benchmarks: débitos
+# com distribuição de cauda longa, proporções variadas de contratos
+# renegociados e misturas de tamanhos de pedidos.
+#
+# A mesma semente gera sempre os mesmos dados, então dois runs (ou duas
+# máquinas) medem exatamente a mesma entrada.
+
+import os
+import random
+import sys
+from array import array
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from src.contract import Contract
+from src.contract_batch import ContractBatch
+
+DEFAULT_SEED = 1
+
+# Distribuições de débito
+DEBT_PARETO = 'pareto'
+DEBT_LOGNORMAL = 'lognormal'
+DEBT_UNIFORM = 'uniform'
+
+# Misturas de tamanhos de pedido (fração de n_max)
+MIX_UNIFORM = 'uniform'
+MIX_SMALL = 'small'
+MIX_LARGE = 'large'
+MIX_BIMODAL = 'bimodal'
+MIX_DUPLICATES = 'duplicates'
+MIX_OVERSIZE = 'oversize'
+
+
+def debts(n, distribution=DEBT_PARETO, seed=DEFAULT_SEED):
+    # Lista de n débitos (float, 2 casas) na distribuição pedida:
+    # 'pareto' (alpha 1.5: poucos contratos concentram boa parte da dívida),
+    # 'lognormal' (cauda longa mais suave) ou 'uniform'.
+
+    rng = random.Random(seed)
+    if distribution == DEBT_PARETO:
+        draw = lambda: rng.paretovariate(1.5) * 100
+    elif distribution == DEBT_LOGNORMAL:
+        draw = lambda: rng.lognormvariate(6, 1.5)
+    elif distribution == DEBT_UNIFORM:
+        draw = lambda: rng.uniform(1, 10000)
+    else:
+        raise ValueError('Distribuição desconhecida: {}'.format(distribution))
+    return [round(draw(), 2) for _ in range(n)]
+
+
+def contracts_workload(n, renegotiated_ratio=0.1, distribution=DEBT_PARETO, seed=DEFAULT_SEED):
+    # Retorna (contracts, renegotiated): n objetos Contract com IDs 0..n-1 e a
+    # lista de IDs renegociados, sorteados na proporção renegotiated_ratio.
+
+    values = debts(n, distribution, seed)
+    contracts = [Contract(index, debt) for index, debt in enumerate(values)]
+    rng = random.Random(seed + 1)
+    renegotiated = rng.sample(range(n), int(n * renegotiated_ratio))
+    return contracts, renegotiated
+
+
+def contracts_batch_workload(n, renegotiated_ratio=0.1, distribution=DEBT_PARETO, seed=DEFAULT_SEED):
+    # Como contracts_workload, com os contratos em um ContractBatch colunar.
+
+    values = debts(n, distribution, seed)
+    batch = ContractBatch.from_arrays(array('q', range(n)), array('d', values))
+    rng = random.Random(seed + 1)
+    renegotiated = rng.sample(range(n), int(n * renegotiated_ratio))
+    return batch, renegotiated
+
+
+def order_sizes(n, n_max=1000, mix=MIX_UNIFORM, seed=DEFAULT_SEED):
+    # Lista de n tamanhos de pedido inteiros para o limite n_max:
+    # 'uniform' (1 a n_max/2), 'small' (até 10% de n_max), 'large' (40% a 90%),
+    # 'bimodal' (80% pequenos e 20% grandes), 'duplicates' (poucos tamanhos
+    # distintos, caso típico de caixas padronizadas) ou 'oversize' (uniforme
+    # com 5% dos pedidos acima de n_max).
+
+    rng = random.Random(seed)
+    if mix == MIX_UNIFORM:
+        return [rng.randint(1, n_max // 2) for _ in range(n)]
+    if mix == MIX_SMALL:
+        return [rng.randint(1, max(1, n_max // 10)) for _ in range(n)]
+    if mix == MIX_LARGE:
+        return [rng.randint(n_max * 2 // 5, n_max * 9 // 10) for _ in range(n)]
+    if mix == MIX_BIMODAL:
+        return [
+            rng.randint(1, n_max // 10) if rng.random() < 0.8 else rng.randint(n_max // 2, n_max)
+            for _ in range(n)
+        ]
+    if mix == MIX_DUPLICATES:
+        sizes = [n_max // divisor for divisor in (2, 3, 4, 5, 8, 10, 20)]
+        return [rng.choice(sizes) for _ in range(n)]
+    if mix == MIX_OVERSIZE:
+        return [
+            rng.randint(n_max + 1, 3 * n_max) if rng.random() < 0.05 else rng.randint(1, n_max // 2)
+            for _ in range(n)
+        ]
+    raise ValueError('Mistura desconhecida: {}'.format(mix))
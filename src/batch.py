@@ -0,0 +1,109 @@
+# src/batch.py
+# Execução em lote de jobs independentes, usada por Orders.combine_orders_many
+# e Contracts.get_top_N_many.
+#
+# Os jobs são divididos em blocos; cada bloco é processado por uma função de
+# nível de módulo (para poder ir a um processo) que reaproveita buffers de
+# trabalho entre os jobs e captura a exceção de cada job separadamente. Os
+# blocos rodam em série, em um pool de threads/processos criado aqui ou em um
+# Executor fornecido pelo chamador, e os resultados voltam na ordem de entrada
+# (de uma vez, com run_batch, ou bloco a bloco, com iter_batch).
+
+import threading
+from collections import namedtuple
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+EXECUTOR_THREAD = 'thread'
+EXECUTOR_PROCESS = 'process'
+
+# Jobs por bloco enviado ao pool: amortiza o custo de envio e de preparação.
+DEFAULT_CHUNK_SIZE = 64
+
+_POOLS = {EXECUTOR_THREAD: ThreadPoolExecutor, EXECUTOR_PROCESS: ProcessPoolExecutor}
+
+# Buffers de trabalho por thread (cada processo tem os seus).
+_scratch = threading.local()
+
+
+class JobResult(namedtuple('JobResult', 'value error')):
+    # Resultado de um job: value (None em caso de erro) e a exceção levantada
+    # pelo job (None em caso de sucesso).
+
+    __slots__ = ()
+
+    @property
+    def ok(self):
+        # Indica se o job terminou sem erro.
+        return self.error is None
+
+
+def scratch(name, factory):
+    # Retorna o buffer de trabalho name da thread atual, criando-o com factory()
+    # na primeira vez.
+
+    value = getattr(_scratch, name, None)
+    if value is None:
+        value = factory()
+        setattr(_scratch, name, value)
+    return value
+
+
+def call(function, *args):
+    # Executa um job e retorna o JobResult, capturando a exceção.
+
+    try:
+        return JobResult(function(*args), None)
+    except Exception as error:
+        return JobResult(None, error)
+
+
+def run_batch(run_chunk, jobs, options=None, executor=None, workers=None,
+              chunk_size=DEFAULT_CHUNK_SIZE):
+    # Executa os jobs em blocos e retorna a lista de JobResult na ordem de entrada.
+    # run_chunk((jobs, options)) processa um bloco e retorna um JobResult por job.
+    # executor: None (em série), 'thread', 'process' ou um Executor já existente;
+    # workers é repassado ao pool criado aqui. Se um bloco inteiro falhar (ex.:
+    # processo trabalhador encerrado), todos os jobs dele recebem o erro.
+
+    return list(iter_batch(run_chunk, jobs, options, executor, workers, chunk_size))
+
+
+def iter_batch(run_chunk, jobs, options=None, executor=None, workers=None,
+               chunk_size=DEFAULT_CHUNK_SIZE):
+    # Como run_batch, mas retorna um iterador que entrega os JobResults na ordem
+    # de entrada à medida que cada bloco termina, sem esperar os seguintes. Um
+    # pool criado aqui é encerrado quando o iterador se esgota (ou é descartado).
+
+    jobs = list(jobs)
+    if chunk_size < 1:
+        raise ValueError('chunk_size deve ser pelo menos 1')
+    if executor is not None and not isinstance(executor, Executor) and executor not in _POOLS:
+        raise ValueError('Executor desconhecido: {}'.format(executor))
+
+    chunks = [jobs[start:start + chunk_size] for start in range(0, len(jobs), chunk_size)]
+    return _results(run_chunk, chunks, options, executor, workers)
+
+
+def _results(run_chunk, chunks, options, executor, workers):
+    # Gerador dos resultados de iter_batch.
+
+    if executor is None:
+        for chunk in chunks:
+            yield from run_chunk((chunk, options))
+    elif isinstance(executor, Executor):
+        yield from _collect(executor, run_chunk, chunks, options)
+    else:
+        with _POOLS[executor](max_workers=workers) as pool:
+            yield from _collect(pool, run_chunk, chunks, options)
+
+
+def _collect(pool, run_chunk, chunks, options):
+    # Envia os blocos ao pool e entrega os resultados na ordem dos blocos.
+
+    futures = [pool.submit(run_chunk, (chunk, options)) for chunk in chunks]
+    for chunk, future in zip(chunks, futures):
+        try:
+            results = future.result()
+        except Exception as error:
+            results = [JobResult(None, error) for _ in chunk]
+        yield from results
@@ -1,6 +1,9 @@
 # src/contract.py
 class Contract:
     # Classe que representa um contrato com ID e valor de débito.
+    # Usa __slots__ para evitar o __dict__ por instância (menos memória por contrato).
+
+    __slots__ = ('id', 'debt')
     
     def __init__(self, id, debt):
         # Inicializa um contrato.
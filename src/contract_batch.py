@@ -0,0 +1,105 @@
+# src/contract_batch.py
+# Armazenamento colunar de contratos: IDs e débitos em arrays tipados contíguos.
+
+from array import array
+
+try:
+    from .contract import Contract
+except ImportError:
+    from contract import Contract
+
+
+def _infer_typecode(values):
+    # Inteiros viram 'q' (int64); qualquer outro número vira 'd' (double).
+    for value in values:
+        if not isinstance(value, int):
+            return 'd'
+    return 'q'
+
+
+def _take(column, positions):
+    # Valores da coluna nas posições, como lista de números Python.
+
+    if hasattr(column, 'take'):
+        # NumPy
+        return column.take(positions).tolist()
+    return [column[position] for position in positions]
+
+
+class ContractBatch:
+    # Conjunto de contratos guardado em colunas (ids e debts) em vez de objetos.
+    # Os IDs precisam ser inteiros. Objetos Contract só são criados sob demanda
+    # (indexação ou iteração), como visões leves de uma posição do lote.
+
+    def __init__(self, ids=(), debts=(), id_typecode='q', debt_typecode=None):
+        # Inicializa o lote copiando ids e debts para arrays tipados.
+
+        if debt_typecode is None:
+            debts = list(debts)
+            debt_typecode = _infer_typecode(debts)
+
+        self.ids = array(id_typecode, ids)
+        self.debts = array(debt_typecode, debts)
+
+        if len(self.ids) != len(self.debts):
+            raise ValueError('ids e debts devem ter o mesmo tamanho')
+
+    @classmethod
+    def from_arrays(cls, ids, debts):
+        # Cria um lote reaproveitando colunas já existentes (array ou NumPy), sem cópia.
+
+        if len(ids) != len(debts):
+            raise ValueError('ids e debts devem ter o mesmo tamanho')
+
+        batch = cls.__new__(cls)
+        batch.ids = ids
+        batch.debts = debts
+        return batch
+
+    @classmethod
+    def from_contracts(cls, contracts):
+        # Cria um lote a partir de objetos Contract.
+
+        contracts = list(contracts)
+        return cls(
+            (contract.id for contract in contracts),
+            [contract.debt for contract in contracts]
+        )
+
+    def append(self, id, debt):
+        # Adiciona um contrato ao final do lote.
+
+        self.ids.append(id)
+        self.debts.append(debt)
+
+    def contract_at(self, index):
+        # Retorna um Contract com os valores da posição index.
+
+        return Contract(self.ids[index], self.debts[index])
+
+    def contracts_at(self, positions):
+        # Contracts das posições, na ordem dada. Colunas NumPy (de from_arrays)
+        # são lidas de uma vez e convertidas para números Python, como nas
+        # colunas array.
+
+        return [Contract(id, debt) for id, debt in zip(
+            _take(self.ids, positions), _take(self.debts, positions))]
+
+    @property
+    def nbytes(self):
+        # Bytes ocupados pelos dados das duas colunas.
+
+        return len(self.ids) * self.ids.itemsize + len(self.debts) * self.debts.itemsize
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, index):
+        return self.contract_at(index)
+
+    def __iter__(self):
+        for id, debt in zip(self.ids, self.debts):
+            yield Contract(id, debt)
+
+    def __repr__(self):
+        return f'ContractBatch(size={len(self)})'
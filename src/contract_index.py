@@ -0,0 +1,244 @@
+# src/contract_index.py
+# Índice persistente de contratos com manutenção incremental dos top N.
+
+import heapq
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from operator import attrgetter
+
+try:
+    from .pagination import as_cursor, check_page_size, cursor_key, page_key, take_page
+except ImportError:
+    from pagination import as_cursor, check_page_size, cursor_key, page_key, take_page
+
+# Cada entrada do heap é [-débito, sequência, marca, contrato, ativa]. A sequência
+# (ordem de inclusão) desempata débitos iguais; a marca é única por entrada e
+# evita comparar contratos quando entradas antigas e novas do mesmo ID empatam.
+_CONTRACT = 3
+_ALIVE = 4
+
+# Chaves da ordenação usada na paginação (ver _ensure_ranking).
+_id_key = attrgetter('id')
+_debt_key = attrgetter('debt')
+
+# Reconstrói o heap quando as entradas removidas passam desta proporção das ativas.
+_COMPACT_RATIO = 2
+
+
+class ContractIndex:
+    # Carteira de contratos mantida em um heap indexado com remoção preguiçosa.
+    # Inclusão, atualização de débito, encerramento e (des)marcação de
+    # renegociação custam O(log n); top_n(k) custa O(k log n), sem varrer a carteira.
+    # Empates de débito seguem a ordem de inclusão, como na ordenação estável
+    # de Contracts.get_top_N_open_contracts.
+    # page(page_size, cursor) pagina na ordem de pagination.py sobre uma
+    # ordenação completa, feita na primeira página pedida e, a partir daí,
+    # mantida a cada alteração (remoção e inserção com bisect).
+
+    def __init__(self, contracts=(), renegotiated_contracts=()):
+        # Inicializa o índice com contratos e IDs renegociados opcionais.
+
+        self._contracts = {}    # id -> Contract
+        self._sequences = {}    # id -> ordem de inclusão (desempate)
+        self._entries = {}      # id -> entrada ativa no heap
+        self._heap = []
+        self._dead = 0
+        self._next_sequence = 0
+        self._next_mark = 0
+        self._renegotiated = set(renegotiated_contracts)
+
+        # Contador de versão, incrementado a cada alteração (útil para caches).
+        self.version = 0
+
+        # Ordenação para paginação: chaves e contratos em listas paralelas
+        # (None até a primeira página).
+        self._ranked_keys = None
+        self._ranked_contracts = None
+
+        for contract in contracts:
+            if contract.id in self._contracts:
+                self.update_debt(contract.id, contract.debt)
+                continue
+            entry = self._add(contract)
+            if entry is not None:
+                self._heap.append(entry)
+        heapq.heapify(self._heap)
+
+    def insert(self, contract):
+        # Inclui um contrato; se o ID já existir, apenas atualiza o débito.
+
+        if contract.id in self._contracts:
+            self.update_debt(contract.id, contract.debt)
+            return
+
+        entry = self._add(contract)
+        if entry is not None:
+            heapq.heappush(self._heap, entry)
+        self.version += 1
+
+    def update_debt(self, contract_id, debt):
+        # Atualiza o débito de um contrato existente.
+
+        contract = self._contracts[contract_id]
+        contract.debt = debt
+
+        if contract_id in self._entries:
+            self._kill(contract_id)
+            self._push(contract)
+        self.version += 1
+
+    def close(self, contract_id):
+        # Encerra (remove) um contrato do índice.
+
+        del self._contracts[contract_id]
+        del self._sequences[contract_id]
+        if contract_id in self._entries:
+            self._kill(contract_id)
+        self.version += 1
+
+    def mark_renegotiated(self, contract_id):
+        # Marca um ID como renegociado, excluindo-o das consultas.
+
+        self._renegotiated.add(contract_id)
+        if contract_id in self._entries:
+            self._kill(contract_id)
+        self.version += 1
+
+    def unmark_renegotiated(self, contract_id):
+        # Desfaz a marcação de renegociado.
+
+        self._renegotiated.discard(contract_id)
+        contract = self._contracts.get(contract_id)
+        if contract is not None and contract_id not in self._entries:
+            self._push(contract)
+        self.version += 1
+
+    def top_n(self, top_n):
+        # Retorna os top_n contratos não renegociados com maior débito.
+
+        if top_n <= 0:
+            return []
+
+        heap = self._heap
+        selected = []
+
+        # Retira do heap até achar top_n entradas ativas; as removidas são descartadas.
+        while heap and len(selected) < top_n:
+            entry = heapq.heappop(heap)
+            if entry[_ALIVE]:
+                selected.append(entry)
+            else:
+                self._dead -= 1
+
+        for entry in selected:
+            heapq.heappush(heap, entry)
+
+        return [entry[_CONTRACT] for entry in selected]
+
+    def page(self, page_size, cursor=None):
+        # Página de page_size contratos não renegociados depois do cursor (ver
+        # pagination.py): O(log n + page_size). A primeira página ordena a
+        # carteira, O(n log n); depois disso cada alteração atualiza a
+        # ordenação com uma busca binária e um deslocamento de lista (memmove).
+
+        check_page_size(page_size)
+        return take_page(islice(self.ranked_after(cursor), page_size + 1), page_size)
+
+    def ranked_after(self, cursor=None):
+        # Itera os contratos não renegociados depois do cursor, na ordem de
+        # paginação (débito decrescente, id crescente). Alterações no índice
+        # durante a iteração podem pular ou repetir contratos.
+
+        self._ensure_ranking()
+        keys = self._ranked_keys
+        contracts = self._ranked_contracts
+        cursor = as_cursor(cursor)
+        start = 0 if cursor is None else bisect_right(keys, cursor_key(cursor))
+        for position in range(start, len(contracts)):
+            yield contracts[position]
+
+    def get(self, contract_id):
+        # Retorna o contrato com o ID informado, ou None.
+
+        return self._contracts.get(contract_id)
+
+    def is_renegotiated(self, contract_id):
+        return contract_id in self._renegotiated
+
+    def __len__(self):
+        return len(self._contracts)
+
+    def __contains__(self, contract_id):
+        return contract_id in self._contracts
+
+    def __iter__(self):
+        return iter(self._contracts.values())
+
+    def _ensure_ranking(self):
+        # Ordena os contratos ativos para paginação, se ainda não ordenados.
+
+        if self._ranked_keys is None:
+            # Duas ordenações estáveis com chaves simples (id, depois débito
+            # decrescente) saem mais baratas que uma com chave tupla
+            contracts = sorted((entry[_CONTRACT] for entry in self._entries.values()), key=_id_key)
+            contracts.sort(key=_debt_key, reverse=True)
+            self._ranked_keys = [page_key(contract) for contract in contracts]
+            self._ranked_contracts = contracts
+
+    def _rank(self, contract):
+        # Inclui um contrato ativo na ordenação de paginação, se ela existe.
+
+        if self._ranked_keys is not None:
+            key = page_key(contract)
+            position = bisect_left(self._ranked_keys, key)
+            self._ranked_keys.insert(position, key)
+            self._ranked_contracts.insert(position, contract)
+
+    def _unrank(self, key):
+        # Remove a chave (-débito, id) da ordenação de paginação, se ela existe.
+
+        if self._ranked_keys is not None:
+            position = bisect_left(self._ranked_keys, key)
+            del self._ranked_keys[position]
+            del self._ranked_contracts[position]
+
+    def _add(self, contract):
+        # Registra o contrato e retorna a entrada do heap (sem inseri-la no heap),
+        # ou None se o contrato está renegociado.
+
+        self._contracts[contract.id] = contract
+        self._sequences[contract.id] = self._next_sequence
+        self._next_sequence += 1
+
+        if contract.id in self._renegotiated:
+            return None
+
+        return self._new_entry(contract)
+
+    def _push(self, contract):
+        # Insere uma nova entrada ativa para o contrato.
+
+        heapq.heappush(self._heap, self._new_entry(contract))
+
+    def _new_entry(self, contract):
+        # Cria e registra a entrada ativa do contrato.
+
+        entry = [-contract.debt, self._sequences[contract.id], self._next_mark, contract, True]
+        self._next_mark += 1
+        self._entries[contract.id] = entry
+        self._rank(contract)
+        return entry
+
+    def _kill(self, contract_id):
+        # Remoção preguiçosa: marca a entrada como inativa e compacta se necessário.
+
+        entry = self._entries.pop(contract_id)
+        entry[_ALIVE] = False
+        self._dead += 1
+        # A entrada guarda o débito anterior (o contrato pode já ter o novo)
+        self._unrank((entry[0], contract_id))
+
+        if self._dead > _COMPACT_RATIO * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if entry[_ALIVE]]
+            heapq.heapify(self._heap)
+            self._dead = 0
@@ -1,29 +1,354 @@
 # src/contracts.py
 
+from collections.abc import Sized
+from itertools import chain
+from operator import attrgetter
+
+try:
+    from . import vectorized
+    from .batch import DEFAULT_CHUNK_SIZE, call, iter_batch, run_batch
+    from .contract_batch import ContractBatch
+    from .contract_index import ContractIndex
+    from .exclusion import ExclusionFilter
+    from .instrumentation import NULL_RECORDER
+    from .pagination import check_page_size, page_after, take_page
+    from .query_cache import TopNCache, fingerprint
+    from .ranking import Ranking, where
+    from .selection import STRATEGY_AUTO, STRATEGY_HEAP, choose_strategy, select_top_n
+except ImportError:
+    import vectorized
+    from batch import DEFAULT_CHUNK_SIZE, call, iter_batch, run_batch
+    from contract_batch import ContractBatch
+    from contract_index import ContractIndex
+    from exclusion import ExclusionFilter
+    from instrumentation import NULL_RECORDER
+    from pagination import check_page_size, page_after, take_page
+    from query_cache import TopNCache, fingerprint
+    from ranking import Ranking, where
+    from selection import STRATEGY_AUTO, STRATEGY_HEAP, choose_strategy, select_top_n
+
+
+# Extrai o débito usado como chave de ordenação.
+_debt_key = attrgetter('debt')
+
+
+def _exclusion_set(renegotiated_contracts):
+    # Retorna um objeto com teste de pertinência O(1) para os IDs renegociados.
+    # Um ExclusionFilter (ou set/frozenset) pré-construído é usado como está,
+    # evitando reconstruir o conjunto a cada consulta.
+
+    if isinstance(renegotiated_contracts, (ExclusionFilter, set, frozenset)):
+        return renegotiated_contracts
+    # Testes por None (e não por verdade) aceitam arrays NumPy de IDs
+    return set() if renegotiated_contracts is None else set(renegotiated_contracts)
+
+
+def _top_n_chunk(payload):
+    # Processa um bloco de jobs de get_top_N_many (ver batch.py). O conjunto de
+    # IDs renegociados é construído uma única vez por lista: jobs que
+    # compartilham a mesma lista (mesmo objeto) reaproveitam o conjunto.
+
+    jobs, strategy = payload
+    contracts = Contracts()
+    exclusions = {}
+
+    def run(job):
+        open_contracts, renegotiated_contracts, top_n = job
+        if renegotiated_contracts is not None:
+            key = id(renegotiated_contracts)
+            if key not in exclusions:
+                exclusions[key] = _exclusion_set(renegotiated_contracts)
+            renegotiated_contracts = exclusions[key]
+        return contracts.get_top_N_open_contracts(open_contracts, renegotiated_contracts, top_n, strategy)
+
+    return [call(run, job) for job in jobs]
+
+
+def _count_selection(recorder, total, candidates, top_n, strategy):
+    # Contadores de uma consulta instrumentada: contratos recebidos, excluídos
+    # (renegociados), candidatos à seleção, selecionados e a estratégia usada.
+
+    recorder.count('contracts', total)
+    recorder.count('excluded', total - candidates)
+    recorder.count('candidates', candidates)
+    recorder.count('selected', min(top_n, candidates))
+    recorder.note('strategy', choose_strategy(top_n, total) if strategy == STRATEGY_AUTO else strategy)
+
+
 class Contracts:
     # Classe para gerenciar operações com contratos.
-    
-    def get_top_N_open_contracts(self, open_contracts, renegotiated_contracts, top_n):
+
+    def __init__(self, cache_size=0, stats=None):
+        # Inicializa o gerenciador. Com cache_size > 0, as consultas de
+        # get_top_N_open_contracts passam por um cache LRU com esse número de
+        # entradas (desabilitado por padrão).
+        # Com stats (instrumentation.Stats), cada consulta registra o tempo das
+        # fases (conjunto de exclusão, filtro, seleção, materialização) e os
+        # contadores de contratos, candidatos e selecionados (desligado por padrão).
+
+        self._cache = TopNCache(cache_size) if cache_size > 0 else None
+        self.stats = stats
+
+    def get_top_N_open_contracts(self, open_contracts, renegotiated_contracts, top_n, strategy=STRATEGY_AUTO, version=None):
         # Retorna os top N contratos abertos com maior débito, excluindo aqueles que foram renegociados.
-        
+        # A estratégia de seleção (heap, quickselect ou ordenação) é escolhida
+        # automaticamente a partir de top_n e do número de contratos.
+        # open_contracts pode ser qualquer iterável; iteradores e geradores são
+        # consumidos em streaming (ver stream_top_N_open_contracts) com as
+        # estratégias auto e heap, e materializados em lista com quickselect e
+        # sort, que precisam da entrada inteira.
+        # Com o cache habilitado, version identifica a versão das listas: o
+        # chamador deve alterá-la (ou chamar invalidate_cache) ao modificar as
+        # listas in-place sem mudar o tamanho.
+
+        if not isinstance(open_contracts, Sized):
+            if strategy in (STRATEGY_AUTO, STRATEGY_HEAP):
+                return self.stream_top_N_open_contracts(open_contracts, renegotiated_contracts, top_n)
+            open_contracts = list(open_contracts)
+
         # Validação de entrada
         if not open_contracts:
             return []
-        
+
         if top_n <= 0:
             return []
-        
+
+        if self.stats is None:
+            return self._query(open_contracts, renegotiated_contracts, top_n, strategy, version)
+        with self.stats.record('top_n') as recorder:
+            return self._query(open_contracts, renegotiated_contracts, top_n, strategy, version, recorder)
+
+    def _query(self, open_contracts, renegotiated_contracts, top_n, strategy, version,
+               recorder=NULL_RECORDER):
+        # Consulta com entrada válida: pelo cache, se habilitado, ou calculada.
+
+        if self._cache is not None and (
+                renegotiated_contracts is None or isinstance(renegotiated_contracts, Sized)):
+            return self._cached_top_n(open_contracts, renegotiated_contracts, top_n, strategy,
+                                      version, recorder)
+
+        return self._top_n(open_contracts, renegotiated_contracts, top_n, strategy, recorder)
+
+    def invalidate_cache(self):
+        # Descarta todas as respostas em cache.
+
+        if self._cache is not None:
+            self._cache.clear()
+
+    def cache_info(self):
+        # Retorna (hits, misses, maxsize, currsize) do cache, ou None se desabilitado.
+
+        return self._cache.info() if self._cache is not None else None
+
+    def _cached_top_n(self, open_contracts, renegotiated_contracts, top_n, strategy, version,
+                      recorder=NULL_RECORDER):
+        # Consulta o cache; em caso de falta, calcula e guarda a resposta.
+
+        with recorder.phase('cache'):
+            current = fingerprint(open_contracts, renegotiated_contracts, version)
+            result = self._cache.lookup(open_contracts, renegotiated_contracts, top_n, current)
+        if result is None:
+            recorder.count('cache_misses')
+            result = self._top_n(open_contracts, renegotiated_contracts, top_n, strategy, recorder)
+            self._cache.store(open_contracts, renegotiated_contracts, top_n, current, result)
+        else:
+            recorder.count('cache_hits')
+        return result
+
+    def _top_n(self, open_contracts, renegotiated_contracts, top_n, strategy, recorder=NULL_RECORDER):
+        # Cálculo dos top N sobre uma entrada com tamanho conhecido.
+
         # Converter lista de IDs renegociados para set para busca mais eficiente
-        renegotiated_ids = set(renegotiated_contracts) if renegotiated_contracts else set()
-        
-        # Filtrar contratos abertos que não foram renegociados
-        valid_contracts = [
-            contract for contract in open_contracts 
+        with recorder.phase('exclusion'):
+            renegotiated_ids = _exclusion_set(renegotiated_contracts)
+
+        if isinstance(open_contracts, ContractBatch):
+            return self._top_n_from_batch(open_contracts, renegotiated_ids, top_n, strategy, recorder)
+
+        # Filtrar contratos abertos que não foram renegociados, sem criar cópia
+        valid_contracts = (
+            contract for contract in open_contracts
             if contract.id not in renegotiated_ids
-        ]
-        
-        # Ordenar por débito em ordem decrescente
-        valid_contracts.sort(key=lambda contract: contract.debt, reverse=True)
-        
-        # Retornar os top N
-        return valid_contracts[:top_n]
\ No newline at end of file
+        )
+
+        if recorder.enabled:
+            # Instrumentado: o filtro é materializado para ser medido à parte
+            with recorder.phase('filter'):
+                valid_contracts = list(valid_contracts)
+            _count_selection(recorder, len(open_contracts), len(valid_contracts), top_n, strategy)
+
+        # Selecionar os top N em ordem decrescente de débito
+        with recorder.phase('select'):
+            return select_top_n(
+                valid_contracts, top_n, _debt_key,
+                total=len(open_contracts), strategy=strategy
+            )
+
+    def stream_top_N_open_contracts(self, open_contracts, renegotiated_contracts, top_n, chunked=False):
+        # Versão em streaming de get_top_N_open_contracts: aceita qualquer iterável
+        # (inclusive geradores) e mantém apenas O(top_n) contratos em memória.
+        # Com chunked=True, open_contracts é um iterável de blocos de contratos,
+        # como os produzidos por leitores que leem o arquivo em pedaços.
+
+        if top_n <= 0:
+            return []
+
+        if chunked:
+            open_contracts = chain.from_iterable(open_contracts)
+
+        if self.stats is None:
+            return self._stream_top_n(open_contracts, renegotiated_contracts, top_n)
+        with self.stats.record('top_n_stream') as recorder:
+            return self._stream_top_n(open_contracts, renegotiated_contracts, top_n, recorder)
+
+    def _stream_top_n(self, open_contracts, renegotiated_contracts, top_n, recorder=NULL_RECORDER):
+        # Seleção em streaming com heap limitado.
+
+        with recorder.phase('exclusion'):
+            renegotiated_ids = _exclusion_set(renegotiated_contracts)
+
+        valid_contracts = (
+            contract for contract in open_contracts
+            if contract.id not in renegotiated_ids
+        )
+
+        # O heap limitado é a única estratégia que não materializa a entrada;
+        # a fase 'select' inclui a leitura e o filtro da entrada
+        with recorder.phase('select'):
+            return select_top_n(valid_contracts, top_n, _debt_key, strategy=STRATEGY_HEAP)
+
+    def get_top_N_ranked(self, open_contracts, renegotiated_contracts, top_n, ranking,
+                         strategy=STRATEGY_AUTO):
+        # Top N contratos abertos por um ranking com chaves compostas e filtros
+        # (ver ranking.py), excluindo os renegociados, em uma única passada.
+        # ranking: um Ranking já compilado (reutilizável) ou a lista de chaves,
+        # ex.: ['-debt', '-days_overdue', 'id']. Os contratos podem ser
+        # quaisquer objetos com id e os campos usados no ranking.
+        # Ao contrário de get_top_N_open_contracts, a ordem é totalmente
+        # definida pelas chaves; empates completos mantêm a ordem de entrada.
+
+        if not isinstance(ranking, Ranking):
+            ranking = Ranking(ranking)
+
+        # Validação de entrada
+        if top_n <= 0:
+            return []
+
+        if self.stats is None:
+            return self._ranked(open_contracts, renegotiated_contracts, top_n, ranking, strategy)
+        with self.stats.record('top_n_ranked') as recorder:
+            return self._ranked(open_contracts, renegotiated_contracts, top_n, ranking, strategy,
+                                recorder)
+
+    def _ranked(self, open_contracts, renegotiated_contracts, top_n, ranking, strategy,
+                recorder=NULL_RECORDER):
+        # Exclusão, filtros e seleção encadeados em uma passada sobre a entrada.
+
+        with recorder.phase('exclusion'):
+            renegotiated_ids = _exclusion_set(renegotiated_contracts)
+
+        total = len(open_contracts) if isinstance(open_contracts, Sized) else None
+        if renegotiated_ids:
+            # A exclusão vira o primeiro filtro do predicado compilado
+            ranking = ranking.filtered(where('id', 'not in', renegotiated_ids))
+
+        # A fase 'select' inclui a exclusão e os filtros, feitos na mesma passada
+        with recorder.phase('select'):
+            return ranking.top(open_contracts, top_n, strategy, total)
+
+    def get_top_N_page(self, open_contracts, renegotiated_contracts, page_size, cursor=None):
+        # Página de page_size contratos abertos por débito, excluindo os
+        # renegociados, a partir do cursor da página anterior (None na primeira;
+        # Cursor, par (débito, id) ou o texto de Page.token). Retorna uma Page
+        # com os contratos e o cursor da próxima página (ver pagination.py).
+        # Empates de débito seguem o id crescente, para que o cursor seja uma
+        # posição única. open_contracts pode ser um ContractIndex: a página
+        # custa O(log n + page_size) em vez de uma varredura O(n log page_size).
+
+        check_page_size(page_size)
+
+        if self.stats is None:
+            return self._page(open_contracts, renegotiated_contracts, page_size, cursor)
+        with self.stats.record('top_n_page') as recorder:
+            return self._page(open_contracts, renegotiated_contracts, page_size, cursor, recorder)
+
+    def _page(self, open_contracts, renegotiated_contracts, page_size, cursor,
+              recorder=NULL_RECORDER):
+        # Página pelo índice ou por uma varredura com heap limitado.
+
+        with recorder.phase('exclusion'):
+            renegotiated_ids = _exclusion_set(renegotiated_contracts)
+
+        if isinstance(open_contracts, ContractIndex):
+            recorder.note('path', 'index')
+            ranked = open_contracts.ranked_after(cursor)
+            if renegotiated_ids:
+                ranked = (contract for contract in ranked if contract.id not in renegotiated_ids)
+            with recorder.phase('select'):
+                return take_page(ranked, page_size)
+
+        # A fase 'select' inclui a leitura e o filtro da entrada
+        with recorder.phase('select'):
+            return page_after(open_contracts, page_size, cursor, renegotiated_ids)
+
+    def get_top_N_open_contracts_from_arrays(self, ids, debts, renegotiated_contracts, top_n, strategy=STRATEGY_AUTO):
+        # Mesmo resultado de get_top_N_open_contracts, recebendo colunas paralelas
+        # de ids e débitos (listas, array ou NumPy) em vez de objetos Contract.
+
+        return self.get_top_N_open_contracts(
+            ContractBatch.from_arrays(ids, debts), renegotiated_contracts, top_n, strategy
+        )
+
+    def _top_n_from_batch(self, batch, renegotiated_ids, top_n, strategy, recorder=NULL_RECORDER):
+        # Seleciona diretamente sobre as colunas do lote, trabalhando com posições;
+        # apenas os top N selecionados viram objetos Contract.
+        # Com NumPy disponível, filtro e seleção são vetorizados.
+
+        ids = batch.ids
+        debts = batch.debts
+
+        if (strategy == STRATEGY_AUTO and vectorized.available()
+                and len(ids) >= vectorized.VECTORIZE_MIN_SIZE):
+            recorder.note('strategy', 'vectorized')
+            recorder.count('contracts', len(ids))
+            with recorder.phase('select'):
+                selected = vectorized.top_n_positions(ids, debts, renegotiated_ids, top_n)
+            recorder.count('selected', len(selected))
+            with recorder.phase('materialize'):
+                return batch.contracts_at(selected)
+
+        if renegotiated_ids:
+            positions = (
+                position for position, contract_id in enumerate(ids)
+                if contract_id not in renegotiated_ids
+            )
+        else:
+            positions = range(len(ids))
+
+        if recorder.enabled:
+            with recorder.phase('filter'):
+                positions = list(positions)
+            _count_selection(recorder, len(ids), len(positions), top_n, strategy)
+
+        with recorder.phase('select'):
+            selected = select_top_n(
+                positions, top_n, debts.__getitem__,
+                total=len(ids), strategy=strategy
+            )
+        with recorder.phase('materialize'):
+            return batch.contracts_at(selected)
+
+    def get_top_N_many(self, jobs, strategy=STRATEGY_AUTO, executor=None, workers=None,
+                       chunk_size=DEFAULT_CHUNK_SIZE, lazy=False):
+        # Executa várias consultas top N independentes (ex.: uma por região).
+        # jobs: iterável de triplas (open_contracts, renegotiated_contracts, top_n).
+        # executor: None (em série), 'thread', 'process' ou um Executor existente,
+        # com workers processos/threads e blocos de chunk_size jobs (ver batch.py).
+        # As consultas em lote não passam pelo cache da instância.
+        # Retorna um JobResult(value, error) por job, na ordem de entrada; com
+        # lazy=True, um iterador que os entrega à medida que os blocos terminam.
+
+        return (iter_batch if lazy else run_batch)(
+            _top_n_chunk, jobs, strategy,
+            executor=executor, workers=workers, chunk_size=chunk_size
+        )
@@ -0,0 +1,317 @@
+# src/exact_packing.py
+# Modo de otimização do empacotamento: parte da solução FFD e tenta reduzir o
+# número de grupos com busca local e branch-and-bound, dentro de um orçamento
+# de tempo e/ou de nós. Retorna a melhor solução encontrada e o limite
+# inferior L2 (Martello & Toth), para medir a distância até o ótimo.
+
+import math
+import time
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .packing import pack
+except ImportError:
+    from packing import pack
+
+# Tolerância usada ao arredondar limites inferiores calculados em ponto flutuante.
+_EPSILON = 1e-9
+
+# Custo acumulado (grupos examinados) entre consultas ao relógio: um nó do
+# branch-and-bound examina todos os grupos do alvo, então com alvos grandes o
+# relógio é consultado a cada nó.
+_CLOCK_WORK = 1024
+
+
+class PackingSolution:
+    # Resultado do modo de otimização.
+    #
+    # groups: melhor lista de grupos encontrada
+    # lower_bound: limite inferior do número de grupos (L2 ou provado pela busca)
+    # initial_groups: número de grupos da solução FFD inicial
+    # nodes: nós gastos do orçamento (itens realocados pela busca local e nós
+    # explorados pelo branch-and-bound)
+    # elapsed: tempo gasto, em segundos
+
+    def __init__(self, groups, lower_bound, initial_groups, nodes=0, elapsed=0.0):
+        # Inicializa o resultado.
+
+        self.groups = groups
+        self.lower_bound = lower_bound
+        self.initial_groups = initial_groups
+        self.nodes = nodes
+        self.elapsed = elapsed
+
+    @property
+    def gap(self):
+        # Diferença entre o número de grupos e o limite inferior.
+        return len(self.groups) - self.lower_bound
+
+    @property
+    def optimal(self):
+        # Indica se a solução é comprovadamente ótima.
+        return self.gap == 0
+
+    def __repr__(self):
+        return 'PackingSolution(groups={}, lower_bound={}, initial_groups={})'.format(
+            len(self.groups), self.lower_bound, self.initial_groups)
+
+
+class _Budget:
+    # Orçamento de tempo (segundos) e de nós; None significa sem limite.
+
+    def __init__(self, time_budget, node_budget):
+        self.deadline = None if time_budget is None else time.perf_counter() + time_budget
+        self.node_budget = node_budget
+        self.nodes = 0
+        self.exhausted = False
+        self._work = 0
+
+    def tick(self, cost=1):
+        # Conta um nó que examina cost grupos e retorna False quando o
+        # orçamento acabou.
+
+        self.nodes += 1
+        if self.node_budget is not None and self.nodes > self.node_budget:
+            self.exhausted = True
+        elif self.deadline is not None:
+            self._work += cost
+            if self._work >= _CLOCK_WORK:
+                self._work = 0
+                self.exhausted = time.perf_counter() > self.deadline
+        return not self.exhausted
+
+    def out_of_time(self):
+        # Consulta direta do relógio, para laços fora da busca.
+
+        if self.deadline is not None and time.perf_counter() > self.deadline:
+            self.exhausted = True
+        return self.exhausted
+
+
+def _ceil_div(value, capacity):
+    # Teto de value / capacity, tolerante a erros de arredondamento em floats.
+
+    if isinstance(value, int) and isinstance(capacity, int):
+        return -(-value // capacity)
+    return math.ceil(value / capacity - _EPSILON)
+
+
+def lower_bound_l2(sizes, capacity):
+    # Limite inferior L2 de Martello & Toth para itens 0 < s <= capacity.
+    # Para cada K em {0} ∪ {s <= capacity/2}:
+    #   J1 = {s > C - K}, J2 = {C/2 < s <= C - K}, J3 = {K <= s <= C/2}
+    #   L(K) = |J1| + |J2| + max(0, teto((soma(J3) - (|J2|·C - soma(J2))) / C))
+    # Com NumPy, todos os K são avaliados de uma vez (searchsorted vetorizado).
+
+    if not sizes:
+        return 0
+
+    ordered = sorted(sizes)
+    total = sum(ordered)
+    l1 = _ceil_div(total, capacity)
+    half = capacity / 2
+
+    candidates = sorted({size for size in ordered if size <= half} | {0})
+
+    if np is not None:
+        return max(l1, _l2_numpy(ordered, capacity, candidates))
+
+    prefix = [0] + list(accumulate(ordered))
+    count = len(ordered)
+    above_half = bisect_right(ordered, half)
+    best = l1
+
+    for k in candidates:
+        limit = bisect_right(ordered, capacity - k)
+        j1 = count - limit
+        j2 = limit - above_half
+        j2_sum = prefix[limit] - prefix[above_half]
+        start = bisect_left(ordered, k)
+        j3_sum = prefix[above_half] - prefix[start]
+        extra = j3_sum - (j2 * capacity - j2_sum)
+        bound = j1 + j2 + (_ceil_div(extra, capacity) if extra > 0 else 0)
+        if bound > best:
+            best = bound
+
+    return best
+
+
+def _l2_numpy(ordered, capacity, candidates):
+    # Avaliação vetorizada de L(K) para todos os candidatos K.
+
+    values = np.asarray(ordered, dtype=float)
+    prefix = np.concatenate(([0.0], np.cumsum(values)))
+    ks = np.asarray(candidates, dtype=float)
+    count = len(values)
+    above_half = np.searchsorted(values, capacity / 2, side='right')
+
+    limit = np.searchsorted(values, capacity - ks, side='right')
+    start = np.searchsorted(values, ks, side='left')
+    j1 = count - limit
+    j2 = limit - above_half
+    j2_sum = prefix[limit] - prefix[above_half]
+    j3_sum = prefix[above_half] - prefix[start]
+    extra = j3_sum - (j2 * capacity - j2_sum)
+    bounds = j1 + j2 + np.where(extra > 0, np.ceil(extra / capacity - _EPSILON), 0)
+    return int(bounds.max())
+
+
+def _local_search(groups, loads, capacity, budget):
+    # Tenta esvaziar grupos: para cada grupo (do menos cheio ao mais cheio),
+    # realoca seus itens nos demais grupos por Best Fit; se todos couberem, o
+    # grupo é eliminado e a busca recomeça. As cargas são atualizadas junto
+    # com as realocações, sem recalcular somas. Cada item realocado conta como
+    # um nó do orçamento (o mesmo do branch-and-bound), e o relógio é
+    # consultado a cada item, pois cada tentativa examina todos os grupos.
+
+    groups = [list(group) for group in groups]
+    loads = list(loads)
+    improved = True
+
+    while improved and len(groups) > 1 and not budget.out_of_time():
+        improved = False
+        order = sorted(range(len(groups)), key=loads.__getitem__)
+
+        for candidate in order:
+            trial = loads[:]
+            moves = []
+            for item in sorted(groups[candidate], reverse=True):
+                if not budget.tick() or budget.out_of_time():
+                    return groups
+                best = -1
+                for index, load in enumerate(trial):
+                    if index != candidate and load + item <= capacity and (
+                            best < 0 or load > trial[best]):
+                        best = index
+                if best < 0:
+                    break
+                trial[best] += item
+                moves.append((item, best))
+            else:
+                for item, index in moves:
+                    groups[index].append(item)
+                del groups[candidate]
+                del trial[candidate]
+                loads = trial
+                improved = True
+                break
+
+    return groups
+
+
+def _branch_and_bound(sizes, capacity, target, budget):
+    # Procura uma solução com no máximo target grupos (DFS iterativa).
+    # Retorna (grupos, None) se achou, (None, True) se provou que não existe e
+    # (None, False) se o orçamento acabou antes.
+    #
+    # Podas: itens em ordem decrescente; grupos com a mesma carga são
+    # equivalentes (só o primeiro é tentado); no máximo um grupo vazio é
+    # aberto por item; o espaço que nenhum item restante consegue usar conta
+    # como desperdício e não pode exceder a folga total.
+
+    count = len(sizes)
+    slack = target * capacity - sum(sizes)
+    if slack < -_EPSILON:
+        return None, True
+
+    loads = [0] * target
+    assignment = [-1] * count
+    choices = [None] * count
+    positions = [0] * count
+    depth = 0
+
+    while True:
+        if depth == count:
+            groups = [[] for _ in range(target)]
+            for size, group in zip(sizes, assignment):
+                groups[group].append(size)
+            return [group for group in groups if group], None
+
+        size = sizes[depth]
+
+        if choices[depth] is None:
+            if not budget.tick(target):
+                return None, False
+
+            smallest = sizes[count - 1]
+            waste = 0
+            for load in loads:
+                if load + smallest > capacity:
+                    waste += capacity - load
+            if waste > slack + _EPSILON:
+                options = []
+            else:
+                seen = set()
+                options = []
+                for group in sorted(range(target), key=lambda g: -loads[g]):
+                    load = loads[group]
+                    if load in seen or load + size > capacity:
+                        continue
+                    seen.add(load)
+                    options.append(group)
+            choices[depth] = options
+            positions[depth] = 0
+        else:
+            loads[assignment[depth]] -= size
+
+        if positions[depth] < len(choices[depth]):
+            group = choices[depth][positions[depth]]
+            positions[depth] += 1
+            loads[group] += size
+            assignment[depth] = group
+            depth += 1
+        else:
+            choices[depth] = None
+            assignment[depth] = -1
+            depth -= 1
+            if depth < 0:
+                return None, True
+
+
+def optimize_packing(requests, n_max, time_budget=1.0, node_budget=None):
+    # Empacota os pedidos buscando o menor número de grupos dentro do orçamento.
+    # Pedidos acima de n_max ficam em grupo próprio (como em combine_orders) e
+    # pedidos <= 0 vão para o primeiro grupo, pois nunca aumentam a carga.
+
+    started = time.perf_counter()
+    budget = _Budget(time_budget, node_budget)
+
+    oversize = [[request] for request in sorted(requests, reverse=True) if request > n_max]
+    free = [request for request in requests if request <= 0]
+    sizes = sorted((request for request in requests if 0 < request <= n_max), reverse=True)
+
+    best = pack(sizes, n_max, 'ffd')
+    initial_groups = len(best) + len(oversize)
+    lower_bound = lower_bound_l2(sizes, n_max)
+
+    if len(best) > lower_bound:
+        best = _local_search(best, best.loads, n_max, budget)
+
+    # Branch-and-bound com alvos decrescentes até o limite inferior
+    while len(best) > lower_bound and not budget.exhausted:
+        target = len(best) - 1
+        found, proven = _branch_and_bound(sizes, n_max, target, budget)
+        if found is not None:
+            best = found
+        elif proven:
+            lower_bound = target + 1
+        else:
+            break
+
+    groups = oversize + [sorted(group, reverse=True) for group in best]
+    if free:
+        if groups:
+            groups[0].extend(sorted(free, reverse=True))
+        else:
+            groups.append(sorted(free, reverse=True))
+
+    return PackingSolution(
+        groups, lower_bound + len(oversize) if sizes or oversize else len(groups),
+        initial_groups, budget.nodes, time.perf_counter() - started
+    )
@@ -0,0 +1,219 @@
+# src/exclusion.py
+# Filtro reutilizável de IDs excluídos (contratos renegociados).
+
+import sys
+from numbers import Integral, Number
+from operator import index
+
+MODE_BITMAP = 'bitmap'
+MODE_SET = 'set'
+
+# O bitmap é usado enquanto o intervalo de IDs não passar deste múltiplo da
+# quantidade de IDs (1 bit por posição contra dezenas de bytes por item no set).
+_MAX_BITS_PER_ID = 256
+
+
+def _is_int(value):
+    # Inteiros Python ou de outras bibliotecas (ex.: np.int64); bool não conta.
+    return type(value) is int or (isinstance(value, Integral) and not isinstance(value, bool))
+
+
+def _normalize(value):
+    # Converte inteiros de outras bibliotecas para int; outros valores ficam como estão.
+    return index(value) if type(value) is not int and _is_int(value) else value
+
+
+def _as_int(value):
+    # O int igual a value, ou None: ints de outras bibliotecas, bool e números
+    # com valor inteiro (ex.: 5.0, Decimal('5')) valem como o int, como num set.
+
+    if type(value) is int:
+        return value
+    if isinstance(value, Integral):
+        return index(value)
+    if isinstance(value, Number):
+        try:
+            as_int = int(value)
+        except (TypeError, ValueError, OverflowError):
+            return None
+        if as_int == value:
+            return as_int
+    return None
+
+
+class ExclusionFilter:
+    # Conjunto de IDs pensado para ser construído uma vez e reaproveitado em
+    # várias consultas (ex.: Contracts.get_top_N_open_contracts).
+    # Para IDs inteiros em um intervalo denso usa um bitmap (bytearray); caso
+    # contrário usa um set. A troca de bitmap para set é automática quando um
+    # ID incompatível é incluído. A consulta segue a igualdade do set nos dois
+    # modos: 5.0 e True estão no filtro se 5 e 1 estiverem.
+
+    def __init__(self, ids=(), mode=None):
+        # Inicializa o filtro. mode força 'bitmap' ou 'set'; None escolhe sozinho.
+
+        ids = {_normalize(value) for value in ids}
+
+        if mode is None:
+            mode = MODE_BITMAP if self._fits_bitmap(ids) else MODE_SET
+        elif mode == MODE_BITMAP and not all(_is_int(value) for value in ids):
+            raise ValueError('O modo bitmap exige IDs inteiros')
+        elif mode not in (MODE_BITMAP, MODE_SET):
+            raise ValueError('Modo desconhecido: {}'.format(mode))
+
+        self.mode = mode
+        self._set = None
+        self._bits = None
+        self._base = 0
+        self._count = 0
+
+        # Contador de versão, incrementado a cada alteração (útil para caches).
+        self.version = 0
+
+        if mode == MODE_SET:
+            self._set = ids
+        else:
+            self._base = min(ids) if ids else 0
+            size = max(ids) - self._base + 1 if ids else 0
+            self._bits = bytearray((size + 7) // 8)
+            for value in ids:
+                offset = value - self._base
+                self._bits[offset >> 3] |= 1 << (offset & 7)
+            self._count = len(ids)
+
+    @staticmethod
+    def _fits_bitmap(ids):
+        # Indica se os IDs são inteiros e densos o bastante para o bitmap.
+
+        if not ids or not all(_is_int(value) for value in ids):
+            return False
+        return max(ids) - min(ids) + 1 <= _MAX_BITS_PER_ID * len(ids)
+
+    @property
+    def base(self):
+        # Menor ID representável pelo bitmap.
+        return self._base
+
+    @property
+    def bitmap(self):
+        # Bytes do bitmap (bit i = ID base + i), ou None no modo set.
+        return self._bits
+
+    def add(self, contract_id):
+        # Inclui um ID no filtro.
+
+        contract_id = _normalize(contract_id)
+        if contract_id in self:
+            return
+
+        if self.mode == MODE_BITMAP and not self._bitmap_can_hold(contract_id):
+            self._to_set()
+
+        if self.mode == MODE_SET:
+            self._set.add(contract_id)
+        else:
+            offset = contract_id - self._base
+            self._bits[offset >> 3] |= 1 << (offset & 7)
+            self._count += 1
+        self.version += 1
+
+    def discard(self, contract_id):
+        # Remove um ID do filtro, se presente.
+
+        contract_id = _normalize(contract_id)
+        if contract_id not in self:
+            return
+
+        if self.mode == MODE_SET:
+            self._set.discard(contract_id)
+        else:
+            offset = _as_int(contract_id) - self._base
+            self._bits[offset >> 3] &= ~(1 << (offset & 7))
+            self._count -= 1
+        self.version += 1
+
+    def update(self, ids):
+        # Inclui vários IDs.
+
+        for contract_id in ids:
+            self.add(contract_id)
+
+    def memory_usage(self):
+        # Bytes ocupados pela estrutura (o set não inclui os objetos ID em si).
+
+        if self.mode == MODE_SET:
+            return sys.getsizeof(self._set)
+        return sys.getsizeof(self._bits)
+
+    def _bitmap_can_hold(self, contract_id):
+        # Tenta acomodar o ID no bitmap, ampliando-o se continuar denso.
+
+        if not _is_int(contract_id):
+            return False
+
+        size = len(self._bits) * 8
+        if self._count == 0:
+            self._base = contract_id
+            self._bits = bytearray(1)
+            return True
+
+        if self._base <= contract_id < self._base + size:
+            return True
+
+        low = min(self._base, contract_id)
+        high = max(self._base + size - 1, contract_id)
+        if high - low + 1 > _MAX_BITS_PER_ID * (self._count + 1):
+            return False
+
+        # Amplia o bitmap (arredondando o início para um múltiplo de 8 bits a
+        # partir da base atual, para reaproveitar os bytes existentes).
+        shift = (self._base - low + 7) // 8
+        new_base = self._base - shift * 8
+        new_size = (high - new_base) // 8 + 1
+        bits = bytearray(new_size)
+        bits[shift:shift + len(self._bits)] = self._bits
+        self._bits = bits
+        self._base = new_base
+        return True
+
+    def _to_set(self):
+        # Converte o filtro para o modo set.
+
+        self._set = set(self)
+        self._bits = None
+        self._base = 0
+        self._count = 0
+        self.mode = MODE_SET
+
+    def __contains__(self, contract_id):
+        if self.mode == MODE_SET:
+            return contract_id in self._set
+
+        if type(contract_id) is not int:
+            contract_id = _as_int(contract_id)
+            if contract_id is None:
+                return False
+        offset = contract_id - self._base
+        if offset < 0 or offset >= len(self._bits) * 8:
+            return False
+        return (self._bits[offset >> 3] >> (offset & 7)) & 1 == 1
+
+    def __len__(self):
+        if self.mode == MODE_SET:
+            return len(self._set)
+        return self._count
+
+    def __iter__(self):
+        if self.mode == MODE_SET:
+            yield from self._set
+            return
+
+        base = self._base
+        for index, byte in enumerate(self._bits):
+            if byte:
+                for bit in range(8):
+                    if byte >> bit & 1:
+                        yield base + index * 8 + bit
+
+    def __repr__(self):
+        return f'ExclusionFilter(mode={self.mode}, size={len(self)})'
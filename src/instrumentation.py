@@ -0,0 +1,314 @@
+# src/instrumentation.py
+# Instrumentação opcional de Contracts e Orders.
+#
+# Com Contracts(stats=Stats()) ou Orders(stats=Stats()), cada chamada gera um
+# CallRecord com o tempo de cada fase (ex.: montagem do conjunto de exclusão,
+# filtro, seleção; ordenação, encaixe e montagem dos grupos), contadores (itens,
+# candidatos, grupos, nós examinados por pedido) e, opcionalmente, o pico de
+# memória alocada (tracemalloc). Os registros são acumulados no Stats e
+# repassados a um callback, se houver.
+#
+# Desligada (stats=None), o código instrumentado recebe NULL_RECORDER: as fases
+# viram um context manager vazio e os contadores, chamadas vazias, uma vez por
+# chamada e nunca por item. Contadores que custam algo para calcular ficam
+# atrás de recorder.enabled.
+#
+# profile_call executa uma única chamada sob cProfile e tracemalloc e gera o
+# relatório de tempo por função e de memória por linha. cProfile, pstats e
+# tracemalloc são importados só quando o perfil ou a medição de memória são
+# usados, para que importar este módulo (feito por packing e contracts) não
+# custe nada com a instrumentação desligada.
+
+import io
+import time
+
+
+class _Phase:
+    # Context manager que soma o tempo do bloco na fase name do recorder.
+
+    __slots__ = ('_phases', '_name', '_start')
+
+    def __init__(self, phases, name):
+        self._phases = phases
+        self._name = name
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        elapsed = time.perf_counter() - self._start
+        self._phases[self._name] = self._phases.get(self._name, 0.0) + elapsed
+        return False
+
+
+class _NullPhase:
+    # Fase sem medição (instrumentação desligada).
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class CallRecord:
+    # Medições de uma chamada: operation (ex.: 'top_n', 'combine_orders'),
+    # seconds (tempo total), phases (fase -> segundos), counters (nome ->
+    # quantidade), info (dados não numéricos, ex.: estratégia escolhida) e
+    # peak_bytes (pico de memória alocada, com trace_allocations).
+
+    __slots__ = ('operation', 'seconds', 'phases', 'counters', 'info', 'peak_bytes')
+
+    enabled = True
+
+    def __init__(self, operation):
+        # Inicializa um registro vazio.
+
+        self.operation = operation
+        self.seconds = 0.0
+        self.phases = {}
+        self.counters = {}
+        self.info = {}
+        self.peak_bytes = None
+
+    def phase(self, name):
+        # Context manager que mede o bloco como a fase name.
+        return _Phase(self.phases, name)
+
+    def count(self, name, value=1):
+        # Soma value ao contador name.
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def note(self, name, value):
+        # Guarda um dado não numérico (ex.: estratégia escolhida).
+        self.info[name] = value
+
+    def as_dict(self):
+        # Registro como dict (ex.: para serializar em JSON).
+
+        return {'operation': self.operation, 'seconds': self.seconds, 'phases': dict(self.phases),
+                'counters': dict(self.counters), 'info': dict(self.info),
+                'peak_bytes': self.peak_bytes}
+
+    def __repr__(self):
+        return 'CallRecord({!r}, seconds={:.6f}, phases={}, counters={})'.format(
+            self.operation, self.seconds, self.phases, self.counters)
+
+
+class _NullRecorder:
+    # Recorder da instrumentação desligada: não mede nem guarda nada.
+
+    __slots__ = ()
+
+    enabled = False
+
+    def phase(self, name):
+        return _NULL_PHASE
+
+    def count(self, name, value=1):
+        pass
+
+    def note(self, name, value):
+        pass
+
+
+NULL_RECORDER = _NullRecorder()
+
+
+class _Recording:
+    # Context manager de Stats.record: mede a chamada e entrega o CallRecord.
+
+    __slots__ = ('_stats', '_record', '_start', '_tracing', '_baseline')
+
+    def __init__(self, stats, operation):
+        self._stats = stats
+        self._record = CallRecord(operation)
+
+    def __enter__(self):
+        if self._stats.trace_allocations:
+            import tracemalloc
+            self._tracing = tracemalloc.is_tracing()
+            if not self._tracing:
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+            self._baseline = tracemalloc.get_traced_memory()[0]
+        self._start = time.perf_counter()
+        return self._record
+
+    def __exit__(self, exc_type, *exc_info):
+        record = self._record
+        record.seconds = time.perf_counter() - self._start
+        if self._stats.trace_allocations:
+            import tracemalloc
+            record.peak_bytes = tracemalloc.get_traced_memory()[1] - self._baseline
+            if not self._tracing:
+                tracemalloc.stop()
+        if exc_type is None:
+            self._stats.add(record)
+        return False
+
+
+class Stats:
+    # Acumula os CallRecords das chamadas instrumentadas.
+    #
+    # callback: função chamada com cada CallRecord ao fim da chamada.
+    # trace_allocations: mede o pico de memória de cada chamada com tracemalloc
+    # (tem custo; desligado por padrão).
+    # keep: quantos registros guardar em records (None = todos, 0 = nenhum;
+    # os totais são acumulados de qualquer forma).
+    # Não é thread-safe: use um Stats por thread.
+
+    def __init__(self, callback=None, trace_allocations=False, keep=0):
+        # Inicializa as estatísticas vazias.
+
+        self.callback = callback
+        self.trace_allocations = trace_allocations
+        self.keep = keep
+        self.reset()
+
+    def reset(self):
+        # Descarta os registros e totais acumulados.
+
+        self.calls = {}
+        self.seconds = {}
+        self.phases = {}
+        self.counters = {}
+        self.peak_bytes = {}
+        self.records = []
+        self.last = None
+
+    def record(self, operation):
+        # Context manager que mede uma chamada da operação e entrega o CallRecord
+        # a ser preenchido pelo código instrumentado.
+        return _Recording(self, operation)
+
+    def add(self, record):
+        # Acumula um CallRecord nos totais da operação e chama o callback.
+
+        operation = record.operation
+        self.calls[operation] = self.calls.get(operation, 0) + 1
+        self.seconds[operation] = self.seconds.get(operation, 0.0) + record.seconds
+
+        phases = self.phases.setdefault(operation, {})
+        for name, seconds in record.phases.items():
+            phases[name] = phases.get(name, 0.0) + seconds
+
+        counters = self.counters.setdefault(operation, {})
+        for name, value in record.counters.items():
+            counters[name] = counters.get(name, 0) + value
+
+        if record.peak_bytes is not None:
+            self.peak_bytes[operation] = max(self.peak_bytes.get(operation, 0), record.peak_bytes)
+
+        self.last = record
+        if self.keep is None or self.keep > 0:
+            self.records.append(record)
+            if self.keep is not None and len(self.records) > self.keep:
+                del self.records[0]
+
+        if self.callback is not None:
+            self.callback(record)
+
+    def summary(self):
+        # Totais por operação: chamadas, tempo, fases, contadores e pico de memória.
+
+        return {
+            operation: {
+                'calls': calls,
+                'seconds': self.seconds[operation],
+                'phases': dict(self.phases.get(operation, {})),
+                'counters': dict(self.counters.get(operation, {})),
+                'peak_bytes': self.peak_bytes.get(operation),
+            }
+            for operation, calls in self.calls.items()
+        }
+
+    def report(self):
+        # Relatório em texto dos totais por operação, com as fases em ordem de tempo.
+
+        lines = []
+        for operation, totals in self.summary().items():
+            lines.append('{}: {} chamada(s), {:.3f} ms'.format(
+                operation, totals['calls'], totals['seconds'] * 1000))
+            for name, seconds in sorted(totals['phases'].items(), key=lambda item: -item[1]):
+                lines.append('  {:<16} {:>10.3f} ms'.format(name, seconds * 1000))
+            for name, value in sorted(totals['counters'].items()):
+                lines.append('  {:<16} {:>10}'.format(name, value))
+            if totals['peak_bytes'] is not None:
+                lines.append('  {:<16} {:>10.1f} KB'.format('pico memória', totals['peak_bytes'] / 1024))
+        return '\n'.join(lines)
+
+    def __repr__(self):
+        return 'Stats(calls={})'.format(self.calls)
+
+
+class ProfileReport:
+    # Resultado de profile_call: o valor retornado pela chamada, as estatísticas
+    # do cProfile (pstats.Stats), o snapshot do tracemalloc e os relatórios em
+    # texto (text: funções por tempo acumulado e linhas que mais alocaram).
+
+    def __init__(self, value, profile, snapshot, peak_bytes, text):
+        self.value = value
+        self.profile = profile
+        self.snapshot = snapshot
+        self.peak_bytes = peak_bytes
+        self.text = text
+
+    def dump(self, path):
+        # Grava o relatório em texto em path e o perfil binário em path + '.prof'
+        # (legível por pstats, snakeviz etc.).
+
+        with open(path, 'w') as file:
+            file.write(self.text)
+        self.profile.dump_stats(path + '.prof')
+
+
+def profile_call(func, *args, sort='cumulative', limit=25, memory_limit=10, output=None, **kwargs):
+    # Executa func(*args, **kwargs) uma vez sob cProfile e tracemalloc e
+    # retorna um ProfileReport. output: caminho onde gravar o relatório (ver
+    # ProfileReport.dump) ou um arquivo de texto aberto onde escrevê-lo.
+    # Alocações feitas pelo próprio profiler não são contadas.
+
+    import cProfile
+    import pstats
+    import tracemalloc
+
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+
+    profiler = cProfile.Profile()
+    try:
+        value = profiler.runcall(func, *args, **kwargs)
+        peak_bytes = tracemalloc.get_traced_memory()[1] - baseline
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, cProfile.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    buffer = io.StringIO()
+    profile = pstats.Stats(profiler, stream=buffer)
+    profile.sort_stats(sort).print_stats(limit)
+    buffer.write('Pico de memória: {:.1f} KB\n'.format(peak_bytes / 1024))
+    buffer.write('Linhas com mais memória retida:\n')
+    for statistic in snapshot.statistics('lineno')[:memory_limit]:
+        buffer.write('  {}\n'.format(statistic))
+
+    report = ProfileReport(value, profile, snapshot, peak_bytes, buffer.getvalue())
+    if isinstance(output, str):
+        report.dump(output)
+    elif output is not None:
+        output.write(report.text)
+    return report
@@ -0,0 +1,344 @@
+# src/loaders.py
+# Carga em massa de contratos e pedidos a partir de arquivos CSV ou JSONL.
+#
+# O arquivo é lido em blocos grandes de bytes (leitura bufferizada) e cada
+# bloco é processado de uma vez: no CSV, um único split separa todos os campos
+# e as colunas numéricas são convertidas com map(int/float); no JSONL, um único
+# json.loads sobre as linhas do bloco unidas como um array JSON. Se algo falha
+# no bloco, ele é reprocessado linha a linha (csv.reader / json.loads): as
+# linhas malformadas são contadas e registradas em um LoadReport, sem
+# interromper a carga.
+#
+# Campos com quebra de linha dentro de aspas (CSV) não são suportados.
+
+import csv
+import json
+import math
+import os
+from array import array
+from collections import namedtuple
+from itertools import repeat
+
+try:
+    from .contract import Contract
+    from .contract_batch import ContractBatch
+    from .order import Order
+    from .packing import compact_array
+except ImportError:
+    from contract import Contract
+    from contract_batch import ContractBatch
+    from order import Order
+    from packing import compact_array
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+
+_EXTENSIONS = {'.csv': FORMAT_CSV, '.jsonl': FORMAT_JSONL, '.ndjson': FORMAT_JSONL}
+
+# Bytes lidos por bloco.
+DEFAULT_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Exceções que indicam uma linha malformada.
+_ROW_ERRORS = (ValueError, TypeError, KeyError, IndexError)
+
+# Colunas de pedidos em lote: ids e tamanhos paralelos.
+OrderColumns = namedtuple('OrderColumns', 'ids sizes')
+
+
+class LoadReport:
+    # Resultado de uma carga: linhas válidas, linhas malformadas e as primeiras
+    # max_errors mensagens de erro, como (número da linha, motivo).
+
+    def __init__(self, max_errors=100):
+        # Inicializa o relatório vazio.
+
+        self.rows = 0
+        self.malformed = 0
+        self.errors = []
+        self.max_errors = max_errors
+
+    @property
+    def ok(self):
+        # Indica se nenhuma linha foi descartada.
+        return self.malformed == 0
+
+    def add_error(self, line_number, reason):
+        # Conta uma linha malformada e guarda o motivo (até max_errors).
+
+        self.malformed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append((line_number, reason))
+
+    def __repr__(self):
+        return 'LoadReport(rows={}, malformed={})'.format(self.rows, self.malformed)
+
+
+def detect_format(source):
+    # Formato a partir da extensão do arquivo ('.csv', '.jsonl' ou '.ndjson').
+
+    name = os.fspath(source) if isinstance(source, (str, os.PathLike)) else getattr(source, 'name', '')
+    extension = os.path.splitext(str(name))[1].lower()
+    try:
+        return _EXTENSIONS[extension]
+    except KeyError:
+        raise ValueError('Formato não reconhecido para {!r}; informe format'.format(name)) from None
+
+
+def _number(text):
+    # Converte um campo para int ou, se não for inteiro, float finito.
+
+    try:
+        return int(text)
+    except ValueError:
+        value = float(text)
+    if not math.isfinite(value):
+        raise ValueError('valor não finito: {!r}'.format(text))
+    return value
+
+
+def _numbers(column):
+    # Conversão em massa de uma coluna de texto: int, ou float se houver decimais.
+
+    try:
+        return list(map(int, column))
+    except ValueError:
+        values = list(map(float, column))
+    if not all(map(math.isfinite, values)):
+        raise ValueError('valor não finito')
+    return values
+
+
+def _compact(values):
+    # Array tipado para uma coluna já convertida: tenta 'q' (int64) direto,
+    # sem percorrer os valores em Python; colunas só de floats viram 'd'.
+
+    try:
+        return array('q', values)
+    except (TypeError, OverflowError):
+        pass
+    if set(map(type, values)) == {float}:
+        return array('d', values)
+    return compact_array(values)
+
+
+def _is_number(value):
+    return type(value) in (int, float) and math.isfinite(value)
+
+
+def _text_chunks(source, chunk_bytes):
+    # Gera (número da primeira linha, texto) para cada bloco lido de source:
+    # caminho do arquivo ou objeto de arquivo (binário ou texto). Cada bloco
+    # termina em fim de linha (sem o último '\n').
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, 'rb', buffering=chunk_bytes) as file:
+            yield from _text_chunks(file, chunk_bytes)
+        return
+
+    remainder = b''
+    line_number = 1
+    while True:
+        data = source.read(chunk_bytes)
+        if isinstance(data, str):
+            data = data.encode()
+        if not data:
+            break
+
+        data = remainder + data
+        cut = data.rfind(b'\n')
+        if cut < 0:
+            remainder = data
+            continue
+        remainder = data[cut + 1:]
+        text = data[:cut].decode('utf-8', errors='replace')
+        if '\r' in text:
+            text = text.replace('\r', '')
+        yield line_number, text
+        line_number += text.count('\n') + 1
+
+    if remainder:
+        yield line_number, remainder.decode('utf-8', errors='replace').replace('\r', '')
+
+
+def _read_csv(source, fields, id_type, header, chunk_bytes, report):
+    # Gera (ids, valores) por bloco de um CSV; fields são nomes de colunas
+    # (com header) ou posições.
+    #
+    # Caminho rápido: sem aspas no bloco e com exatamente width - 1 vírgulas
+    # em cada linha, todas as quebras de linha viram vírgulas e um único split
+    # separa todos os campos; cada coluna é uma fatia da lista. A contagem é
+    # por linha: só o total de campos deixaria duas linhas malformadas que se
+    # compensam deslocarem as colunas.
+
+    columns = None if header else fields
+    width = None
+
+    for line_number, text in _text_chunks(source, chunk_bytes):
+        if columns is None:
+            first, _, text = text.partition('\n')
+            names = next(csv.reader([first]))
+            try:
+                columns = [names.index(field) for field in fields]
+            except ValueError:
+                raise ValueError('Cabeçalho sem as colunas {}: {}'.format(fields, names)) from None
+            width = len(names)
+            line_number += 1
+            if not text:
+                continue
+        elif width is None:
+            width = len(next(csv.reader([text.partition('\n')[0]])))
+
+        id_column, value_column = columns
+        try:
+            if '"' in text:
+                raise ValueError('campos entre aspas')
+            if set(map(str.count, text.split('\n'), repeat(','))) != {width - 1}:
+                raise ValueError('número de campos')
+            cells = text.replace('\n', ',').split(',')
+            ids = cells[id_column::width]
+            if id_type is not str:
+                ids = list(map(id_type, ids))
+            values = _numbers(cells[value_column::width])
+        except _ROW_ERRORS:
+            ids, values = _csv_rows(text.split('\n'), line_number, columns, id_type, report)
+
+        report.rows += len(ids)
+        if ids:
+            yield ids, values
+
+
+def _csv_rows(lines, line_number, columns, id_type, report):
+    # Caminho lento: processa o bloco linha a linha com csv.reader,
+    # registrando as linhas malformadas.
+
+    id_column, value_column = columns
+    ids = []
+    values = []
+    for offset, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            row = next(csv.reader([line]))
+            row_id = id_type(row[id_column])
+            value = _number(row[value_column])
+        except _ROW_ERRORS + (csv.Error,) as error:
+            report.add_error(line_number + offset, '{}: {}'.format(type(error).__name__, error))
+            continue
+        ids.append(row_id)
+        values.append(value)
+    return ids, values
+
+
+def _read_jsonl(source, fields, id_type, chunk_bytes, report):
+    # Gera (ids, valores) por bloco de um JSONL; cada linha é um objeto com os
+    # campos fields. Os IDs precisam ser do tipo id_type.
+    # Caminho rápido: o bloco inteiro vira um array JSON (um único json.loads).
+
+    id_field, value_field = fields
+
+    for line_number, text in _text_chunks(source, chunk_bytes):
+        try:
+            objects = json.loads('[' + text.replace('\n', ',') + ']')
+            ids = [item[id_field] for item in objects]
+            values = [item[value_field] for item in objects]
+            if not all(type(value) is id_type for value in ids) or not all(map(_is_number, values)):
+                raise TypeError('tipo inválido')
+        except _ROW_ERRORS:
+            ids, values = _jsonl_rows(text.split('\n'), line_number, fields, id_type, report)
+
+        report.rows += len(ids)
+        if ids:
+            yield ids, values
+
+
+def _jsonl_rows(lines, line_number, fields, id_type, report):
+    # Caminho lento: processa o bloco linha a linha, registrando as malformadas.
+
+    id_field, value_field = fields
+    ids = []
+    values = []
+    for offset, line in enumerate(lines):
+        if not line.strip():
+            continue
+        try:
+            item = json.loads(line)
+            row_id = item[id_field]
+            value = item[value_field]
+            if type(row_id) is not id_type:
+                raise TypeError('{} deve ser {}'.format(id_field, id_type.__name__))
+            if not _is_number(value):
+                raise TypeError('{} deve ser numérico'.format(value_field))
+        except _ROW_ERRORS as error:
+            report.add_error(line_number + offset, '{}: {}'.format(type(error).__name__, error))
+            continue
+        ids.append(row_id)
+        values.append(value)
+    return ids, values
+
+
+def _read_columns(source, fields, format, id_type, header, chunk_bytes, report):
+    format = format or detect_format(source)
+    if format == FORMAT_CSV:
+        return _read_csv(source, fields, id_type, header, chunk_bytes, report)
+    if format == FORMAT_JSONL:
+        return _read_jsonl(source, fields, id_type, chunk_bytes, report)
+    raise ValueError('Formato desconhecido: {}'.format(format))
+
+
+def read_contracts(source, format=None, batches=False, report=None, id_field='id',
+                   debt_field='debt', id_type=int, header=True, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    # Lê contratos de um arquivo CSV ou JSONL (caminho ou objeto de arquivo).
+    # Gera objetos Contract, ou, com batches=True, um ContractBatch por bloco
+    # lido (colunas prontas para Contracts.get_top_N_open_contracts).
+    # format: 'csv' ou 'jsonl' (padrão: pela extensão); id_type: tipo dos IDs
+    # (int ou str); no CSV sem cabeçalho, id_field e debt_field são posições.
+    # Linhas malformadas são contadas em report (LoadReport), se fornecido.
+
+    report = report if report is not None else LoadReport()
+    for ids, debts in _read_columns(source, (id_field, debt_field), format, id_type,
+                                    header, chunk_bytes, report):
+        if batches:
+            yield ContractBatch.from_arrays(_compact(ids), _compact(debts))
+        else:
+            yield from map(Contract, ids, debts)
+
+
+def read_orders(source, format=None, batches=False, report=None, id_field='id',
+                size_field='size', id_type=int, header=True, chunk_bytes=DEFAULT_CHUNK_BYTES):
+    # Lê pedidos de um arquivo CSV ou JSONL, como read_contracts.
+    # Gera objetos Order, ou, com batches=True, um OrderColumns(ids, sizes) por
+    # bloco (colunas prontas para Orders.combine_orders_from_arrays).
+
+    report = report if report is not None else LoadReport()
+    for ids, sizes in _read_columns(source, (id_field, size_field), format, id_type,
+                                    header, chunk_bytes, report):
+        if batches:
+            yield OrderColumns(_compact(ids), _compact(sizes))
+        else:
+            yield from map(Order, ids, sizes)
+
+
+def load_contracts(source, **options):
+    # Lê o arquivo inteiro e retorna (ContractBatch, LoadReport).
+    # options são repassadas para read_contracts.
+
+    report = options.pop('report', None) or LoadReport()
+    ids = []
+    debts = []
+    for batch in read_contracts(source, batches=True, report=report, **options):
+        ids.extend(batch.ids)
+        debts.extend(batch.debts)
+    return ContractBatch.from_arrays(_compact(ids), _compact(debts)), report
+
+
+def load_orders(source, **options):
+    # Lê o arquivo inteiro e retorna (OrderColumns, LoadReport).
+    # options são repassadas para read_orders.
+
+    report = options.pop('report', None) or LoadReport()
+    ids = []
+    sizes = []
+    for batch in read_orders(source, batches=True, report=report, **options):
+        ids.extend(batch.ids)
+        sizes.extend(batch.sizes)
+    return OrderColumns(_compact(ids), _compact(sizes)), report
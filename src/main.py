@@ -1,17 +1,63 @@
 # src/main.py
-# Arquivo principal para testar as classes Contract, Contracts e Orders.
+# Linha de comando para executar Contracts e Orders sobre arquivos.
+#
+#   python src/main.py top-contracts contratos.csv --renegotiated reneg.txt --top-n 100
+#   python src/main.py combine-orders pedidos.jsonl --n-max 1000 --output-format jsonl
+#   cat pedidos.csv | python src/main.py combine-orders --n-max 1000 > grupos.csv
+#   python src/main.py demo
+#
+# Entradas: arquivos CSV/JSONL (formato pela extensão ou --format) ou a
+# entrada padrão ('-' ou nenhum arquivo). Cada arquivo é um job independente;
+# com mais de um, os resultados ganham a coluna source e --workers/--chunk-size
+# controlam a execução em lote (ver batch.py). Saída em CSV ou JSONL na saída
+# padrão (ou --output). Em série, cada entrada é lida, calculada e escrita
+# antes da próxima; com --workers > 1, as entradas são lidas todas antes do
+# envio aos processos e cada resultado é escrito assim que o bloco dele
+# termina. Entradas ilegíveis são avisadas na saída de erro e puladas, e o
+# comando termina com código 2.
+#
+# Os módulos do pacote são importados só quando o comando precisa deles, para
+# que --help e comandos pequenos iniciem rápido (sem NumPy, por exemplo).
+# Sem argumentos, executa a demonstração (demo) das classes.
 
-from contract import Contract
-from contracts import Contracts
-from orders import Orders
+import argparse
+import csv
+import importlib
+import json
+import os
+import sys
+
+FORMAT_CSV = 'csv'
+FORMAT_JSONL = 'jsonl'
+
+# Estratégias de combine-orders, as mesmas do registro de packing.py (fixas
+# aqui para que o parser não importe os módulos de cálculo).
+PACKING_STRATEGIES = ('bf', 'bfd', 'ff', 'ffd', 'nf', 'nfd', 'wf', 'wfd')
+
+# Códigos de saída
+EXIT_OK = 0
+EXIT_MALFORMED = 1
+EXIT_UNREADABLE = 2  # arquivo inexistente ou ilegível, como grep e diff
+EXIT_BROKEN_PIPE = 141  # 128 + SIGPIPE, como os utilitários de shell
+
+
+def _module(name):
+    # Importa um módulo do pacote sob demanda.
+
+    if __package__:
+        return importlib.import_module('.' + name, __package__)
+    return importlib.import_module(name)
 
 
 def test_contracts():
     # Testa a funcionalidade da classe Contracts.
 
+    Contract = _module('contract').Contract
+    Contracts = _module('contracts').Contracts
+
     print("=== Teste Contracts ===")
     contracts = Contracts()
-    
+
     # Criar contratos de exemplo
     open_contracts = [
         Contract(1, 1000),
@@ -21,30 +67,30 @@ def test_contracts():
         Contract(5, 800),
         Contract(6, 2000)
     ]
-    
+
     renegotiated_contracts = [2, 5]  # IDs dos contratos renegociados
     top_3 = contracts.get_top_N_open_contracts(open_contracts, renegotiated_contracts, 3)
-    
+
     print("Contratos abertos:")
     for contract in open_contracts:
         print(f"  {contract}")
-    
+
     print(f"\nContratos renegociados (IDs): {renegotiated_contracts}")
     print(f"\nTop 3 contratos abertos (excluindo renegociados):")
     for contract in top_3:
         print(f"  {contract}")
-    
+
     # Teste com casos limite
     print("\n--- Testes de casos limite ---")
-    
+
     # Lista vazia
     result_empty = contracts.get_top_N_open_contracts([], [], 3)
     print(f"Lista vazia: {result_empty}")
-    
+
     # Top_n = 0
     result_zero = contracts.get_top_N_open_contracts(open_contracts, [], 0)
     print(f"Top_n = 0: {result_zero}")
-    
+
     # Todos os contratos renegociados
     all_renegotiated = [1, 2, 3, 4, 5, 6]
     result_all_renegotiated = contracts.get_top_N_open_contracts(
@@ -55,58 +101,413 @@ def test_contracts():
 
 def test_orders():
     # Testa a funcionalidade da classe Orders.
-    
+
+    Orders = _module('orders').Orders
+
     print("\n=== Teste Orders ===")
     orders = Orders()
-    
+
     # Teste 1: Pedidos normais
     requests1 = [100, 200, 150, 300, 50, 250]
     n_max1 = 400
     result1 = orders.combine_orders(requests1, n_max1)
-    
+
     print(f"Teste 1:")
     print(f"  Pedidos: {requests1}")
     print(f"  Limite máximo: {n_max1}")
     print(f"  Grupos formados: {result1}")
-    print(f"  Somas dos grupos: {[sum(group) for group in result1]}")
-    
+    print(f"  Somas dos grupos: {list(result1.loads)}")
+    print(f"  Ocupação dos grupos: {[round(ratio, 2) for ratio in result1.fill_ratios]}")
+
     # Teste 2: Pedidos com valores que excedem o limite
     requests2 = [500, 100, 200, 600, 150]
     n_max2 = 400
     result2 = orders.combine_orders(requests2, n_max2)
-    
+
     print(f"\nTeste 2:")
     print(f"  Pedidos: {requests2}")
     print(f"  Limite máximo: {n_max2}")
     print(f"  Grupos formados: {result2}")
-    print(f"  Somas dos grupos: {[sum(group) for group in result2]}")
-    
+    print(f"  Somas dos grupos: {list(result2.loads)}")
+    print(f"  Ocupação dos grupos: {[round(ratio, 2) for ratio in result2.fill_ratios]}")
+
     # Teste 3: Casos limite
     print(f"\n--- Testes de casos limite ---")
-    
+
     # Lista vazia
     result_empty = orders.combine_orders([], 100)
     print(f"Lista vazia: {result_empty}")
-    
+
     # N_max = 0
     result_zero_max = orders.combine_orders([10, 20, 30], 0)
     print(f"N_max = 0: {result_zero_max}")
-    
+
     # Todos os pedidos excedem o limite
     result_all_exceed = orders.combine_orders([500, 600, 700], 400)
     print(f"Todos excedem limite: {result_all_exceed}")
 
 
-def main():
-    # Função principal para executar todos os testes.
+def demo(args=None):
+    # Demonstração das classes com exemplos fixos.
 
     print("Iniciando testes das classes Contract, Contracts e Orders\n")
-    
+
     test_contracts()
     test_orders()
-    
+
     print("\n=== Testes concluídos ===")
+    return EXIT_OK
+
+
+class _Writer:
+    # Escreve registros (dicts) em CSV ou JSONL, com as colunas fields.
+
+    def __init__(self, stream, format, fields):
+        self.stream = stream
+        self.fields = fields
+        if format == FORMAT_CSV:
+            self._csv = csv.writer(stream, lineterminator='\n')
+            self._csv.writerow(fields)
+        else:
+            self._csv = None
+
+    def write(self, rows):
+        # Escreve uma sequência de registros.
+
+        if self._csv is not None:
+            self._csv.writerows([row[field] for field in self.fields] for row in rows)
+        else:
+            fields = self.fields
+            self.stream.writelines(
+                json.dumps({field: row[field] for field in fields}, separators=(',', ':')) + '\n'
+                for row in rows)
+
+
+def _input_sources(paths):
+    # Nomes e fontes das entradas: caminhos, ou a entrada padrão para '-'.
+
+    paths = paths or ['-']
+    return [(path, sys.stdin.buffer if path == '-' else path) for path in paths]
+
+
+def _read_format(args, source):
+    # Formato da entrada: --format, a extensão do arquivo ou CSV para stdin.
+
+    if args.format:
+        return args.format
+    if source is sys.stdin.buffer:
+        return FORMAT_CSV
+    return None
+
+
+class _Inputs:
+    # Entradas do comando, carregadas uma por vez ao iterar: gera (nome,
+    # colunas) na ordem dos argumentos. Linhas malformadas são avisadas na
+    # saída de erro e somadas em malformed; entradas ilegíveis (inexistentes,
+    # sem permissão, de formato não reconhecido) são avisadas e puladas,
+    # somadas em unreadable.
+
+    def __init__(self, args, loader, recorder, **fields):
+        self.args = args
+        self.malformed = 0
+        self.unreadable = 0
+        self._load = getattr(_module('loaders'), loader)
+        self._recorder = recorder
+        self._fields = fields
+
+    def __iter__(self):
+        args = self.args
+        for name, source in _input_sources(args.inputs):
+            try:
+                with self._recorder.phase('load'):
+                    columns, report = self._load(
+                        source, format=_read_format(args, source), id_type=args.id_type,
+                        header=not args.no_header, **self._fields)
+            except (OSError, ValueError) as error:
+                print('{}: {}'.format(name, error), file=sys.stderr)
+                self.unreadable += 1
+                continue
+            self._recorder.count('rows', report.rows)
+            self.malformed += report.malformed
+            for line_number, reason in report.errors[:args.max_errors]:
+                print('{}:{}: {}'.format(name, line_number, reason), file=sys.stderr)
+            yield name, columns
+
+
+def _results(args, recorder, inputs, compute, compute_many):
+    # Gera (nome, resultado) de cada entrada, na ordem, medindo o cálculo na
+    # fase 'run'. compute(colunas) calcula uma entrada; compute_many(lista de
+    # colunas) retorna um iterador de JobResults (API em lote, lazy=True).
+    #
+    # Em série, cada entrada é carregada e calculada só depois que o resultado
+    # anterior foi consumido (escrito). Com --workers > 1 e várias entradas,
+    # todas são carregadas e enviadas aos processos, e cada resultado é
+    # entregue assim que o bloco dele termina. Com --profile, as entradas são
+    # carregadas e calculadas todas sob profile_call antes da escrita.
+
+    if args.profile:
+        loaded = list(inputs)
+        report = _module('instrumentation').profile_call(
+            list, _computed(args, recorder, loaded, compute, compute_many), output=args.profile)
+        return report.value
+    return _computed(args, recorder, inputs, compute, compute_many)
+
+
+def _computed(args, recorder, inputs, compute, compute_many):
+    # Gerador de _results.
+
+    if _executor(args) and len(args.inputs) > 1:
+        loaded = list(inputs)
+        results = compute_many([columns for _, columns in loaded])
+        for name, _ in loaded:
+            with recorder.phase('run'):
+                result = _unwrap(next(results))
+            yield name, result
+    else:
+        for name, columns in inputs:
+            with recorder.phase('run'):
+                result = compute(columns)
+            yield name, result
+
+
+def _executor(args):
+    # Executor das APIs em lote: processos com --workers > 1, senão em série.
+    return 'process' if args.workers and args.workers > 1 else None
+
+
+def top_contracts(args):
+    # Subcomando top-contracts: os top N contratos de cada entrada.
+
+    stats = _module('instrumentation').Stats()
+    with stats.record('cli') as recorder:
+        inputs = _Inputs(args, 'load_contracts', recorder,
+                         id_field=args.id_field, debt_field=args.debt_field)
+        renegotiated = frozenset(_renegotiated_ids(args))
+        contracts = _module('contracts').Contracts(stats=stats if args.stats else None)
+
+        def compute(batch):
+            return contracts.get_top_N_open_contracts(batch, renegotiated, args.top_n, args.strategy)
+
+        def compute_many(batches):
+            return contracts.get_top_N_many(
+                [(batch, renegotiated, args.top_n) for batch in batches], args.strategy,
+                _executor(args), args.workers, args.chunk_size, lazy=True)
+
+        fields = ['rank', 'id', 'debt']
+        if len(args.inputs) > 1:
+            fields.insert(0, 'source')
+        with _output(args) as stream:
+            writer = _Writer(stream, args.output_format, fields)
+            for name, result in _results(args, recorder, inputs, compute, compute_many):
+                with recorder.phase('write'):
+                    writer.write([{'source': name, 'rank': rank, 'id': contract.id,
+                                   'debt': contract.debt}
+                                  for rank, contract in enumerate(result, 1)])
+
+    return _finish(args, stats, inputs)
+
+
+def combine_orders(args):
+    # Subcomando combine-orders: empacota os pedidos de cada entrada.
+    # CSV: uma linha por pedido (group, id, load); JSONL: uma linha por grupo
+    # (group, load, items).
+
+    stats = _module('instrumentation').Stats()
+    with stats.record('cli') as recorder:
+        inputs = _Inputs(args, 'load_orders', recorder,
+                         id_field=args.id_field, size_field=args.size_field)
+        orders = _module('orders').Orders(stats=stats if args.stats else None)
+
+        def compute(columns):
+            if args.split_oversize:
+                return orders.combine_orders(list(zip(columns.ids, columns.sizes)), args.n_max,
+                                             args.strategy, split_oversize=True)
+            return orders.combine_orders_from_arrays(columns.ids, columns.sizes, args.n_max,
+                                                     args.strategy)
+
+        def compute_many(loaded):
+            return orders.combine_orders_many(
+                [(list(zip(columns.ids, columns.sizes)), args.n_max) for columns in loaded],
+                args.strategy, args.split_oversize, _executor(args), args.workers,
+                args.chunk_size, lazy=True)
+
+        if args.output_format == FORMAT_CSV:
+            fields = ['group', 'id', 'load']
+        else:
+            fields = ['group', 'load', 'items']
+        if len(args.inputs) > 1:
+            fields.insert(0, 'source')
+        with _output(args) as stream:
+            writer = _Writer(stream, args.output_format, fields)
+            for name, result in _results(args, recorder, inputs, compute, compute_many):
+                with recorder.phase('write'):
+                    groups = enumerate(zip(result, result.loads))
+                    if args.output_format == FORMAT_CSV:
+                        writer.write([{'source': name, 'group': index, 'id': item, 'load': load}
+                                      for index, (group, load) in groups for item in group])
+                    else:
+                        writer.write([{'source': name, 'group': index, 'load': load,
+                                       'items': group}
+                                      for index, (group, load) in groups])
+
+    return _finish(args, stats, inputs)
+
+
+def _unwrap(result):
+    # Valor de um JobResult, ou a exceção do job.
+
+    if not result.ok:
+        raise result.error
+    return result.value
+
+
+def _renegotiated_ids(args):
+    # IDs renegociados de --renegotiated (arquivo com um ID por linha; vírgulas
+    # também separam) e --renegotiated-ids. ValueError para IDs que não são do
+    # tipo --id-type.
+
+    texts = []
+    if args.renegotiated:
+        with open(args.renegotiated) as file:
+            texts.append(file.read())
+    if args.renegotiated_ids:
+        texts.append(args.renegotiated_ids)
+
+    ids = []
+    for text in texts:
+        for item in text.replace(',', '\n').split():
+            try:
+                ids.append(args.id_type(item))
+            except ValueError:
+                raise ValueError('ID renegociado inválido para --id-type {}: {!r}'.format(
+                    args.id_type.__name__, item)) from None
+    return ids
+
+
+class _output:
+    # Context manager com o fluxo de saída: --output ou a saída padrão.
+
+    def __init__(self, args):
+        self._path = args.output
+
+    def __enter__(self):
+        if self._path and self._path != '-':
+            self._file = open(self._path, 'w', newline='')
+            return self._file
+        self._file = None
+        return sys.stdout
+
+    def __exit__(self, *exc_info):
+        if self._file is not None:
+            self._file.close()
+        else:
+            sys.stdout.flush()
+        return False
+
+
+def _finish(args, stats, inputs):
+    # Resumo das linhas malformadas, relatório de --stats na saída de erro e
+    # código de saída.
+
+    if inputs.malformed:
+        print('{} linha(s) malformada(s) ignorada(s)'.format(inputs.malformed), file=sys.stderr)
+    if args.stats:
+        print(stats.report(), file=sys.stderr)
+    if inputs.unreadable:
+        return EXIT_UNREADABLE
+    if inputs.malformed and args.strict:
+        return EXIT_MALFORMED
+    return EXIT_OK
+
+
+def _add_common_arguments(parser):
+    parser.add_argument('inputs', nargs='*', metavar='ARQUIVO',
+                        help="arquivos CSV/JSONL de entrada ('-' ou nenhum: entrada padrão)")
+    parser.add_argument('--format', choices=[FORMAT_CSV, FORMAT_JSONL],
+                        help='formato das entradas (padrão: pela extensão; CSV na entrada padrão)')
+    parser.add_argument('--no-header', action='store_true',
+                        help='CSV sem cabeçalho: os campos são posições (0, 1, ...)')
+    parser.add_argument('--id-field', default='id')
+    parser.add_argument('--id-type', choices=['int', 'str'], default='int',
+                        help='tipo dos IDs (padrão: int)')
+    parser.add_argument('--output', '-o', help='arquivo de saída (padrão: saída padrão)')
+    parser.add_argument('--output-format', choices=[FORMAT_CSV, FORMAT_JSONL], default=FORMAT_CSV)
+    parser.add_argument('--workers', type=int,
+                        help='processos para várias entradas (padrão: em série)')
+    parser.add_argument('--chunk-size', type=int, default=64, help='jobs por bloco no modo em lote')
+    parser.add_argument('--strict', action='store_true',
+                        help='termina com código 1 se houver linhas malformadas')
+    parser.add_argument('--max-errors', type=int, default=10,
+                        help='linhas malformadas detalhadas por entrada')
+    parser.add_argument('--stats', action='store_true',
+                        help='mostra tempos por fase e contadores na saída de erro (com '
+                             '--workers > 1, só as fases da linha de comando: as fases '
+                             'internas dos cálculos ficam nos processos trabalhadores)')
+    parser.add_argument('--profile', metavar='ARQUIVO',
+                        help='perfila o cálculo (cProfile/tracemalloc) e grava o relatório')
+
+
+def _field(value):
+    # Campo por nome ou, em CSV sem cabeçalho, por posição.
+    return int(value) if value.isdigit() else value
+
+
+def build_parser():
+    # Parser da linha de comando.
+
+    parser = argparse.ArgumentParser(
+        prog='main.py', description='Top N de contratos e empacotamento de pedidos sobre arquivos')
+    commands = parser.add_subparsers(dest='command')
+
+    top = commands.add_parser('top-contracts', help='top N contratos abertos por débito')
+    _add_common_arguments(top)
+    top.add_argument('--top-n', '-n', type=int, required=True)
+    top.add_argument('--renegotiated', metavar='ARQUIVO', help='IDs renegociados, um por linha')
+    top.add_argument('--renegotiated-ids', metavar='IDS', help='IDs renegociados separados por vírgula')
+    top.add_argument('--debt-field', type=_field, default='debt')
+    top.add_argument('--strategy', default='auto', choices=['auto', 'heap', 'quickselect', 'sort'])
+    top.set_defaults(handler=top_contracts)
+
+    combine = commands.add_parser('combine-orders', help='agrupa pedidos respeitando o limite')
+    _add_common_arguments(combine)
+    combine.add_argument('--n-max', type=float, required=True, help='limite de cada grupo')
+    combine.add_argument('--size-field', type=_field, default='size')
+    combine.add_argument('--strategy', default='ffd',
+                         choices=PACKING_STRATEGIES,
+                         help='estratégia de empacotamento (padrão: ffd)')
+    combine.add_argument('--split-oversize', action='store_true',
+                         help='divide pedidos maiores que o limite')
+    combine.set_defaults(handler=combine_orders)
+
+    commands.add_parser('demo', help='demonstração com exemplos fixos').set_defaults(handler=demo)
+    return parser
+
+
+def main(argv=None):
+    # Ponto de entrada: executa o subcomando e retorna o código de saída.
+
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv) if argv else None
+    handler = demo if args is None or args.command is None else args.handler
+
+    if args is not None and args.command not in (None, 'demo'):
+        args.id_field = _field(args.id_field)
+        args.id_type = {'int': int, 'str': str}[args.id_type]
+        if getattr(args, 'n_max', None) is not None and args.n_max.is_integer():
+            args.n_max = int(args.n_max)
+
+    try:
+        return handler(args)
+    except BrokenPipeError:
+        # Saída fechada antes do fim (ex.: | head): encerra sem traceback
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return EXIT_BROKEN_PIPE
+    except (OSError, ValueError) as error:
+        # Arquivo de renegociados ou de saída inacessível, ou ID renegociado inválido
+        print('main.py: {}'.format(error), file=sys.stderr)
+        return EXIT_UNREADABLE
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,143 @@
+# src/online_packing.py
+# Agrupamento online de pedidos: os pedidos chegam um a um (ou em pequenos
+# lotes) e no máximo max_open_groups grupos ficam abertos ao mesmo tempo.
+# Memória e latência ficam limitadas, ao custo de alguns grupos a mais que o
+# FFD offline.
+
+import time
+from bisect import bisect_right, insort
+
+_INFINITY = float('inf')
+
+
+class _OpenGroup:
+    # Grupo aberto: itens, carga acumulada e instante de criação.
+
+    __slots__ = ('items', 'load', 'created')
+
+    def __init__(self, request, created):
+        self.items = [request]
+        self.load = request
+        self.created = created
+
+
+class OnlineOrderGrouper:
+    # Mantém os grupos abertos indexados pela carga (lista ordenada de
+    # (carga, sequência)) e encaixa cada pedido por Best Fit, em O(log K).
+    #
+    # Um grupo é fechado (emitido) quando:
+    # - fica cheio (carga == n_max) ou atinge max_group_items itens;
+    # - fica aberto por mais de max_group_age segundos (verificado em add/poll);
+    # - é preciso abrir um grupo novo e já há max_open_groups abertos: nesse caso
+    #   o grupo mais cheio é fechado.
+    # Pedidos maiores que n_max são emitidos imediatamente em grupo próprio.
+
+    def __init__(self, n_max, max_open_groups=16, max_group_items=None, max_group_age=None,
+                 clock=time.monotonic):
+        # Inicializa o agrupador.
+
+        if n_max <= 0:
+            raise ValueError('n_max deve ser positivo')
+        if max_open_groups < 1:
+            raise ValueError('max_open_groups deve ser pelo menos 1')
+
+        self.n_max = n_max
+        self.max_open_groups = max_open_groups
+        self.max_group_items = max_group_items
+        self.max_group_age = max_group_age
+        self._clock = clock
+        self._groups = {}      # sequência -> _OpenGroup
+        self._keys = []        # (carga, sequência) em ordem crescente
+        self._next_sequence = 0
+
+    @property
+    def open_groups(self):
+        # Cópia dos grupos abertos, em ordem de criação.
+
+        return [list(group.items) for _, group in sorted(self._groups.items())]
+
+    def add(self, request):
+        # Encaixa um pedido e retorna a lista de grupos fechados por ele.
+
+        closed = self.poll()
+
+        if request > self.n_max:
+            closed.append([request])
+            return closed
+
+        sequence = self._best_fit(request)
+        if sequence is None:
+            if len(self._groups) >= self.max_open_groups:
+                closed.append(self._close(self._keys[-1][1]))
+            sequence = self._open(request)
+        else:
+            group = self._groups[sequence]
+            self._keys.remove((group.load, sequence))
+            group.items.append(request)
+            group.load += request
+            insort(self._keys, (group.load, sequence))
+
+        group = self._groups[sequence]
+        if group.load >= self.n_max or (
+                self.max_group_items is not None and len(group.items) >= self.max_group_items):
+            closed.append(self._close(sequence))
+
+        return closed
+
+    def extend(self, requests):
+        # Encaixa um lote de pedidos e retorna os grupos fechados.
+
+        closed = []
+        for request in requests:
+            closed.extend(self.add(request))
+        return closed
+
+    def poll(self):
+        # Fecha e retorna os grupos abertos há mais de max_group_age segundos.
+
+        if self.max_group_age is None or not self._groups:
+            return []
+
+        limit = self._clock() - self.max_group_age
+        expired = [sequence for sequence, group in self._groups.items() if group.created <= limit]
+        return [self._close(sequence) for sequence in sorted(expired)]
+
+    def flush(self):
+        # Fecha e retorna todos os grupos abertos, em ordem de criação.
+
+        return [self._close(sequence) for sequence in sorted(self._groups)]
+
+    def _best_fit(self, request):
+        # Sequência do grupo mais cheio onde o pedido cabe, ou None.
+
+        keys = self._keys
+        position = bisect_right(keys, (self.n_max - request, _INFINITY)) - 1
+        while position >= 0 and not keys[position][0] + request <= self.n_max:
+            position -= 1
+        return keys[position][1] if position >= 0 else None
+
+    def _open(self, request):
+        sequence = self._next_sequence
+        self._next_sequence += 1
+        self._groups[sequence] = _OpenGroup(request, self._clock())
+        insort(self._keys, (request, sequence))
+        return sequence
+
+    def _close(self, sequence):
+        group = self._groups.pop(sequence)
+        self._keys.remove((group.load, sequence))
+        return group.items
+
+
+def group_orders_online(requests, n_max, chunked=False, **options):
+    # Gerador: consome os pedidos (ou lotes, com chunked=True) e produz cada
+    # grupo assim que ele é fechado; os grupos restantes saem no final.
+    # options são repassadas para OnlineOrderGrouper.
+
+    grouper = OnlineOrderGrouper(n_max, **options)
+
+    for item in requests:
+        closed = grouper.extend(item) if chunked else grouper.add(item)
+        yield from closed
+
+    yield from grouper.flush()
@@ -0,0 +1,22 @@
+# src/order.py
+class Order:
+    # Classe que representa um pedido com ID e tamanho (valor/quantidade).
+    # Usa __slots__, como Contract, para ocupar pouca memória por pedido.
+
+    __slots__ = ('id', 'size')
+
+    def __init__(self, id, size):
+        # Inicializa um pedido.
+
+        self.id = id
+        self.size = size
+
+    def __str__(self):
+        # Retorna uma representação string do pedido.
+
+        return 'id={}, size={}'.format(self.id, self.size)
+
+    def __repr__(self):
+        # Retorna uma representação para debug.
+
+        return f'Order(id={self.id}, size={self.size})'
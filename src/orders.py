@@ -1,38 +1,239 @@
 # src/orders.py
+
+from collections.abc import Sequence
+
+try:
+    from .batch import DEFAULT_CHUNK_SIZE, call, iter_batch, run_batch, scratch
+    from .exact_packing import PackingSolution, optimize_packing
+    from .instrumentation import NULL_RECORDER
+    from .online_packing import group_orders_online
+    from .parallel_packing import DEFAULT_REPAIR_THRESHOLD, PARALLEL_MIN_SIZE, pack_parallel
+    from .order import Order
+    from .packing import (
+        DEFAULT_STRATEGY, LoadTree, PackingResult, build_groups, compact_array, pack, pack_records,
+        pack_split
+    )
+    from .vector_packing import ORDERING_NORM, PLACEMENT_FIRST, pack_vectors
+except ImportError:
+    from batch import DEFAULT_CHUNK_SIZE, call, iter_batch, run_batch, scratch
+    from exact_packing import PackingSolution, optimize_packing
+    from instrumentation import NULL_RECORDER
+    from online_packing import group_orders_online
+    from parallel_packing import DEFAULT_REPAIR_THRESHOLD, PARALLEL_MIN_SIZE, pack_parallel
+    from order import Order
+    from packing import (
+        DEFAULT_STRATEGY, LoadTree, PackingResult, build_groups, compact_array, pack, pack_records,
+        pack_split
+    )
+    from vector_packing import ORDERING_NORM, PLACEMENT_FIRST, pack_vectors
+
+
+def _is_record(request):
+    # Indica se o pedido é identificado: um Order (ou objeto com id e size) ou
+    # um par (id, tamanho).
+    return isinstance(request, (Order, tuple)) or (hasattr(request, 'id') and hasattr(request, 'size'))
+
+
+def _split_records(requests):
+    # Separa pedidos identificados em IDs e tamanhos (array tipado quando possível).
+
+    ids = []
+    sizes = []
+    for request in requests:
+        if isinstance(request, tuple):
+            order_id, size = request
+        else:
+            order_id, size = request.id, request.size
+        ids.append(order_id)
+        sizes.append(size)
+    return ids, compact_array(sizes)
+
+
+def _combine(requests, n_max, strategy=DEFAULT_STRATEGY, split_oversize=False, tree=None,
+             recorder=NULL_RECORDER):
+    # Implementação de Orders.combine_orders; tree é a LoadTree reaproveitada
+    # pelos jobs em lote e recorder recebe as medições (ver instrumentation.py).
+
+    if not isinstance(requests, Sequence):
+        requests = list(requests)
+
+    # Validação de entrada
+    if not requests:
+        return PackingResult()
+
+    if n_max <= 0:
+        return PackingResult()
+
+    if _is_record(requests[0]):
+        with recorder.phase('records'):
+            ids, sizes = _split_records(requests)
+        if split_oversize:
+            return pack_split(sizes, n_max, strategy, ids, tree, recorder)
+        return pack_records(ids, sizes, n_max, strategy, tree, recorder)
+
+    if split_oversize:
+        return pack_split(requests, n_max, strategy, tree=tree, recorder=recorder)
+
+    # Padrão First Fit Decreasing: pedidos em ordem decrescente, cada um no
+    # primeiro grupo com espaço. Pedidos maiores que o limite ficam em grupo
+    # próprio. A busca do primeiro grupo usa uma árvore de segmentos sobre as
+    # cargas dos grupos (ver packing.py), em O(n log n) no total.
+    return pack(requests, n_max, strategy, tree, recorder)
+
+
+def _combine_job(job, strategy, split_oversize, tree):
+    # Um job de combine_orders_many: par (requests, n_max).
+
+    requests, n_max = job
+    return _combine(requests, n_max, strategy, split_oversize, tree)
+
+
+def _combine_chunk(payload):
+    # Processa um bloco de jobs de combine_orders_many (ver batch.py), com uma
+    # única LoadTree por thread reaproveitada entre os jobs.
+
+    jobs, (strategy, split_oversize) = payload
+    tree = scratch('load_tree', lambda: LoadTree(1))
+    return [call(_combine_job, job, strategy, split_oversize, tree) for job in jobs]
+
+
 class Orders:
     #Classe para gerenciar operações com pedidos.
+
+    def __init__(self, stats=None):
+        # Inicializa o gerenciador. Com stats (instrumentation.Stats), as chamadas
+        # de combine_orders e combine_orders_from_arrays registram o tempo de
+        # cada fase (ordenação, encaixe, montagem dos grupos) e os contadores
+        # de itens, grupos e grupos examinados (desligado por padrão).
+
+        self.stats = stats
     
-    def combine_orders(self, requests, n_max):
+    def combine_orders(self, requests, n_max, strategy=DEFAULT_STRATEGY, split_oversize=False):
         # Combina pedidos em grupos otimizados respeitando o limite máximo.
         # Retorna Lista de listas, onde cada sublista representa um grupo de pedidos combinados
+        # strategy escolhe o algoritmo registrado em packing.py: 'ffd' (padrão),
+        # 'ff', 'bfd', 'bf', 'wfd', 'wf', 'nfd' ou 'nf'.
+        # O resultado é um PackingResult: itera como a lista de listas e traz,
+        # calculados durante o empacotamento, a carga (.loads), a capacidade
+        # livre (.free), a ocupação (.fill_ratios) e os grupos acima do limite
+        # (.oversize) de cada grupo.
+        # requests também pode conter pedidos identificados (Order ou pares
+        # (id, tamanho)): nesse caso cada grupo contém os IDs dos pedidos.
+        # Com split_oversize=True, pedidos maiores que n_max são divididos em
+        # pedaços de n_max mais o resto, que é empacotado com os demais pedidos;
+        # result.sources liga cada item ao pedido original (ver pack_split).
         
+        if self.stats is None:
+            return _combine(requests, n_max, strategy, split_oversize)
+        with self.stats.record('combine_orders') as recorder:
+            return _combine(requests, n_max, strategy, split_oversize, recorder=recorder)
+
+    def combine_orders_from_arrays(self, ids, sizes, n_max, strategy=DEFAULT_STRATEGY):
+        # Mesmo resultado de combine_orders com pedidos identificados, recebendo
+        # colunas paralelas de IDs e tamanhos (listas ou array, ex.: as de
+        # loaders.read_orders com batches=True) em vez de objetos Order.
+
+        if len(ids) != len(sizes):
+            raise ValueError('ids e sizes devem ter o mesmo tamanho')
+
+        # Validação de entrada
+        if not len(sizes) or n_max <= 0:
+            return PackingResult()
+
+        if self.stats is None:
+            return pack_records(ids, sizes, n_max, strategy)
+        with self.stats.record('combine_orders') as recorder:
+            return pack_records(ids, sizes, n_max, strategy, recorder=recorder)
+
+    def combine_orders_optimized(self, requests, n_max, time_budget=1.0, node_budget=None):
+        # Modo de otimização: parte do resultado FFD e tenta usar menos grupos
+        # (busca local e branch-and-bound) até esgotar o orçamento de tempo em
+        # segundos e/ou de nós (None = sem limite).
+        # Retorna um PackingSolution com os grupos, o limite inferior e o gap.
+
+        # Validação de entrada
+        if not requests or n_max <= 0:
+            return PackingSolution([], 0, 0)
+
+        return optimize_packing(requests, n_max, time_budget, node_budget)
+
+    def combine_orders_stream(self, requests, n_max, max_open_groups=16, max_group_items=None,
+                              max_group_age=None, chunked=False):
+        # Agrupamento online: consome qualquer iterável de pedidos (ou de lotes,
+        # com chunked=True) e produz cada grupo assim que ele é fechado, com no
+        # máximo max_open_groups grupos abertos (ver online_packing.py).
+
+        # Validação de entrada
+        if n_max <= 0:
+            return iter([])
+
+        return group_orders_online(
+            requests, n_max, chunked=chunked, max_open_groups=max_open_groups,
+            max_group_items=max_group_items, max_group_age=max_group_age
+        )
+
+    def combine_orders_parallel(self, requests, n_max, workers=None, shards=None,
+                                repair_threshold=DEFAULT_REPAIR_THRESHOLD):
+        # Modo paralelo: divide os pedidos em shards estratificados por tamanho,
+        # empacota cada shard (FFD) em um processo do pool e reempacota juntos os
+        # grupos com carga abaixo de repair_threshold * n_max.
+        # Para poucos pedidos, usa o FFD serial.
+
         # Validação de entrada
         if not requests:
-            return []
-        
+            return PackingResult()
+
         if n_max <= 0:
-            return []
-        
-        # Ordenar pedidos em ordem decrescente para melhor aproveitamento
-        requests_sorted = sorted(requests, reverse=True)
-        groups = []
-        
-        for request in requests_sorted:
-            # Se o pedido individual já excede o limite, criar grupo próprio
-            if request > n_max:
-                groups.append([request])
-                continue
-            
-            # Tentar adicionar a um grupo existente
-            added = False
-            for group in groups:
-                if sum(group) + request <= n_max:
-                    group.append(request)
-                    added = True
-                    break
-            
-            # Se não foi possível adicionar a nenhum grupo, criar novo grupo
-            if not added:
-                groups.append([request])
-        
-        return groups
\ No newline at end of file
+            return PackingResult()
+
+        if len(requests) < PARALLEL_MIN_SIZE:
+            return pack(requests, n_max, DEFAULT_STRATEGY)
+
+        return pack_parallel(requests, n_max, workers, shards, repair_threshold)
+
+    def combine_orders_multi(self, requests, capacities, ordering=ORDERING_NORM, placement=PLACEMENT_FIRST):
+        # Empacotamento multidimensional: cada pedido é um vetor de demandas
+        # (ex.: (peso, volume, itens)) ou um Order cujo size é esse vetor, e
+        # capacities traz o limite de cada dimensão.
+        # ordering: 'norm' (padrão), 'sum', 'max' ou None; placement: 'first'
+        # (padrão) ou 'dot' (ver vector_packing.py).
+        # Retorna um PackingResult com grupos de vetores (ou de IDs, para Order),
+        # a carga de cada grupo (tupla por dimensão) em .loads e a folga por
+        # dimensão em .free.
+
+        if not isinstance(requests, Sequence):
+            requests = list(requests)
+
+        # Validação de entrada
+        if not requests:
+            return PackingResult()
+
+        if any(capacity <= 0 for capacity in capacities):
+            return PackingResult()
+
+        if _is_record(requests[0]) and not isinstance(requests[0], tuple):
+            items = [request.id for request in requests]
+            vectors = [request.size for request in requests]
+        else:
+            items = vectors = requests
+
+        assignment, loads = pack_vectors(vectors, capacities, ordering, placement)
+        groups = build_groups(items, assignment, len(loads))
+        return PackingResult(groups, loads, tuple(capacities))
+
+    def combine_orders_many(self, jobs, strategy=DEFAULT_STRATEGY, split_oversize=False,
+                            executor=None, workers=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                            lazy=False):
+        # Executa vários empacotamentos independentes (ex.: um por armazém).
+        # jobs: iterável de pares (requests, n_max); strategy e split_oversize
+        # valem para todos, como em combine_orders.
+        # executor: None (em série), 'thread', 'process' ou um Executor existente,
+        # com workers processos/threads e blocos de chunk_size jobs (ver batch.py).
+        # Retorna um JobResult(value, error) por job, na ordem de entrada: value é
+        # o PackingResult e error a exceção do job, se houver. Com lazy=True,
+        # retorna um iterador que os entrega à medida que os blocos terminam.
+
+        return (iter_batch if lazy else run_batch)(
+            _combine_chunk, jobs, (strategy, split_oversize),
+            executor=executor, workers=workers, chunk_size=chunk_size
+        )
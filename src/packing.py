@@ -0,0 +1,677 @@
+# src/packing.py
+# Núcleo de empacotamento de pedidos (bin packing) usado por Orders.
+#
+# As funções de encaixe (first_fit, best_fit, ...) recebem os tamanhos já na
+# ordem de processamento e retornam (assignment, loads): o número do grupo de
+# cada item e a carga acumulada de cada grupo. build_groups monta as listas de
+# grupos a partir disso. Em todas elas, itens maiores que n_max abrem um grupo
+# próprio.
+
+import heapq
+import math
+from array import array
+from bisect import bisect_right, insort
+from collections import Counter, namedtuple
+from collections.abc import Sequence, Sized
+from itertools import islice, repeat
+
+try:
+    from .instrumentation import NULL_RECORDER
+except ImportError:
+    from instrumentation import NULL_RECORDER
+
+_EMPTY = float('inf')
+
+# Tamanho dos blocos da lista ordenada de cargas do Best Fit (ver best_fit).
+_BEST_FIT_BLOCK = 512
+
+# O caminho por contagem (first_fit_decreasing_counts) é usado quando o número
+# de tamanhos distintos é no máximo esta fração do número de pedidos.
+COUNTING_MAX_DISTINCT_RATIO = 0.25
+# Pedidos contados por vez em size_counts, entre as verificações de parada.
+_COUNT_BLOCK = 4096
+
+
+# LoadTree.reset troca a árvore por uma menor quando ela tem mais que este
+# múltiplo das folhas necessárias.
+_SHRINK_FACTOR = 4
+
+
+def _leaves(capacity):
+    # Número de folhas da árvore: a menor potência de 2 >= capacity.
+
+    size = 1
+    while size < capacity:
+        size *= 2
+    return size
+
+
+class LoadTree:
+    # Árvore de segmentos (torneio) com a menor carga de cada subárvore.
+    # Permite achar em O(log m) o primeiro grupo onde um pedido cabe.
+    #
+    # A condição testada é a mesma do algoritmo original, carga + pedido <= n_max.
+    # Como a soma em ponto flutuante é monótona, se o pedido cabe no grupo de
+    # menor carga de uma subárvore, cabe em algum grupo dela; a descida sempre
+    # vai para a subárvore mais à esquerda que tem espaço.
+
+    def __init__(self, capacity):
+        # Inicializa a árvore para até capacity grupos.
+
+        size = _leaves(capacity)
+        self.size = size
+        self.tree = [_EMPTY] * (2 * size)
+
+    def reset(self, capacity):
+        # Reaproveita a árvore para um novo empacotamento com até capacity grupos.
+        # Uma árvore muito maior que o necessário (ex.: depois de um job grande
+        # na mesma thread) é trocada por uma do tamanho certo: limpar e descer
+        # a árvore grande custaria O(tamanho antigo) por job e a memória
+        # ficaria presa à thread.
+
+        size = _leaves(capacity)
+        if size > self.size or self.size > _SHRINK_FACTOR * size:
+            self.__init__(capacity)
+        else:
+            self.tree[:] = repeat(_EMPTY, len(self.tree))
+
+    def first_fit(self, request, n_max):
+        # Retorna o primeiro grupo com carga + request <= n_max, ou -1.
+
+        tree = self.tree
+        if not tree[1] + request <= n_max:
+            return -1
+
+        size = self.size
+        node = 1
+        while node < size:
+            node *= 2
+            if not tree[node] + request <= n_max:
+                node += 1
+        return node - size
+
+    def set_load(self, group, load):
+        # Atualiza a carga de um grupo e propaga o mínimo até a raiz.
+
+        tree = self.tree
+        node = group + self.size
+        tree[node] = load
+        node //= 2
+        while node:
+            left = tree[2 * node]
+            right = tree[2 * node + 1]
+            best = left if left <= right else right
+            if tree[node] == best:
+                break
+            tree[node] = best
+            node //= 2
+
+
+def first_fit(sizes, n_max, tree=None):
+    # First Fit em O(n log n): cada item vai para o primeiro grupo com espaço.
+    # Itens maiores que n_max abrem um grupo próprio. tree permite reaproveitar
+    # uma LoadTree entre chamadas.
+
+    if tree is None:
+        tree = LoadTree(len(sizes))
+    else:
+        tree.reset(len(sizes))
+
+    assignment = []
+    loads = []
+    # Descida e atualização da árvore feitas em linha: este laço é o ponto quente.
+    nodes = tree.tree
+    leaves = tree.size
+
+    for size in sizes:
+        if size > n_max or not nodes[1] + size <= n_max:
+            group = len(loads)
+            loads.append(size)
+            load = size
+        else:
+            node = 1
+            while node < leaves:
+                node *= 2
+                if not nodes[node] + size <= n_max:
+                    node += 1
+            group = node - leaves
+            load = loads[group] + size
+            loads[group] = load
+
+        node = group + leaves
+        nodes[node] = load
+        node //= 2
+        while node:
+            left = nodes[2 * node]
+            right = nodes[2 * node + 1]
+            best = left if left <= right else right
+            if nodes[node] == best:
+                break
+            nodes[node] = best
+            node //= 2
+
+        assignment.append(group)
+
+    return assignment, loads
+
+
+def best_fit(sizes, n_max):
+    # Best Fit em O(n log m): cada item vai para o grupo mais cheio onde ainda
+    # cabe (empate: menor índice). As chaves (carga, -grupo) ficam ordenadas
+    # em blocos de até 2 * _BEST_FIT_BLOCK chaves, com a maior chave de cada
+    # bloco em maxes (como em sortedcontainers.SortedList): a busca é um bisect
+    # em maxes e outro no bloco, e remover ou inserir uma chave desloca só o
+    # bloco, em vez da lista inteira de m grupos.
+
+    assignment = []
+    loads = []
+    blocks = []
+    maxes = []
+    split_at = 2 * _BEST_FIT_BLOCK
+
+    # Busca, remoção e inserção feitas em linha: este laço é o ponto quente.
+    for size in sizes:
+        group = -1
+
+        if size <= n_max and blocks:
+            # Maior chave <= (n_max - size, inf): último item antes do primeiro
+            # bloco cuja maior chave passa do limite
+            limit = (n_max - size, _EMPTY)
+            index = bisect_right(maxes, limit)
+            if index < len(blocks):
+                position = bisect_right(blocks[index], limit) - 1
+            else:
+                position = -1
+            if position < 0 and index > 0:
+                index -= 1
+                position = len(blocks[index]) - 1
+
+            # n_max - size pode arredondar diferente de carga + size em floats
+            while position >= 0 and not blocks[index][position][0] + size <= n_max:
+                position -= 1
+                if position < 0 and index > 0:
+                    index -= 1
+                    position = len(blocks[index]) - 1
+
+            if position >= 0:
+                block = blocks[index]
+                load, negative_group = block.pop(position)
+                if not block:
+                    del blocks[index]
+                    del maxes[index]
+                elif position == len(block):
+                    maxes[index] = block[-1]
+                group = -negative_group
+                load += size
+                loads[group] = load
+
+        if group < 0:
+            group = len(loads)
+            load = size
+            loads.append(load)
+
+        key = (load, -group)
+        if not blocks:
+            blocks.append([key])
+            maxes.append(key)
+        else:
+            index = bisect_right(maxes, key)
+            if index == len(maxes):
+                index -= 1
+                blocks[index].append(key)
+                maxes[index] = key
+            else:
+                insort(blocks[index], key)
+            block = blocks[index]
+            if len(block) > split_at:
+                # Divide o bloco ao meio; maxes[index] passa a ser a maior
+                # chave da primeira metade
+                blocks.insert(index + 1, block[_BEST_FIT_BLOCK:])
+                del block[_BEST_FIT_BLOCK:]
+                maxes.insert(index, block[-1])
+        assignment.append(group)
+
+    return assignment, loads
+
+
+def worst_fit(sizes, n_max):
+    # Worst Fit em O(n log m): cada item vai para o grupo menos cheio, se couber
+    # (empate: menor índice). As cargas ficam num heap de (carga, grupo).
+
+    assignment = []
+    loads = []
+    heap = []
+
+    for size in sizes:
+        if size <= n_max and heap and heap[0][0] + size <= n_max:
+            load, group = heap[0]
+            load += size
+            loads[group] = load
+            heapq.heapreplace(heap, (load, group))
+        else:
+            group = len(loads)
+            loads.append(size)
+            heapq.heappush(heap, (size, group))
+
+        assignment.append(group)
+
+    return assignment, loads
+
+
+def next_fit(sizes, n_max):
+    # Next Fit em O(n): só o grupo corrente recebe itens; quando o item não cabe,
+    # um novo grupo passa a ser o corrente. Itens acima do limite não mudam o
+    # grupo corrente.
+
+    assignment = []
+    loads = []
+    current = -1
+
+    for size in sizes:
+        if size > n_max:
+            group = len(loads)
+            loads.append(size)
+        elif current >= 0 and loads[current] + size <= n_max:
+            group = current
+            loads[group] += size
+        else:
+            group = current = len(loads)
+            loads.append(size)
+
+        assignment.append(group)
+
+    return assignment, loads
+
+
+# Registro de estratégias: nome -> (função de encaixe, ordenar decrescente?)
+_STRATEGIES = {}
+
+DEFAULT_STRATEGY = 'ffd'
+
+
+def register_strategy(name, fit, decreasing=False):
+    # Registra uma estratégia de empacotamento. fit(sizes, n_max) deve retornar
+    # (assignment, loads); com decreasing=True os pedidos são ordenados do maior
+    # para o menor antes do encaixe.
+
+    _STRATEGIES[name] = (fit, decreasing)
+
+
+def available_strategies():
+    # Nomes das estratégias registradas.
+
+    return sorted(_STRATEGIES)
+
+
+def get_strategy(name):
+    # Retorna (fit, decreasing) da estratégia, ou ValueError se desconhecida.
+
+    try:
+        return _STRATEGIES[name]
+    except KeyError:
+        raise ValueError('Estratégia de empacotamento desconhecida: {}'.format(name)) from None
+
+
+register_strategy('ff', first_fit)
+register_strategy('ffd', first_fit, decreasing=True)
+register_strategy('bf', best_fit)
+register_strategy('bfd', best_fit, decreasing=True)
+register_strategy('wf', worst_fit)
+register_strategy('wfd', worst_fit, decreasing=True)
+register_strategy('nf', next_fit)
+register_strategy('nfd', next_fit, decreasing=True)
+
+
+def size_counts(requests, n_max):
+    # Contagem por tamanho (Counter) quando os pedidos são inteiros positivos
+    # com muitas repetições e n_max é finito; senão, None.
+    # A contagem é feita em blocos de _COUNT_BLOCK pedidos e para assim que um
+    # bloco tem outro tipo que não int ou os tamanhos distintos passam do
+    # limite: sem repetições, o custo é o de contar uma fração dos pedidos.
+
+    if not isinstance(n_max, (int, float)) or not math.isfinite(n_max):
+        return None
+    if not isinstance(requests, Sized) or not requests:
+        return None
+
+    max_distinct = COUNTING_MAX_DISTINCT_RATIO * len(requests)
+    counts = Counter()
+    if isinstance(requests, Sequence):
+        blocks = (requests[start:start + _COUNT_BLOCK]
+                  for start in range(0, len(requests), _COUNT_BLOCK))
+    else:
+        iterator = iter(requests)
+        blocks = iter(lambda: list(islice(iterator, _COUNT_BLOCK)), [])
+    for block in blocks:
+        if set(map(type, block)) != {int}:
+            return None
+        counts.update(block)
+        if len(counts) > max_distinct:
+            return None
+
+    if min(counts) < 1:
+        return None
+    return counts
+
+
+def first_fit_decreasing_counts(counts, n_max, tree=None):
+    # FFD sobre pedidos inteiros positivos agrupados por tamanho (tamanho ->
+    # quantidade), com o mesmo resultado de first_fit sobre a lista ordenada.
+    #
+    # Todas as cópias de um tamanho são consecutivas na ordem decrescente, e o
+    # First Fit coloca cada cópia no primeiro grupo onde ela cabe; esse grupo
+    # continua sendo o primeiro até não caber mais nenhuma. Por isso cada grupo
+    # recebe de uma vez todas as cópias que comporta, e os grupos novos são
+    # abertos já com limite // tamanho cópias. O custo é por grupo tocado, não
+    # por pedido. tree permite reaproveitar uma LoadTree. Retorna um PackingResult.
+
+    limit = math.floor(n_max)   # carga inteira + tamanho <= n_max  <=>  <= limit
+    sizes = sorted(counts, reverse=True)
+
+    capacity = 0
+    for size in sizes:
+        count = counts[size]
+        capacity += count if size > limit else -(-count // (limit // size))
+
+    if tree is None:
+        tree = LoadTree(capacity)
+    else:
+        tree.reset(capacity)
+    groups = []
+    loads = []
+
+    for size in sizes:
+        remaining = counts[size]
+
+        if size > limit:
+            for _ in range(remaining):
+                groups.append([size])
+                loads.append(size)
+            continue
+
+        # Grupos existentes, da esquerda para a direita
+        while remaining:
+            group = tree.first_fit(size, limit)
+            if group < 0:
+                break
+            fit = min(remaining, (limit - loads[group]) // size)
+            groups[group].extend([size] * fit)
+            loads[group] += fit * size
+            tree.set_load(group, loads[group])
+            remaining -= fit
+
+        # Grupos novos com o máximo de cópias que cabem
+        per_group = limit // size
+        while remaining:
+            fit = min(remaining, per_group)
+            tree.set_load(len(loads), fit * size)
+            groups.append([size] * fit)
+            loads.append(fit * size)
+            remaining -= fit
+
+    return PackingResult(groups, loads, n_max)
+
+
+def _run_fit(fit, sizes, n_max, tree, recorder=NULL_RECORDER):
+    # Chama a função de encaixe, repassando a LoadTree reaproveitável ao First Fit.
+    # Com a instrumentação ligada, mede a fase 'fit' e conta os grupos
+    # examinados (ver _count_probes).
+
+    if not recorder.enabled:
+        if tree is not None and fit is first_fit:
+            return fit(sizes, n_max, tree)
+        return fit(sizes, n_max)
+
+    recorder.count('items', len(sizes))
+    if fit is first_fit and tree is None:
+        tree = LoadTree(len(sizes))
+    with recorder.phase('fit'):
+        assignment, loads = fit(sizes, n_max, tree) if fit is first_fit else fit(sizes, n_max)
+    recorder.count('groups', len(loads))
+    if fit is first_fit:
+        _count_probes(recorder, sizes, n_max, assignment, tree)
+    return assignment, loads
+
+
+def _count_probes(recorder, sizes, n_max, assignment, tree):
+    # Contadores de busca do First Fit, calculados depois do encaixe para não
+    # tocar no laço quente:
+    #
+    # tree_probes: nós da LoadTree examinados. Cada pedido até n_max testa a
+    # raiz; se cabe em um grupo existente, a descida testa um nó por nível.
+    # scan_probes: grupos que a varredura linear da versão original teria
+    # examinado para o mesmo resultado (do primeiro grupo até o escolhido, ou
+    # todos os abertos quando o pedido abre um grupo).
+
+    depth = tree.size.bit_length() - 1
+    fitting = 0
+    reused = 0
+    scan_probes = 0
+    opened = 0
+    for size, group in zip(sizes, assignment):
+        if size > n_max:
+            opened += 1
+            continue
+        fitting += 1
+        if group < opened:
+            reused += 1
+            scan_probes += group + 1
+        else:
+            scan_probes += opened
+            opened += 1
+    recorder.count('tree_probes', fitting + reused * depth)
+    recorder.count('scan_probes', scan_probes)
+
+
+def pack(requests, n_max, strategy=DEFAULT_STRATEGY, tree=None, recorder=NULL_RECORDER):
+    # Empacota os pedidos com a estratégia registrada e retorna um PackingResult
+    # (lista de grupos com as cargas calculadas durante o encaixe).
+    # FFD sobre inteiros positivos com muitas repetições usa o caminho por
+    # contagem (first_fit_decreasing_counts), com resultado idêntico.
+    # tree: LoadTree reaproveitada entre chamadas (ex.: jobs em lote).
+    # recorder: CallRecord da instrumentação (ver instrumentation.py).
+
+    fit, decreasing = get_strategy(strategy)
+    recorder.note('strategy', strategy)
+    if (fit, decreasing) == (first_fit, True):
+        with recorder.phase('count'):
+            counts = size_counts(requests, n_max)
+        if counts is not None:
+            recorder.note('path', 'counting')
+            recorder.count('items', len(requests))
+            recorder.count('size_classes', len(counts))
+            with recorder.phase('fit'):
+                result = first_fit_decreasing_counts(counts, n_max, tree)
+            recorder.count('groups', len(result))
+            return result
+
+    with recorder.phase('sort'):
+        sizes = sorted(requests, reverse=True) if decreasing else list(requests)
+    assignment, loads = _run_fit(fit, sizes, n_max, tree, recorder)
+    with recorder.phase('build'):
+        return PackingResult(build_groups(sizes, assignment, len(loads)), loads, n_max)
+
+
+def pack_records(ids, sizes, n_max, strategy=DEFAULT_STRATEGY, tree=None, recorder=NULL_RECORDER):
+    # Empacota pedidos identificados: ids e sizes são sequências paralelas.
+    # Retorna um PackingResult cujos grupos contêm os IDs dos pedidos.
+    # A ordem de processamento é a mesma de pack (empates mantêm a ordem de
+    # entrada), então os tamanhos ficam agrupados exatamente como em pack.
+
+    fit, decreasing = get_strategy(strategy)
+    recorder.note('strategy', strategy)
+    with recorder.phase('sort'):
+        positions = range(len(sizes))
+        if decreasing:
+            positions = sorted(positions, key=sizes.__getitem__, reverse=True)
+        ordered = [sizes[position] for position in positions]
+
+    assignment, loads = _run_fit(fit, ordered, n_max, tree, recorder)
+    with recorder.phase('build'):
+        groups = build_groups((ids[position] for position in positions), assignment, len(loads))
+        return PackingResult(groups, loads, n_max)
+
+
+def split_oversize(sizes, n_max):
+    # Separa de cada pedido maior que n_max os pedaços cheios (de n_max) e o resto.
+    # Retorna (full, chunk_sizes, chunk_sources): full traz (posição do pedido,
+    # quantidade de pedaços cheios) e chunk_sizes/chunk_sources, os itens a
+    # empacotar (restos e pedidos até n_max, inteiros) com a posição do pedido
+    # original. O(m) para m pedidos, independente da quantidade de pedaços.
+
+    full = []
+    chunk_sizes = []
+    chunk_sources = []
+    for position, size in enumerate(sizes):
+        if size > n_max:
+            count, size = divmod(size, n_max)
+            full.append((position, int(count)))
+            if not size > 0:
+                continue
+        chunk_sizes.append(size)
+        chunk_sources.append(position)
+    return full, chunk_sizes, chunk_sources
+
+
+def pack_split(sizes, n_max, strategy=DEFAULT_STRATEGY, ids=None, tree=None, recorder=NULL_RECORDER):
+    # Empacota com divisão de pedidos acima do limite: os pedaços de n_max
+    # viram grupos cheios, sem passar pela ordenação e pelo encaixe, e só os
+    # restos são empacotados junto com os demais pedidos, então nenhum grupo
+    # passa do limite. Os grupos cheios vêm primeiro, na ordem dos pedidos.
+    # Custo O(m log m) para m pedidos mais O(c) para montar os c grupos cheios
+    # do resultado.
+    # Os grupos contêm os tamanhos dos pedaços (ou, com ids, o ID do pedido
+    # original) e result.sources traz, para cada item, Chunk(posição do pedido
+    # original, tamanho do pedaço).
+
+    with recorder.phase('split'):
+        full, chunk_sizes, chunk_sources = split_oversize(sizes, n_max)
+    recorder.count('chunks', sum(count for _, count in full))
+    packed = pack_records(range(len(chunk_sizes)), chunk_sizes, n_max, strategy, tree, recorder)
+
+    with recorder.phase('build'):
+        groups = []
+        sources = []
+        loads = []
+        for position, count in full:
+            item = n_max if ids is None else ids[position]
+            chunk = Chunk(position, n_max)
+            groups.extend([[item] for _ in range(count)])
+            sources.extend([[chunk] for _ in range(count)])
+            loads.extend(repeat(n_max, count))
+
+        for group in packed:
+            sources.append([Chunk(chunk_sources[chunk], chunk_sizes[chunk]) for chunk in group])
+            if ids is None:
+                groups.append([chunk_sizes[chunk] for chunk in group])
+            else:
+                groups.append([ids[chunk_sources[chunk]] for chunk in group])
+        loads.extend(packed.loads)
+
+        return PackingResult(groups, loads, n_max, sources)
+
+
+def first_fit_decreasing(requests, n_max):
+    # First Fit Decreasing: ordena do maior para o menor e aplica First Fit.
+    # Retorna os grupos (PackingResult), idênticos à implementação original com sum(group).
+
+    return pack(requests, n_max, 'ffd')
+
+
+GroupSummary = namedtuple('GroupSummary', 'items load free fill_ratio oversize')
+
+# Pedaço de um pedido dividido: posição do pedido original e tamanho do pedaço.
+Chunk = namedtuple('Chunk', 'source size')
+
+
+class PackingResult(list):
+    # Lista de grupos (cada grupo é uma lista) com os dados de cada grupo
+    # calculados uma única vez, a partir das cargas do empacotamento:
+    #
+    # loads: carga de cada grupo
+    # free: capacidade livre (capacity - carga; negativa em grupos acima do limite)
+    # fill_ratios: carga / capacity
+    # oversize: 1 para grupos acima do limite (pedido único maior que capacity)
+    #
+    # sources: com divisão de pedidos (pack_split), a origem (Chunk) de cada item
+    #
+    # Sem capacity, só loads é preenchido. Com capacidade por dimensão (tupla),
+    # free é uma tupla por grupo, fill_ratio é a maior razão entre as dimensões e
+    # oversize indica se alguma dimensão passou do limite.
+    # Continua se comportando como a lista de listas original.
+
+    def __init__(self, groups=(), loads=(), capacity=None, sources=None):
+        # Inicializa o resultado; os valores por grupo são guardados em arrays
+        # tipados quando possível.
+
+        super().__init__(groups)
+        self.capacity = capacity
+        self.sources = sources
+        self.loads = compact_array(loads)
+
+        if capacity is None:
+            self.free = self.fill_ratios = self.oversize = None
+        elif isinstance(capacity, tuple):
+            self.free = [tuple(c - value for value, c in zip(load, capacity)) for load in self.loads]
+            self.fill_ratios = array('d', (
+                max(value / c for value, c in zip(load, capacity)) for load in self.loads))
+            self.oversize = array('b', (
+                any(value > c for value, c in zip(load, capacity)) for load in self.loads))
+        else:
+            self.free = compact_array(capacity - load for load in self.loads)
+            self.fill_ratios = array('d', (load / capacity for load in self.loads))
+            self.oversize = array('b', (load > capacity for load in self.loads))
+
+    @property
+    def total_load(self):
+        # Soma das cargas de todos os grupos.
+        return sum(self.loads)
+
+    def summary(self, index):
+        # Resumo (GroupSummary) do grupo na posição index.
+
+        if self.capacity is None:
+            return GroupSummary(self[index], self.loads[index], None, None, None)
+        return GroupSummary(self[index], self.loads[index], self.free[index],
+                            self.fill_ratios[index], bool(self.oversize[index]))
+
+    def summaries(self):
+        # Resumos de todos os grupos, em ordem.
+
+        return [self.summary(index) for index in range(len(self))]
+
+
+def typecode_for(values):
+    # Typecode de array que representa values sem perda: 'q' (int64) para
+    # inteiros, 'd' (double) para floats, ou None (ex.: Decimal, inteiros enormes).
+
+    typecode = 'q'
+    for value in values:
+        if isinstance(value, int):
+            if not -2 ** 63 <= value < 2 ** 63:
+                return None
+        elif isinstance(value, float):
+            typecode = 'd'
+        else:
+            return None
+
+    if typecode == 'd' and any(isinstance(value, int) and abs(value) > 2 ** 53 for value in values):
+        return None
+    return typecode
+
+
+def compact_array(values):
+    # Guarda values em um array tipado quando possível; senão, em uma lista.
+
+    values = list(values)
+    typecode = typecode_for(values)
+    return array(typecode, values) if typecode is not None else values
+
+
+def build_groups(items, assignment, group_count):
+    # Monta as listas de grupos a partir do grupo atribuído a cada item.
+
+    groups = [[] for _ in range(group_count)]
+    for item, group in zip(items, assignment):
+        groups[group].append(item)
+    return groups
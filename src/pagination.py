@@ -0,0 +1,154 @@
+# src/pagination.py
+# Paginação por cursor dos contratos em ordem de débito.
+#
+# As páginas seguem a ordem débito decrescente e, em empates, id crescente: o
+# par (débito, id) do último contrato de uma página identifica uma posição
+# única nessa ordem e é o cursor da página seguinte. Cada página é calculada a
+# partir do cursor, sem refazer as anteriores:
+#
+# - varrendo a carteira (page_after): heap limitado a page_size + 1 contratos
+#   entre os estritamente depois do cursor, O(n log page) de tempo e O(page)
+#   de memória, em qualquer iterável;
+# - com um ContractIndex (ContractIndex.page): busca binária do cursor na
+#   ordenação mantida pelo índice e leitura de page_size contratos,
+#   O(log n + page).
+#
+# O cursor não guarda posições: contratos incluídos, encerrados ou com débito
+# alterado entre duas páginas entram (ou saem) conforme a posição deles em
+# relação ao cursor, sem deslocar as páginas seguintes.
+
+import base64
+import heapq
+import json
+from collections import namedtuple
+
+
+def _token_safe(debt, contract_id):
+    # Indica se débito e id voltam do JSON com o mesmo valor e tipo: débito
+    # int/float e id int/str (bool não conta).
+
+    if isinstance(debt, bool) or isinstance(contract_id, bool):
+        return False
+    return isinstance(debt, (int, float)) and isinstance(contract_id, (int, str))
+
+
+class Cursor(namedtuple('Cursor', 'debt id')):
+    # Posição na ordem de paginação: débito e id do último contrato entregue.
+    # token() gera a forma em texto (opaca, segura para URLs) que o cliente
+    # devolve para pedir a próxima página. O token aceita débitos int/float e
+    # IDs int/str, que voltam com o mesmo tipo; para outros tipos (ex.:
+    # Decimal), use o Cursor (ou o par (débito, id)) diretamente.
+
+    __slots__ = ()
+
+    @classmethod
+    def after(cls, contract):
+        # Cursor posicionado logo depois do contrato.
+        return cls(contract.debt, contract.id)
+
+    def token(self):
+        # Cursor em texto: JSON [débito, id] em base64 para URLs, sem '='.
+        # TypeError para tipos que não voltariam iguais de from_token.
+
+        if not _token_safe(self.debt, self.id):
+            raise TypeError('O token exige débito int/float e id int/str: {!r}'.format(self))
+        data = json.dumps([self.debt, self.id], separators=(',', ':')).encode()
+        return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+    @classmethod
+    def from_token(cls, token):
+        # Cursor a partir do texto gerado por token(); ValueError se inválido.
+
+        try:
+            data = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+            debt, contract_id = json.loads(data)
+        except (TypeError, ValueError) as error:
+            raise ValueError('Cursor inválido: {!r}'.format(token)) from error
+        if not _token_safe(debt, contract_id):
+            raise ValueError('Cursor inválido: {!r}'.format(token))
+        return cls(debt, contract_id)
+
+
+class Page(namedtuple('Page', 'items cursor')):
+    # Página de resultados: items (contratos, na ordem de paginação) e o
+    # Cursor da próxima página, ou None se esta é a última.
+
+    __slots__ = ()
+
+    @property
+    def has_next(self):
+        # Indica se há uma próxima página.
+        return self.cursor is not None
+
+    @property
+    def token(self):
+        # Cursor da próxima página em texto, ou None.
+        return None if self.cursor is None else self.cursor.token()
+
+
+def as_cursor(cursor):
+    # Normaliza o cursor: None (primeira página), Cursor, par (débito, id) ou
+    # o texto de Cursor.token().
+
+    if cursor is None or isinstance(cursor, Cursor):
+        return cursor
+    if isinstance(cursor, str):
+        return Cursor.from_token(cursor)
+    return Cursor(*cursor)
+
+
+def page_key(contract):
+    # Chave da ordem de paginação (crescente): débito decrescente, id crescente.
+    return (-contract.debt, contract.id)
+
+
+def cursor_key(cursor):
+    # Chave do cursor na mesma ordem de page_key.
+    return (-cursor.debt, cursor.id)
+
+
+def check_page_size(page_size):
+    # Valida o tamanho da página.
+
+    if page_size < 1:
+        raise ValueError('page_size deve ser pelo menos 1')
+
+
+def take_page(ranked, page_size):
+    # Monta a Page a partir de um iterável já na ordem de paginação, lendo no
+    # máximo page_size + 1 itens (o excedente só indica que há próxima página).
+
+    items = []
+    for contract in ranked:
+        if len(items) == page_size:
+            return Page(items, Cursor.after(items[-1]))
+        items.append(contract)
+    return Page(items, None)
+
+
+def page_after(contracts, page_size, cursor=None, excluded_ids=None):
+    # Página de page_size contratos depois do cursor, varrendo contracts
+    # (qualquer iterável) uma vez com um heap limitado. excluded_ids: IDs a
+    # ignorar (ex.: renegociados), testados no mesmo filtro do cursor.
+
+    check_page_size(page_size)
+    cursor = as_cursor(cursor)
+
+    if cursor is not None:
+        debt, last_id = cursor
+        if excluded_ids:
+            contracts = (
+                contract for contract in contracts
+                if (contract.debt < debt or (contract.debt == debt and contract.id > last_id))
+                and contract.id not in excluded_ids
+            )
+        else:
+            contracts = (
+                contract for contract in contracts
+                if contract.debt < debt or (contract.debt == debt and contract.id > last_id)
+            )
+    elif excluded_ids:
+        contracts = (contract for contract in contracts if contract.id not in excluded_ids)
+
+    # nsmallest mantém um heap de page_size + 1 entradas
+    return take_page(heapq.nsmallest(page_size + 1, contracts, key=page_key), page_size)
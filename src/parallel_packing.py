@@ -0,0 +1,90 @@
+# src/parallel_packing.py
+# Empacotamento paralelo em shards com ProcessPoolExecutor.
+#
+# Os pedidos são ordenados e distribuídos entre os shards de forma
+# estratificada por classe de tamanho (rodízio sobre a lista ordenada), então
+# cada shard recebe a mesma proporção de pedidos grandes, médios e pequenos e
+# o FFD de cada shard fica próximo do FFD serial. Depois, uma etapa de reparo
+# desfaz os grupos subutilizados de todos os shards e reempacota seus pedidos
+# juntos.
+
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from .packing import PackingResult, build_groups, first_fit, pack, typecode_for
+except ImportError:
+    from packing import PackingResult, build_groups, first_fit, pack, typecode_for
+
+# Abaixo deste número de pedidos o custo de criar processos não compensa.
+PARALLEL_MIN_SIZE = 50000
+
+# Grupos com carga abaixo desta fração de n_max entram na etapa de reparo.
+DEFAULT_REPAIR_THRESHOLD = 0.5
+
+
+def _pack_shard(payload):
+    # Executado no processo trabalhador: recebe o shard como bytes de um array
+    # tipado (já em ordem decrescente) e devolve as atribuições também como bytes.
+
+    typecode, buffer, n_max = payload
+    sizes = array(typecode)
+    sizes.frombytes(buffer)
+    assignment, loads = first_fit(sizes, n_max)
+    return array('l', assignment).tobytes(), array(typecode, loads).tobytes()
+
+
+def pack_parallel(requests, n_max, workers=None, shards=None,
+                  repair_threshold=DEFAULT_REPAIR_THRESHOLD, executor=None):
+    # Empacota os pedidos em paralelo e retorna os grupos (PackingResult).
+    # workers: processos do pool (padrão: os.cpu_count()); shards: número de
+    # shards (padrão: workers); executor: pool já existente, para reaproveitar.
+
+    workers = workers or os.cpu_count() or 1
+    shards = shards or workers
+
+    sizes = sorted(requests, reverse=True)
+    if shards <= 1 or len(sizes) < 2 * shards:
+        return pack(sizes, n_max, 'ffd')
+
+    typecode = typecode_for(sizes)
+    if typecode is None:
+        # Valores sem representação compacta (ex.: Decimal) ficam no caminho serial
+        return pack(sizes, n_max, 'ffd')
+
+    # Rodízio sobre a lista ordenada: cada shard continua em ordem decrescente
+    parts = [array(typecode, sizes[index::shards]) for index in range(shards)]
+    payloads = [(typecode, part.tobytes(), n_max) for part in parts]
+
+    if executor is not None:
+        results = list(executor.map(_pack_shard, payloads))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_pack_shard, payloads))
+
+    kept = []
+    kept_loads = []
+    leftovers = []
+    minimum_load = repair_threshold * n_max
+
+    for part, (assignment_buffer, loads_buffer) in zip(parts, results):
+        assignment = array('l')
+        assignment.frombytes(assignment_buffer)
+        loads = array(typecode)
+        loads.frombytes(loads_buffer)
+        groups = build_groups(part.tolist(), assignment, len(loads))
+        for group, load in zip(groups, loads):
+            if load < minimum_load and load <= n_max:
+                leftovers.extend(group)
+            else:
+                kept.append(group)
+                kept_loads.append(load)
+
+    # Reparo: reempacota juntos os pedidos dos grupos subutilizados
+    if leftovers:
+        repaired = pack(leftovers, n_max, 'ffd')
+        kept.extend(repaired)
+        kept_loads.extend(repaired.loads)
+
+    return PackingResult(kept, kept_loads, n_max)
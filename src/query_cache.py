@@ -0,0 +1,87 @@
+# src/query_cache.py
+# Cache LRU de consultas top N, usado por Contracts quando habilitado.
+
+from collections import OrderedDict, namedtuple
+
+# Mesmo formato de functools.lru_cache().cache_info().
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+def fingerprint(open_contracts, renegotiated_contracts, version=None):
+    # Impressão digital barata das entradas: tamanhos e contadores de versão.
+    # Nenhum contrato é percorrido; alterações in-place que não mudam o tamanho
+    # precisam ser sinalizadas pelo chamador (version ou invalidate_cache).
+
+    return (
+        len(open_contracts),
+        getattr(open_contracts, 'version', None),
+        len(renegotiated_contracts) if renegotiated_contracts is not None else None,
+        getattr(renegotiated_contracts, 'version', None),
+        version,
+    )
+
+
+class _Entry:
+    # Resultado guardado para um par (contratos abertos, renegociados).
+
+    __slots__ = ('open_contracts', 'renegotiated_contracts', 'fingerprint', 'top_n', 'result')
+
+    def __init__(self, open_contracts, renegotiated_contracts, fingerprint, top_n, result):
+        # As referências às entradas mantêm os objetos vivos, então o id() usado
+        # na chave não pode ser reaproveitado por outro objeto.
+        self.open_contracts = open_contracts
+        self.renegotiated_contracts = renegotiated_contracts
+        self.fingerprint = fingerprint
+        self.top_n = top_n
+        self.result = result
+
+
+class TopNCache:
+    # Cache LRU limitado. Uma resposta calculada para k serve qualquer k menor
+    # (como fatia), e também qualquer k maior quando o resultado veio incompleto.
+
+    def __init__(self, maxsize):
+        # Inicializa o cache com no máximo maxsize entradas.
+
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def lookup(self, open_contracts, renegotiated_contracts, top_n, fingerprint):
+        # Retorna o resultado em cache para top_n, ou None em caso de falta.
+
+        key = (id(open_contracts), id(renegotiated_contracts))
+        entry = self._entries.get(key)
+
+        if (entry is not None
+                and entry.open_contracts is open_contracts
+                and entry.renegotiated_contracts is renegotiated_contracts
+                and entry.fingerprint == fingerprint
+                and (top_n <= entry.top_n or len(entry.result) < entry.top_n)):
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.result[:top_n]
+
+        self.misses += 1
+        return None
+
+    def store(self, open_contracts, renegotiated_contracts, top_n, fingerprint, result):
+        # Guarda o resultado, descartando a entrada usada há mais tempo se necessário.
+
+        key = (id(open_contracts), id(renegotiated_contracts))
+        self._entries[key] = _Entry(
+            open_contracts, renegotiated_contracts, fingerprint, top_n, list(result)
+        )
+        self._entries.move_to_end(key)
+
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        # Remove todas as entradas (os contadores são mantidos).
+
+        self._entries.clear()
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
@@ -0,0 +1,258 @@
+# src/ranking.py
+# Ranking por chaves compostas com filtros, em uma única passada.
+#
+# Um Ranking é compilado uma vez a partir da especificação das chaves (ex.:
+# débito decrescente, depois dias em atraso decrescente, depois id crescente)
+# e dos filtros (ex.: região == 'SP', débito >= 1000) e pode ser reutilizado
+# em várias consultas. A compilação gera:
+#
+# - uma função de chave "maior é melhor": campos decrescentes entram como
+#   estão e campos crescentes entram negados (ou invertidos, para textos), de
+#   modo que a seleção parcial de selection.py (heap limitado para N pequeno)
+#   funcione sem mudanças. Se todos os campos são atributos decrescentes, a
+#   chave é um operator.attrgetter (em C);
+# - um único predicado com todos os filtros, avaliado na mesma passada.
+#
+# Chave e predicado são gerados como código Python (lambda com item.campo e
+# os operadores diretos), sem uma chamada de função por campo e por item.
+#
+# O resultado é o mesmo de ordenar a entrada filtrada pelas chaves e cortar
+# os N primeiros; empates completos mantêm a ordem de entrada.
+
+import keyword
+from operator import attrgetter
+
+try:
+    from .selection import STRATEGY_AUTO, STRATEGY_HEAP, choose_strategy, select_top_n
+except ImportError:
+    from selection import STRATEGY_AUTO, STRATEGY_HEAP, choose_strategy, select_top_n
+
+# Operadores aceitos em where(), com o texto usado no código gerado.
+_OPERATORS = {
+    '==': '==', '!=': '!=', '<': '<', '<=': '<=', '>': '>', '>=': '>=',
+    'in': 'in', 'not in': 'not in',
+}
+
+
+class RankKey:
+    # Uma chave do ranking: field é o nome de um atributo ou uma função
+    # item -> valor. descending=True ordena do maior para o menor.
+    # numeric indica se o valor pode ser negado; chaves crescentes não
+    # numéricas (ex.: IDs em texto) usam numeric=False.
+
+    __slots__ = ('field', 'descending', 'numeric')
+
+    def __init__(self, field, descending=False, numeric=True):
+        # Inicializa a chave.
+
+        if not callable(field) and not isinstance(field, str):
+            raise TypeError('field deve ser o nome de um atributo ou uma função')
+        self.field = field
+        self.descending = descending
+        self.numeric = numeric
+
+    def getter(self):
+        # Função item -> valor da chave.
+        return self.field if callable(self.field) else attrgetter(self.field)
+
+    def __repr__(self):
+        return '{}({!r})'.format('desc' if self.descending else 'asc', self.field)
+
+
+def desc(field, numeric=True):
+    # Chave decrescente (maior primeiro).
+    return RankKey(field, descending=True, numeric=numeric)
+
+
+def asc(field, numeric=True):
+    # Chave crescente (menor primeiro).
+    return RankKey(field, descending=False, numeric=numeric)
+
+
+class Where:
+    # Filtro field <operador> value, ex.: Where('debt', '>=', 1000).
+
+    __slots__ = ('field', 'operator', 'value')
+
+    def __init__(self, field, operator, value):
+        # Inicializa o filtro, validando o operador.
+
+        if operator not in _OPERATORS:
+            raise ValueError('Operador desconhecido: {} (use {})'.format(
+                operator, ', '.join(_OPERATORS)))
+        self.field = field
+        self.operator = operator
+        self.value = value
+
+    def __repr__(self):
+        return 'where({!r}, {!r}, {!r})'.format(self.field, self.operator, self.value)
+
+
+def where(field, operator, value):
+    # Filtro sobre um atributo (ou função item -> valor).
+    return Where(field, operator, value)
+
+
+class _Reversed:
+    # Valor com a comparação invertida: chave crescente para valores que não
+    # podem ser negados (ex.: textos).
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+    def __gt__(self, other):
+        return other.value > self.value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __le__(self, other):
+        return other.value <= self.value
+
+    def __ge__(self, other):
+        return other.value >= self.value
+
+
+def _parse_key(spec):
+    # Converte uma especificação em RankKey: RankKey, função (crescente) ou
+    # texto com '-' para decrescente ('-debt') e '+' ou nada para crescente.
+
+    if isinstance(spec, RankKey):
+        return spec
+    if isinstance(spec, str):
+        if spec.startswith('-'):
+            return desc(spec[1:])
+        return asc(spec[1:] if spec.startswith('+') else spec)
+    if callable(spec):
+        return asc(spec)
+    raise TypeError('Chave de ranking inválida: {!r}'.format(spec))
+
+
+def _access(field, name, namespace):
+    # Expressão que lê field de item no código gerado: item.field para nomes
+    # de atributo simples; senão, uma função guardada no namespace como name.
+
+    if isinstance(field, str) and field.isidentifier() and not keyword.iskeyword(field):
+        return 'item.{}'.format(field)
+    namespace[name] = field if callable(field) else attrgetter(field)
+    return '{}(item)'.format(name)
+
+
+def _compile_key(keys):
+    # Função de chave "maior é melhor" para as chaves.
+
+    if all(key.descending and isinstance(key.field, str) for key in keys):
+        return attrgetter(*(key.field for key in keys))
+
+    namespace = {'_Reversed': _Reversed}
+    parts = []
+    for index, key in enumerate(keys):
+        value = _access(key.field, '_get{}'.format(index), namespace)
+        if not key.descending:
+            value = '-{}'.format(value) if key.numeric else '_Reversed({})'.format(value)
+        parts.append(value)
+
+    if len(parts) == 1:
+        source = 'lambda item: {}'.format(parts[0])
+    else:
+        source = 'lambda item: ({},)'.format(', '.join(parts))
+    # Só nomes de atributo válidos, índices e nomes internos entram no código
+    # gerado; funções e valores ficam no namespace
+    return eval(source, namespace)
+
+
+def _compile_filters(filters):
+    # Um único filtro com todas as condições: função iterável -> gerador dos
+    # itens que passam (None se não houver filtros). O gerador avalia as
+    # condições inline, sem chamar uma função por item.
+
+    if not filters:
+        return None
+
+    namespace = {}
+    parts = []
+    for index, condition in enumerate(filters):
+        if isinstance(condition, Where):
+            value = _access(condition.field, '_get{}'.format(index), namespace)
+            namespace['_value{}'.format(index)] = condition.value
+            parts.append('{} {} _value{}'.format(value, _OPERATORS[condition.operator], index))
+        elif callable(condition):
+            namespace['_test{}'.format(index)] = condition
+            parts.append('_test{}(item)'.format(index))
+        else:
+            raise TypeError('Filtro inválido: {!r}'.format(condition))
+
+    return eval('lambda items: (item for item in items if {})'.format(' and '.join(parts)),
+                namespace)
+
+
+class Ranking:
+    # Ranking compilado: keys é a lista de chaves, em ordem de prioridade
+    # (RankKey, desc()/asc(), textos como '-debt' ou 'id', ou funções), e
+    # filters a lista de filtros (where() ou funções item -> bool), todos
+    # obrigatórios.
+    #
+    #   ranking = Ranking(['-debt', '-days_overdue', 'id'],
+    #                     filters=[where('region', '==', 'SP'), where('debt', '>=', 1000)])
+    #   ranking.top(contracts, 10)
+
+    def __init__(self, keys, filters=()):
+        # Compila a chave e os filtros.
+
+        if isinstance(keys, (str, RankKey)) or callable(keys):
+            keys = [keys]
+        self.keys = [_parse_key(spec) for spec in keys]
+        if not self.keys:
+            raise ValueError('O ranking precisa de pelo menos uma chave')
+        self.filters = list(filters)
+
+        self.key = _compile_key(self.keys)
+        self.matching = _compile_filters(self.filters)
+
+    def filtered(self, *filters):
+        # Novo Ranking com as mesmas chaves e os filtros dados antes dos
+        # atuais (ex.: exclusão por id), reaproveitando a chave compilada.
+
+        ranking = Ranking.__new__(Ranking)
+        ranking.keys = self.keys
+        ranking.filters = list(filters) + self.filters
+        ranking.key = self.key
+        ranking.matching = _compile_filters(ranking.filters)
+        return ranking
+
+    def matches(self, item):
+        # Indica se o item passa por todos os filtros.
+        if self.matching is None:
+            return True
+        for _ in self.matching((item,)):
+            return True
+        return False
+
+    def top(self, items, top_n, strategy=STRATEGY_AUTO, total=None):
+        # Os top_n itens de qualquer iterável que passam pelos filtros, na
+        # ordem do ranking, em uma única passada (heap limitado para top_n
+        # pequeno; ver selection.py). total: tamanho da entrada, se items
+        # não tiver len (usado na escolha da estratégia).
+
+        if top_n <= 0:
+            return []
+
+        if total is None and hasattr(items, '__len__'):
+            total = len(items)
+        if self.matching is not None:
+            items = self.matching(items)
+            if strategy == STRATEGY_AUTO and choose_strategy(top_n, total) != STRATEGY_HEAP:
+                # Fora do heap a entrada seria materializada de qualquer forma;
+                # com a lista filtrada, a escolha usa o número real de candidatos
+                items = list(items)
+                total = len(items)
+        return select_top_n(items, top_n, self.key, total=total, strategy=strategy)
+
+    def __repr__(self):
+        return 'Ranking({}, filters={})'.format(self.keys, self.filters)
+
@@ -0,0 +1,151 @@
+# src/selection.py
+# Motor de seleção parcial dos N maiores elementos.
+#
+# A ordem do resultado é sempre a mesma de uma ordenação estável decrescente:
+# maior chave primeiro e, em caso de empate, quem apareceu antes na entrada.
+
+import heapq
+
+# Estratégias disponíveis para select_top_n.
+STRATEGY_AUTO = 'auto'
+STRATEGY_HEAP = 'heap'
+STRATEGY_QUICKSELECT = 'quickselect'
+STRATEGY_SORT = 'sort'
+
+# Limites (fração de top_n em relação ao total) usados pela escolha automática.
+# Ajustados com benchmarks/bench_top_n.py.
+HEAP_MAX_RATIO = 0.005
+SORT_MIN_RATIO = 0.25
+
+
+def choose_strategy(top_n, total):
+    # Escolhe a estratégia mais barata para selecionar top_n de total elementos.
+    # Sem o tamanho da entrada (iteradores), só o heap limitado é viável.
+
+    if total is None:
+        return STRATEGY_HEAP
+
+    if top_n >= total * SORT_MIN_RATIO:
+        return STRATEGY_SORT
+
+    if top_n <= total * HEAP_MAX_RATIO:
+        return STRATEGY_HEAP
+
+    return STRATEGY_QUICKSELECT
+
+
+def select_top_n(items, top_n, key, total=None, strategy=STRATEGY_AUTO):
+    # Retorna os top_n itens com maior key(item), do maior para o menor.
+    # items pode ser qualquer iterável; total é o tamanho esperado (se conhecido).
+
+    if top_n <= 0:
+        return []
+
+    if strategy == STRATEGY_AUTO:
+        strategy = choose_strategy(top_n, total)
+
+    if strategy == STRATEGY_HEAP:
+        return _heap_select(items, top_n, key)
+
+    if strategy == STRATEGY_QUICKSELECT:
+        return _quickselect(items, top_n, key)
+
+    if strategy == STRATEGY_SORT:
+        return _sort_select(items, top_n, key)
+
+    raise ValueError('Estratégia de seleção desconhecida: {}'.format(strategy))
+
+
+def _heap_select(items, top_n, key):
+    # Heap mínimo limitado a top_n entradas: O(n log k) de tempo e O(k) de memória.
+    # Cada entrada é (chave, -posição, item); a posição é única, então o item
+    # nunca é comparado e empates ficam com quem chegou primeiro.
+
+    heap = []
+    push = heapq.heappush
+    replace = heapq.heapreplace
+
+    for position, item in enumerate(items):
+        value = key(item)
+
+        if len(heap) < top_n:
+            push(heap, (value, -position, item))
+        elif value > heap[0][0]:
+            # Com chave igual o item mais novo perde o empate, então basta
+            # comparar a chave.
+            replace(heap, (value, -position, item))
+
+    heap.sort(reverse=True)
+    return [entry[2] for entry in heap]
+
+
+def _quickselect(items, top_n, key):
+    # Particionamento estilo quickselect sobre as chaves: O(n) esperado para
+    # achar o k-ésimo maior valor, seguido da ordenação apenas dos top_n.
+
+    items = list(items)
+    values = [key(item) for item in items]
+
+    if top_n >= len(items):
+        items.sort(key=key, reverse=True)
+        return items
+
+    threshold = _kth_largest(values, top_n)
+
+    # Mantém a ordem de entrada: todos acima do limiar e, entre os iguais ao
+    # limiar, apenas os primeiros que couberem.
+    selected = []
+    ties_left = top_n - sum(1 for value in values if value > threshold)
+    for item, value in zip(items, values):
+        if value > threshold:
+            selected.append(item)
+        elif value == threshold and ties_left > 0:
+            selected.append(item)
+            ties_left -= 1
+
+    selected.sort(key=key, reverse=True)
+    return selected
+
+
+def _kth_largest(values, k):
+    # Retorna o k-ésimo maior valor (1 <= k <= len(values)), contando repetições.
+
+    while True:
+        pivot = _median_of_three(values)
+        greater = [value for value in values if value > pivot]
+
+        if len(greater) >= k:
+            values = greater
+            continue
+
+        equal = values.count(pivot)
+        if len(greater) + equal >= k:
+            return pivot
+
+        k -= len(greater) + equal
+        values = [value for value in values if value < pivot]
+
+
+def _median_of_three(values):
+    # Pivô pela mediana de três, evitando o pior caso em entradas já ordenadas.
+
+    first = values[0]
+    middle = values[len(values) // 2]
+    last = values[-1]
+
+    if first > middle:
+        first, middle = middle, first
+    if middle > last:
+        middle = last
+        if first > middle:
+            middle = first
+
+    return middle
+
+
+def _sort_select(items, top_n, key):
+    # Ordenação completa (Timsort estável), vantajosa quando top_n se aproxima de n.
+
+    items = list(items)
+    items.sort(key=key, reverse=True)
+    return items[:top_n]
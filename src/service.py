@@ -0,0 +1,308 @@
+# src/service.py
+# Serviço asyncio com protocolo JSON delimitado por linha sobre TCP.
+#
+# Cada linha recebida é um pedido JSON e cada linha enviada é a resposta,
+# com o mesmo "id" do pedido (as respostas podem sair fora de ordem):
+#
+#   {"id": 1, "op": "top_n", "contracts": [[id, debito], ...],
+#    "renegotiated": [id, ...], "top_n": 3}
+#   {"id": 2, "op": "combine_orders", "requests": [100, 200], "n_max": 400,
+#    "strategy": "ffd"}
+#
+#   {"id": 1, "ok": true, "result": [{"id": ..., "debt": ...}, ...]}
+#   {"id": 2, "ok": true, "result": {"groups": [[200, 100]], "loads": [300]}}
+#   {"id": 3, "ok": false, "error": "..."}
+#
+# Pedidos concorrentes da mesma operação são agrupados em micro-lotes (até
+# max_batch pedidos ou batch_delay segundos) e executados fora do event loop,
+# em um executor, pelas APIs em lote (get_top_N_many / combine_orders_many).
+# Backpressure: no máximo max_pending pedidos em andamento; ao atingir o
+# limite, o serviço para de ler das conexões até que algum termine, e o TCP
+# segura os clientes. Linhas maiores que max_line_bytes encerram a conexão.
+#
+# Uso: python src/service.py [--host HOST] [--port PORT]
+
+import argparse
+import asyncio
+import json
+
+try:
+    from .contract import Contract
+    from .contracts import Contracts
+    from .orders import Orders
+except ImportError:
+    from contract import Contract
+    from contracts import Contracts
+    from orders import Orders
+
+OP_TOP_N = 'top_n'
+OP_COMBINE_ORDERS = 'combine_orders'
+
+DEFAULT_PORT = 8765
+DEFAULT_MAX_BATCH = 64
+DEFAULT_BATCH_DELAY = 0.002
+DEFAULT_MAX_PENDING = 1024
+DEFAULT_MAX_LINE_BYTES = 16 * 1024 * 1024
+
+
+def _run_top_n(jobs):
+    # Executado no executor: um micro-lote de consultas top N.
+    # jobs: lista de (contracts, renegotiated, top_n) já decodificados do JSON.
+
+    contract_jobs = [
+        ([Contract(contract_id, debt) for contract_id, debt in contracts], renegotiated, top_n)
+        for contracts, renegotiated, top_n in jobs
+    ]
+    return [
+        (True, [{'id': contract.id, 'debt': contract.debt} for contract in result.value])
+        if result.ok else (False, str(result.error))
+        for result in Contracts().get_top_N_many(contract_jobs)
+    ]
+
+
+def _run_combine_orders(jobs):
+    # Executado no executor: um micro-lote de empacotamentos.
+    # jobs: lista de (requests, n_max, strategy).
+
+    results = []
+    for strategy in dict.fromkeys(job[2] for job in jobs):
+        selected = [index for index, job in enumerate(jobs) if job[2] == strategy]
+        batch = Orders().combine_orders_many(
+            [(jobs[index][0], jobs[index][1]) for index in selected], strategy=strategy)
+        results.extend(zip(selected, batch))
+
+    responses = [None] * len(jobs)
+    for index, result in results:
+        responses[index] = (
+            (True, {'groups': list(result.value), 'loads': list(result.value.loads)})
+            if result.ok else (False, str(result.error))
+        )
+    return responses
+
+
+class _MicroBatcher:
+    # Junta pedidos de uma operação e executa o lote no executor quando atinge
+    # max_batch pedidos ou quando batch_delay segundos se passam desde o
+    # primeiro pedido pendente.
+
+    def __init__(self, run, max_batch, batch_delay, executor):
+        self._run = run
+        self._max_batch = max_batch
+        self._batch_delay = batch_delay
+        self._executor = executor
+        self._jobs = []
+        self._futures = []
+        self._timer = None
+        self._tasks = set()
+
+    def submit(self, job):
+        # Enfileira um job e retorna o future com (ok, valor).
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._jobs.append(job)
+        self._futures.append(future)
+
+        if len(self._jobs) >= self._max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._batch_delay, self._flush)
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._jobs:
+            return
+
+        jobs, futures = self._jobs, self._futures
+        self._jobs, self._futures = [], []
+        task = asyncio.ensure_future(self._execute(jobs, futures))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, jobs, futures):
+        loop = asyncio.get_running_loop()
+        try:
+            results = await loop.run_in_executor(self._executor, self._run, jobs)
+        except Exception as error:
+            results = [(False, str(error))] * len(jobs)
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class OrderService:
+    # Serviço de top N e empacotamento com micro-lotes e backpressure.
+    #
+    # executor: Executor usado para o trabalho pesado (padrão: o executor de
+    # threads do event loop); um ProcessPoolExecutor tira o trabalho do GIL.
+
+    def __init__(self, max_batch=DEFAULT_MAX_BATCH, batch_delay=DEFAULT_BATCH_DELAY,
+                 max_pending=DEFAULT_MAX_PENDING, max_line_bytes=DEFAULT_MAX_LINE_BYTES,
+                 executor=None):
+        # Inicializa o serviço (o servidor só abre em start).
+
+        if max_batch < 1:
+            raise ValueError('max_batch deve ser pelo menos 1')
+        if max_pending < 1:
+            raise ValueError('max_pending deve ser pelo menos 1')
+
+        self.max_line_bytes = max_line_bytes
+        self._max_pending = max_pending
+        self._pending = None
+        self._server = None
+        self._batchers = {
+            OP_TOP_N: _MicroBatcher(_run_top_n, max_batch, batch_delay, executor),
+            OP_COMBINE_ORDERS: _MicroBatcher(_run_combine_orders, max_batch, batch_delay, executor),
+        }
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        # Abre o servidor TCP; port=0 escolhe uma porta livre (ver address).
+
+        self._pending = asyncio.Semaphore(self._max_pending)
+        self._server = await asyncio.start_server(
+            self._handle_connection, host, port, limit=self.max_line_bytes)
+        return self._server
+
+    @property
+    def address(self):
+        # (host, porta) em que o servidor está escutando.
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def close(self):
+        # Fecha o servidor e aguarda o encerramento.
+
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def handle(self, request):
+        # Processa um pedido já decodificado e retorna a resposta (dict).
+
+        request_id = request.get('id') if isinstance(request, dict) else None
+        try:
+            op, job = _parse(request)
+        except (KeyError, TypeError, ValueError) as error:
+            return {'id': request_id, 'ok': False, 'error': 'pedido inválido: {}'.format(error)}
+
+        ok, value = await self._batchers[op].submit(job)
+        if ok:
+            return {'id': request_id, 'ok': True, 'result': value}
+        return {'id': request_id, 'ok': False, 'error': value}
+
+    async def _handle_connection(self, reader, writer):
+        tasks = set()
+        lock = asyncio.Lock()
+
+        try:
+            while True:
+                # Backpressure: sem vaga, a leitura espera e o TCP segura o cliente
+                await self._pending.acquire()
+                try:
+                    line = await reader.readline()
+                except (ValueError, asyncio.LimitOverrunError):
+                    self._pending.release()
+                    await _send(writer, lock, {'id': None, 'ok': False, 'error': 'linha muito longa'})
+                    break
+                except ConnectionError:
+                    self._pending.release()
+                    break
+
+                if not line:
+                    self._pending.release()
+                    break
+                if not line.strip():
+                    self._pending.release()
+                    continue
+
+                task = asyncio.ensure_future(self._respond(line, writer, lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _respond(self, line, writer, lock):
+        try:
+            try:
+                request = json.loads(line)
+            except ValueError as error:
+                response = {'id': None, 'ok': False, 'error': 'JSON inválido: {}'.format(error)}
+            else:
+                response = await self.handle(request)
+            await _send(writer, lock, response)
+        finally:
+            self._pending.release()
+
+
+def _parse(request):
+    # Valida o pedido e retorna (op, job) no formato do micro-lote.
+
+    op = request['op']
+    if op == OP_TOP_N:
+        contracts = [(contract_id, debt) for contract_id, debt in request['contracts']]
+        renegotiated = request.get('renegotiated') or []
+        top_n = request['top_n']
+        if not isinstance(top_n, int):
+            raise TypeError('top_n deve ser inteiro')
+        return op, (contracts, renegotiated, top_n)
+    if op == OP_COMBINE_ORDERS:
+        requests = request['requests']
+        if not isinstance(requests, list):
+            raise TypeError('requests deve ser uma lista')
+        # Pares [id, tamanho] viram tuplas (pedidos identificados)
+        requests = [tuple(item) if isinstance(item, list) else item for item in requests]
+        n_max = request['n_max']
+        strategy = request.get('strategy', 'ffd')
+        if not isinstance(n_max, (int, float)) or not isinstance(strategy, str):
+            raise TypeError('n_max deve ser numérico e strategy, texto')
+        return op, (requests, n_max, strategy)
+    raise ValueError('operação desconhecida: {}'.format(op))
+
+
+async def _send(writer, lock, response):
+    # Escreve uma resposta e respeita o buffer de saída (drain).
+
+    data = json.dumps(response, separators=(',', ':')).encode() + b'\n'
+    async with lock:
+        writer.write(data)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+
+async def _serve(host, port, max_batch, batch_delay, max_pending):
+    service = OrderService(max_batch, batch_delay, max_pending)
+    server = await service.start(host, port)
+    print('Escutando em {}:{}'.format(*service.address))
+    async with server:
+        await server.serve_forever()
+
+
+def main(argv=None):
+    # Ponto de entrada: python src/service.py --port 8765
+
+    parser = argparse.ArgumentParser(description='Serviço de top N e empacotamento de pedidos')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--batch-delay', type=float, default=DEFAULT_BATCH_DELAY)
+    parser.add_argument('--max-pending', type=int, default=DEFAULT_MAX_PENDING)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_serve(args.host, args.port, args.max_batch, args.batch_delay, args.max_pending))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
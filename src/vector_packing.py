@@ -0,0 +1,229 @@
+# src/vector_packing.py
+# Empacotamento multidimensional (vector bin packing): cada pedido tem várias
+# dimensões (ex.: peso, volume, quantidade de itens) e cada grupo tem um limite
+# por dimensão.
+#
+# Com NumPy, as cargas de todos os grupos ficam numa matriz e o teste "cabe
+# neste grupo?" é feito de uma vez para todos os grupos, com comparações
+# vetorizadas. Grupos que não comportam mais nenhum dos pedidos restantes são
+# retirados da busca periodicamente.
+
+import math
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+ORDERING_NONE = None
+ORDERING_NORM = 'norm'
+ORDERING_SUM = 'sum'
+ORDERING_MAX = 'max'
+
+PLACEMENT_FIRST = 'first'
+PLACEMENT_DOT = 'dot'
+
+# A cada quantos pedidos os grupos que não aceitam mais nada são retirados.
+_COMPACT_EVERY = 256
+
+# Grupos testados por operação vetorizada no First Fit do caminho NumPy.
+_SCAN_CHUNK = 16384
+
+
+def _normalized(request, capacities):
+    return [value / capacity for value, capacity in zip(request, capacities)]
+
+
+def _ordering_key(ordering, capacities):
+    # Chave de ordenação (decrescente) dos pedidos, sobre as demandas normalizadas
+    # pela capacidade de cada dimensão.
+
+    if ordering == ORDERING_NORM:
+        return lambda request: math.sqrt(sum(v * v for v in _normalized(request, capacities)))
+    if ordering == ORDERING_SUM:
+        return lambda request: sum(_normalized(request, capacities))
+    if ordering == ORDERING_MAX:
+        return lambda request: max(_normalized(request, capacities))
+    raise ValueError('Ordenação desconhecida: {}'.format(ordering))
+
+
+def pack_vectors(requests, capacities, ordering=ORDERING_NORM, placement=PLACEMENT_FIRST):
+    # Empacota pedidos multidimensionais.
+    # requests: sequência de vetores (tuplas) com uma demanda por dimensão
+    # capacities: limite de cada dimensão
+    # ordering: 'norm', 'sum', 'max' (decrescente, sobre demandas normalizadas)
+    #           ou None para manter a ordem de entrada
+    # placement: 'first' (primeiro grupo onde cabe) ou 'dot' (grupo que cabe
+    #            com maior produto escalar entre a demanda e a folga normalizadas)
+    # Retorna (assignment, loads) no formato de packing.py, onde assignment
+    # segue a ordem de entrada e loads é a lista de cargas (tuplas) por grupo.
+
+    capacities = tuple(capacities)
+    dimensions = len(capacities)
+    for request in requests:
+        if len(request) != dimensions:
+            raise ValueError('Todos os pedidos devem ter {} dimensões'.format(dimensions))
+
+    if placement not in (PLACEMENT_FIRST, PLACEMENT_DOT):
+        raise ValueError('Posicionamento desconhecido: {}'.format(placement))
+
+    positions = list(range(len(requests)))
+    if ordering is not ORDERING_NONE:
+        key = _ordering_key(ordering, capacities)
+        positions.sort(key=lambda position: key(requests[position]), reverse=True)
+
+    ordered = [tuple(requests[position]) for position in positions]
+
+    if np is not None:
+        ordered_assignment, loads = _pack_numpy(ordered, capacities, placement)
+    else:
+        ordered_assignment, loads = _pack_python(ordered, capacities, placement)
+
+    assignment = [0] * len(requests)
+    for position, group in zip(positions, ordered_assignment):
+        assignment[position] = group
+    return assignment, loads
+
+
+def _suffix_minimums(ordered, dimensions):
+    # Menor demanda restante por dimensão a partir de cada posição.
+
+    suffix = [None] * (len(ordered) + 1)
+    current = [math.inf] * dimensions
+    suffix[len(ordered)] = tuple(current)
+    for index in range(len(ordered) - 1, -1, -1):
+        current = [min(a, b) for a, b in zip(current, ordered[index])]
+        suffix[index] = tuple(current)
+    return suffix
+
+
+def _pack_numpy(ordered, capacities, placement):
+    # Versão vetorizada. As cargas ficam numa matriz dimensões x grupos (cada
+    # dimensão contígua) e o teste de encaixe é feito com ufuncs sobre faixas
+    # de até _SCAN_CHUNK grupos, escrevendo em buffers pré-alocados. No First
+    # Fit a busca para na primeira faixa com algum grupo compatível. Grupos que
+    # não aceitam mais nada (ou acima do limite) ficam com carga infinita.
+
+    count = len(ordered)
+    dimensions = len(capacities)
+    limit = [float(capacity) for capacity in capacities]
+    suffix = np.asarray(_suffix_minimums(ordered, dimensions), dtype=float)
+
+    size = max(count, 1)
+    loads = np.full((dimensions, size), np.inf)
+    total = np.empty(size)
+    fits = np.empty(size, dtype=bool)
+    fits_dimension = np.empty(size, dtype=bool)
+    start = 0          # grupos antes de start foram todos retirados
+    group_count = 0
+    assignment = []
+
+    for index, item in enumerate(ordered):
+        if index % _COMPACT_EVERY == 0 and group_count > start:
+            # Retira grupos onde nenhum pedido restante cabe em alguma dimensão
+            current = loads[:, start:group_count]
+            dead = (current + suffix[index][:, None] > np.asarray(limit)[:, None]).any(axis=0)
+            current[:, dead] = np.inf
+            while start < group_count and loads[0, start] == np.inf:
+                start += 1
+
+        group = -1
+        oversize = any(value > capacity for value, capacity in zip(item, limit))
+        if not oversize:
+            low = start
+            high = group_count if placement == PLACEMENT_DOT else low
+            while group < 0 and low < group_count:
+                if placement == PLACEMENT_FIRST:
+                    high = min(group_count, low + _SCAN_CHUNK)
+                window = slice(low, high)
+                for dimension in range(dimensions):
+                    np.add(loads[dimension, window], item[dimension], out=total[window])
+                    target = fits if dimension == 0 else fits_dimension
+                    np.less_equal(total[window], limit[dimension], out=target[window])
+                    if dimension:
+                        np.logical_and(fits[window], fits_dimension[window], out=fits[window])
+
+                if placement == PLACEMENT_FIRST:
+                    first = low + int(np.argmax(fits[window]))
+                    if fits[first]:
+                        group = first
+                else:
+                    candidates = low + np.flatnonzero(fits[window])
+                    if len(candidates):
+                        weights = [value / capacity for value, capacity in zip(item, limit)]
+                        scores = sum(
+                            (limit[dimension] - loads[dimension, candidates]) / limit[dimension]
+                            * weights[dimension] for dimension in range(dimensions))
+                        group = int(candidates[int(np.argmax(scores))])
+                low = high
+
+        if group < 0:
+            group = group_count
+            group_count += 1
+            loads[:, group] = np.inf if oversize else item
+        else:
+            loads[:, group] += item
+
+        assignment.append(group)
+
+    # A matriz float só guia a busca; o resultado usa as cargas com os tipos originais
+    return assignment, _group_loads(ordered, assignment, group_count)
+
+
+def _group_loads(ordered, assignment, group_count):
+    # Cargas exatas (com os tipos originais) de cada grupo.
+
+    loads = [None] * group_count
+    for request, group in zip(ordered, assignment):
+        current = loads[group]
+        loads[group] = request if current is None else tuple(
+            a + b for a, b in zip(current, request))
+    return loads
+
+
+def _pack_python(ordered, capacities, placement):
+    # Versão em Python puro (sem NumPy), com a mesma retirada de grupos esgotados.
+
+    dimensions = len(capacities)
+    suffix = _suffix_minimums(ordered, dimensions)
+    loads = []
+    active = []
+    assignment = []
+
+    for index, item in enumerate(ordered):
+        if index % _COMPACT_EVERY == 0 and active:
+            minimum = suffix[index]
+            active = [
+                group for group in active
+                if all(load + need <= capacity
+                       for load, need, capacity in zip(loads[group], minimum, capacities))
+            ]
+
+        oversize = any(value > capacity for value, capacity in zip(item, capacities))
+        group = -1
+        if not oversize:
+            best_score = None
+            weights = [value / capacity for value, capacity in zip(item, capacities)]
+            for candidate in active:
+                load = loads[candidate]
+                if all(a + b <= capacity for a, b, capacity in zip(load, item, capacities)):
+                    if placement == PLACEMENT_FIRST:
+                        group = candidate
+                        break
+                    score = sum((capacity - a) / capacity * weight
+                                for a, weight, capacity in zip(load, weights, capacities))
+                    if best_score is None or score > best_score:
+                        best_score = score
+                        group = candidate
+
+        if group < 0:
+            group = len(loads)
+            loads.append(item)
+            if not oversize:
+                active.append(group)
+        else:
+            loads[group] = tuple(a + b for a, b in zip(loads[group], item))
+
+        assignment.append(group)
+
+    return assignment, loads
@@ -0,0 +1,117 @@
+# src/vectorized.py
+# Seleção dos top N sobre colunas (ids/debts) usando NumPy.
+# NumPy é opcional: sem ele, available() retorna False e quem chama deve usar
+# o caminho em Python puro.
+
+from numbers import Integral, Real
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from .exclusion import MODE_BITMAP, ExclusionFilter
+except ImportError:
+    from exclusion import MODE_BITMAP, ExclusionFilter
+
+# Abaixo deste tamanho o overhead de NumPy não compensa.
+VECTORIZE_MIN_SIZE = 2048
+
+
+def available():
+    # Indica se o caminho vetorizado pode ser usado.
+    return np is not None
+
+
+def top_n_positions(ids, debts, renegotiated_ids, top_n):
+    # Retorna as posições (np.ndarray) dos top_n maiores débitos cujo id não está
+    # em renegotiated_ids, na mesma ordem da ordenação estável decrescente:
+    # maior débito primeiro e, em empates, a menor posição.
+
+    ids = np.asarray(ids)
+    debts = np.asarray(debts)
+
+    if debts.dtype.kind == 'u':
+        # Evita estouro ao negar inteiros sem sinal.
+        debts = debts.astype(np.int64)
+
+    # Filtro de renegociados com teste de pertinência vetorizado
+    excluded = _excluded_mask(ids, renegotiated_ids)
+    if excluded is not None:
+        kept = np.flatnonzero(~excluded)
+        values = debts[kept]
+    else:
+        kept = None
+        values = debts
+
+    size = len(values)
+    top_n = min(top_n, size)
+    if top_n <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    if top_n < size:
+        # argpartition separa os top_n maiores sem ordenar; o limiar resolve os
+        # empates pela ordem de posição, como na ordenação estável.
+        partition = np.argpartition(values, size - top_n)[size - top_n:]
+        threshold = values[partition].min()
+        above = np.flatnonzero(values > threshold)
+        ties = np.flatnonzero(values == threshold)[:top_n - len(above)]
+        candidates = np.concatenate((above, ties))
+        candidates.sort()
+    else:
+        candidates = np.arange(size)
+
+    # Ordenação estável decrescente apenas dos candidatos
+    order = np.argsort(-values[candidates], kind='stable')
+    chosen = candidates[order]
+
+    return chosen if kept is None else kept[chosen]
+
+
+def _excluded_mask(ids, renegotiated_ids):
+    # Máscara booleana dos ids excluídos, ou None se não há exclusões.
+    # Um ExclusionFilter em modo bitmap é consultado diretamente pelos bits.
+
+    if renegotiated_ids is None or len(renegotiated_ids) == 0:
+        return None
+
+    if (isinstance(renegotiated_ids, ExclusionFilter) and renegotiated_ids.mode == MODE_BITMAP
+            and ids.dtype.kind in 'iu'):
+        bits = np.unpackbits(np.frombuffer(renegotiated_ids.bitmap, dtype=np.uint8), bitorder='little')
+        offsets = ids.astype(np.int64) - renegotiated_ids.base
+        inside = (offsets >= 0) & (offsets < len(bits))
+        mask = np.zeros(len(ids), dtype=bool)
+        mask[inside] = bits[offsets[inside]].astype(bool)
+        return mask
+
+    excluded = _excluded_array(renegotiated_ids, ids.dtype)
+    if excluded is None:
+        return None
+    return np.isin(ids, excluded)
+
+
+def _excluded_array(renegotiated_ids, dtype):
+    # Converte os IDs renegociados para um array do mesmo tipo dos ids.
+    # IDs de outro tipo (ex.: strings) nunca coincidem com ids numéricos;
+    # inteiros NumPy contam como inteiros.
+
+    if renegotiated_ids is None or len(renegotiated_ids) == 0:
+        return None
+
+    kind = np.dtype(dtype).kind
+    if isinstance(renegotiated_ids, np.ndarray) and renegotiated_ids.dtype.kind in 'iu':
+        values = renegotiated_ids
+    elif kind in 'iu':
+        values = [value for value in renegotiated_ids
+                  if isinstance(value, Integral) and not isinstance(value, bool)]
+    elif kind == 'f':
+        values = [value for value in renegotiated_ids
+                  if isinstance(value, Real) and not isinstance(value, bool)]
+    else:
+        values = list(renegotiated_ids)
+
+    if len(values) == 0:
+        return None
+
+    return np.asarray(values, dtype=dtype)
@@ -0,0 +1,139 @@
+# Testes unitários para as APIs em lote (combine_orders_many / get_top_N_many).
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.batch import JobResult, iter_batch, run_batch, scratch
+from src.contract import Contract
+from src.contracts import Contracts
+from src.orders import Orders
+
+
+def make_jobs(count, seed=0):
+    rng = random.Random(seed)
+    return [([rng.randint(1, 300) for _ in range(rng.randint(0, 200))], rng.choice([300, 500]))
+            for _ in range(count)]
+
+
+class TestCombineOrdersMany:
+
+    @pytest.mark.parametrize('executor', [None, 'thread', 'process'])
+    def test_matches_individual_calls(self, executor):
+        # Testa que cada job produz o mesmo resultado de combine_orders, em ordem.
+        jobs = make_jobs(50)
+        orders = Orders()
+        results = orders.combine_orders_many(jobs, executor=executor, workers=2, chunk_size=8)
+        assert [result.value for result in results] == [
+            orders.combine_orders(requests, n_max) for requests, n_max in jobs]
+        assert all(result.ok for result in results)
+
+    def test_errors_are_reported_per_job(self):
+        # Testa que um job inválido não interrompe os demais.
+        jobs = [([5, 3], 10), ([1, 'x'], 10), ([4], 10), 'bogus']
+        results = Orders().combine_orders_many(jobs)
+        assert [result.ok for result in results] == [True, False, True, False]
+        assert results[0].value == [[5, 3]]
+        assert results[2].value == [[4]]
+        assert isinstance(results[1].error, TypeError)
+
+    def test_options_apply_to_every_job(self):
+        # Testa que strategy e split_oversize valem para todos os jobs.
+        results = Orders().combine_orders_many([([1000], 400), ([50, 70, 60, 30], 100)],
+                                               strategy='bf', split_oversize=True)
+        assert results[0].value == [[400], [400], [200]]
+        assert results[1].value == [[50], [70, 30], [60]]
+
+    def test_existing_executor(self):
+        # Testa o uso de um Executor fornecido pelo chamador.
+        jobs = make_jobs(10, seed=1)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            results = Orders().combine_orders_many(jobs, executor=pool, chunk_size=3)
+        assert [result.value for result in results] == [
+            Orders().combine_orders(requests, n_max) for requests, n_max in jobs]
+
+    def test_large_job_then_small_jobs(self):
+        # Testa que a árvore da thread volta a um tamanho pequeno depois de um
+        # job grande, sem mudar os resultados dos jobs pequenos seguintes.
+        rng = random.Random(2)
+        orders = Orders()
+        large = ([rng.randint(1, 1000) for _ in range(50000)], 1000)
+        small = make_jobs(20, seed=3)
+        results = orders.combine_orders_many([large] + small, chunk_size=64)
+
+        assert [result.value for result in results[1:]] == [
+            orders.combine_orders(requests, n_max) for requests, n_max in small]
+        tree = scratch('load_tree', lambda: None)
+        assert tree.size <= 4 * 256
+        assert len(tree.tree) == 2 * tree.size
+
+
+class TestTopNMany:
+
+    def test_matches_individual_calls(self):
+        # Testa que cada consulta produz o mesmo resultado de get_top_N_open_contracts.
+        rng = random.Random(2)
+        renegotiated = [rng.randint(1, 500) for _ in range(50)]
+        jobs = []
+        for _ in range(30):
+            contracts = [Contract(i, rng.randint(1, 10000)) for i in rng.sample(range(1, 1000), 100)]
+            jobs.append((contracts, renegotiated, rng.randint(0, 20)))
+
+        for executor in (None, 'thread', 'process'):
+            results = Contracts().get_top_N_many(jobs, executor=executor, workers=2, chunk_size=4)
+            assert [[(c.id, c.debt) for c in result.value] for result in results] == [
+                [(c.id, c.debt) for c in Contracts().get_top_N_open_contracts(*job)] for job in jobs]
+
+    def test_errors_are_reported_per_job(self):
+        # Testa que uma consulta inválida é reportada sem interromper as demais.
+        contracts = [Contract(1, 10), Contract(2, 20)]
+        results = Contracts().get_top_N_many([(contracts, None, 1), ([object()], [], 1)])
+        assert results[0].value[0].id == 2
+        assert not results[1].ok and isinstance(results[1].error, AttributeError)
+
+
+class TestRunBatch:
+
+    def test_unknown_executor(self):
+        # Testa que um executor desconhecido gera erro.
+        with pytest.raises(ValueError):
+            run_batch(lambda payload: [], [1], executor='bogus')
+
+    def test_failed_chunk_marks_every_job(self):
+        # Testa que a falha de um bloco inteiro é reportada em cada job dele.
+        def broken(payload):
+            raise RuntimeError('falhou')
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            results = run_batch(broken, [1, 2, 3], executor=pool, chunk_size=2)
+        assert len(results) == 3
+        assert all(isinstance(result, JobResult) and not result.ok for result in results)
+
+    def test_iter_batch_yields_each_chunk_when_ready(self):
+        # Testa que iter_batch entrega os resultados de um bloco sem esperar os
+        # seguintes, e que a validação dos argumentos não é adiada.
+        processed = []
+
+        def run_chunk(payload):
+            jobs, options = payload
+            processed.append(jobs)
+            return [JobResult(job * options, None) for job in jobs]
+
+        results = iter_batch(run_chunk, range(5), 10, chunk_size=2)
+        assert next(results) == JobResult(0, None)
+        assert processed == [[0, 1]]
+        assert [result.value for result in results] == [10, 20, 30, 40]
+        assert processed == [[0, 1], [2, 3], [4]]
+
+        with pytest.raises(ValueError):
+            iter_batch(run_chunk, [1], chunk_size=0)
+        with pytest.raises(ValueError):
+            iter_batch(run_chunk, [1], executor='bogus')
+
+    def test_lazy_many_matches_list(self):
+        # Testa lazy=True nas APIs em lote, com um pool criado por iter_batch.
+        jobs = [([100, 200, 300], 400), ([50] * 10, 120)]
+        expected = [result.value for result in Orders().combine_orders_many(jobs)]
+        lazy = Orders().combine_orders_many(jobs, executor='thread', workers=2, lazy=True)
+        assert not isinstance(lazy, list)
+        assert [result.value for result in lazy] == expected
@@ -0,0 +1,94 @@
+# Testes unitários para a comparação com o baseline da suíte de benchmarks
+# (benchmarks/suite.py).
+
+from benchmarks import suite
+from benchmarks.suite import (
+    DEFAULT_MEMORY_TOLERANCE, DEFAULT_TOLERANCE, NOISE_FLOOR, compare, complexity_failures
+)
+
+
+def _document(seconds=0.1, peak_bytes=1024 * 1024, check=42, calibration=0.05, case='combine/x'):
+    # Documento de resultados com um único caso em n=1000.
+    return {'calibration': calibration, 'numpy': True,
+            'results': [{'case': case, 'n': 1000, 'seconds': seconds,
+                         'peak_bytes': peak_bytes, 'check': check}]}
+
+
+class TestCompare:
+
+    def test_within_tolerance(self):
+        # Testa que tempo e memória dentro da tolerância não falham.
+        lines, failures = compare(_document(seconds=0.1 * (1 + DEFAULT_TOLERANCE) * 0.99),
+                                  _document())
+        assert failures == []
+        assert len(lines) == 1
+        assert lines[0].startswith('combine/x@1000 ') and lines[0].endswith('memória x1.00')
+
+    def test_slower_than_tolerance(self):
+        # Testa a falha de tempo acima da tolerância relativa.
+        lines, failures = compare(_document(seconds=0.13), _document())
+        assert len(failures) == 1 and failures[0].startswith('combine/x@1000: 130.00ms')
+        # Tolerância maior aceita o mesmo run
+        assert compare(_document(seconds=0.13), _document(), tolerance=0.5)[1] == []
+
+    def test_calibration_scales_baseline(self):
+        # Testa que o baseline é escalado pela calibração da máquina atual.
+        assert compare(_document(seconds=0.2, calibration=0.1), _document())[1] == []
+        assert len(compare(_document(seconds=0.2, calibration=0.05), _document())[1]) == 1
+
+    def test_noise_floor(self):
+        # Testa que diferenças absolutas abaixo do piso de ruído não falham,
+        # mesmo com razão bem acima da tolerância.
+        baseline = _document(seconds=0.001)
+        assert compare(_document(seconds=0.001 + NOISE_FLOOR * 0.9), baseline)[1] == []
+        assert len(compare(_document(seconds=0.001 + NOISE_FLOOR * 1.1), baseline)[1]) == 1
+
+    def test_changed_check(self):
+        # Testa que um resultado diferente falha mesmo sem mudança de tempo.
+        _, failures = compare(_document(check=43), _document())
+        assert failures == ['combine/x@1000: resultado mudou (conferência 43, baseline 42)']
+
+    def test_memory_growth(self):
+        # Testa a falha de memória acima da tolerância e o piso absoluto de 64 KB.
+        baseline = _document(peak_bytes=1024 * 1024)
+        grown = 1024 * 1024 * (1 + DEFAULT_MEMORY_TOLERANCE) + 100 * 1024
+        _, failures = compare(_document(peak_bytes=grown), baseline)
+        assert len(failures) == 1 and 'pico de' in failures[0]
+
+        small = _document(peak_bytes=100 * 1024)
+        assert compare(_document(peak_bytes=150 * 1024), small)[1] == []
+        assert compare(_document(peak_bytes=1024 * 1024 * 1.05), baseline)[1] == []
+
+    def test_cases_only_on_one_side_are_ignored(self):
+        # Testa que casos novos ou removidos não são comparados.
+        lines, failures = compare(_document(case='novo', seconds=10), _document())
+        assert lines == [] and failures == []
+
+    def test_numpy_mismatch_warns(self):
+        # Testa o aviso quando o baseline foi gravado com outro estado do NumPy.
+        current = _document()
+        current['numpy'] = False
+        lines, failures = compare(current, _document())
+        assert lines[0].startswith('aviso: NumPy presente no baseline e ausente agora')
+        assert failures == []
+
+
+class TestComplexityFailures:
+
+    def test_exponent_above_expected_plus_slack(self):
+        # Testa a falha de crescimento e a folga sobre o expoente esperado.
+        document = {'complexity': {
+            'ok': {'exponent': 1.0 + suite.COMPLEXITY_SLACK * 0.9, 'expected': 1.0},
+            'quadratic': {'exponent': 1.9, 'expected': 1.0},
+            'single_size': {'exponent': None, 'expected': 1.0},
+        }}
+        assert complexity_failures(document) == [
+            'quadratic: tempo cresce como n^1.90, esperado ~n^1.0']
+        assert complexity_failures(document, slack=1.0) == []
+
+    def test_growth_exponent(self):
+        # Testa a inclinação log-log para crescimento linear e quadrático.
+        linear = suite.growth_exponent([(1000, 0.001), (10000, 0.01), (100000, 0.1)])
+        quadratic = suite.growth_exponent([(1000, 0.001), (10000, 0.1)])
+        assert abs(linear - 1.0) < 1e-9 and abs(quadratic - 2.0) < 1e-9
+        assert suite.growth_exponent([(1000, 0.001)]) is None
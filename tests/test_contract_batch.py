@@ -0,0 +1,84 @@
+# Testes unitários para a classe ContractBatch.
+
+import pytest
+from src.contract import Contract
+from src.contract_batch import ContractBatch
+from src.contracts import Contracts
+from src.selection import STRATEGY_HEAP, STRATEGY_QUICKSELECT, STRATEGY_SORT
+
+
+class TestContractBatch:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        self.sample_contracts = [
+            Contract(1, 1000),
+            Contract(2, 2500),
+            Contract(3, 1500),
+            Contract(4, 3000),
+            Contract(5, 800),
+            Contract(6, 2000)
+        ]
+        self.batch = ContractBatch.from_contracts(self.sample_contracts)
+
+    def test_contract_has_no_dict(self):
+        # Testa que Contract usa __slots__.
+        contract = Contract(1, 1000)
+        assert not hasattr(contract, '__dict__')
+        with pytest.raises(AttributeError):
+            contract.extra = 1
+
+    def test_from_contracts_keeps_values(self):
+        # Testa que o lote preserva ids e débitos.
+        assert len(self.batch) == 6
+        assert list(self.batch.ids) == [1, 2, 3, 4, 5, 6]
+        assert list(self.batch.debts) == [1000, 2500, 1500, 3000, 800, 2000]
+
+    def test_integer_debts_stay_integers(self):
+        # Testa que débitos inteiros usam coluna inteira.
+        assert self.batch.debts.typecode == 'q'
+        assert repr(self.batch[0]) == 'Contract(id=1, debt=1000)'
+
+    def test_float_debts_use_double(self):
+        # Testa que débitos float usam coluna double.
+        batch = ContractBatch([1, 2], [10, 20.5])
+        assert batch.debts.typecode == 'd'
+        assert batch[1].debt == 20.5
+
+    def test_mismatched_columns(self):
+        # Testa que colunas de tamanhos diferentes geram erro.
+        with pytest.raises(ValueError):
+            ContractBatch([1, 2], [10])
+        with pytest.raises(ValueError):
+            ContractBatch.from_arrays([1, 2], [10])
+
+    def test_views_and_iteration(self):
+        # Testa indexação e iteração como objetos Contract.
+        contract = self.batch[3]
+        assert isinstance(contract, Contract)
+        assert (contract.id, contract.debt) == (4, 3000)
+        assert [c.id for c in self.batch] == [1, 2, 3, 4, 5, 6]
+
+    def test_append_and_nbytes(self):
+        # Testa inclusão de contratos e tamanho em bytes.
+        self.batch.append(7, 50)
+        assert len(self.batch) == 7
+        assert self.batch.nbytes == 7 * 8 * 2
+
+    @pytest.mark.parametrize('strategy', [STRATEGY_HEAP, STRATEGY_QUICKSELECT, STRATEGY_SORT])
+    def test_contracts_top_n_on_batch(self, strategy):
+        # Testa que Contracts opera sobre o lote com o mesmo resultado da lista.
+        manager = Contracts()
+        expected = manager.get_top_N_open_contracts(self.sample_contracts, [2, 5], 3)
+        result = manager.get_top_N_open_contracts(self.batch, [2, 5], 3, strategy=strategy)
+        assert [(c.id, c.debt) for c in result] == [(c.id, c.debt) for c in expected]
+
+    def test_contracts_top_n_on_batch_ties(self):
+        # Testa que empates no lote seguem a ordem das posições.
+        batch = ContractBatch(range(10), [5, 9, 5, 9, 1, 5, 9, 0, 5, 5])
+        result = Contracts().get_top_N_open_contracts(batch, [3], 5)
+        assert [c.id for c in result] == [1, 6, 0, 2, 5]
+
+    def test_contracts_top_n_on_empty_batch(self):
+        # Testa com lote vazio.
+        assert Contracts().get_top_N_open_contracts(ContractBatch(), [], 3) == []
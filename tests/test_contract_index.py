@@ -0,0 +1,122 @@
+# Testes unitários para a classe ContractIndex.
+
+import random
+
+import pytest
+from src.contract import Contract
+from src.contract_index import ContractIndex
+from src.contracts import Contracts
+
+
+class TestContractIndex:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        self.sample_contracts = [
+            Contract(1, 1000),
+            Contract(2, 2500),
+            Contract(3, 1500),
+            Contract(4, 3000),
+            Contract(5, 800),
+            Contract(6, 2000)
+        ]
+        self.index = ContractIndex(self.sample_contracts, [2, 5])
+
+    def _ids(self, contracts):
+        return [contract.id for contract in contracts]
+
+    def test_top_n_basic(self):
+        # Testa a consulta básica, excluindo renegociados.
+        assert self._ids(self.index.top_n(3)) == [4, 6, 3]
+
+    def test_top_n_does_not_consume(self):
+        # Testa que consultas repetidas dão o mesmo resultado.
+        assert self.index.top_n(2) == self.index.top_n(2)
+        assert len(self.index.top_n(10)) == 4
+
+    def test_top_n_zero(self):
+        # Testa top_n zero ou negativo.
+        assert self.index.top_n(0) == []
+        assert self.index.top_n(-1) == []
+
+    def test_insert_and_update(self):
+        # Testa inclusão e atualização de débito.
+        self.index.insert(Contract(7, 2800))
+        assert self._ids(self.index.top_n(2)) == [4, 7]
+
+        self.index.update_debt(1, 5000)
+        assert self._ids(self.index.top_n(2)) == [1, 4]
+        assert self.index.get(1).debt == 5000
+
+    def test_insert_existing_id_updates(self):
+        # Testa que incluir um ID existente atualiza o débito.
+        self.index.insert(Contract(3, 9000))
+        assert len(self.index) == 6
+        assert self._ids(self.index.top_n(1)) == [3]
+
+    def test_close(self):
+        # Testa encerramento de contratos.
+        self.index.close(4)
+        assert 4 not in self.index
+        assert self._ids(self.index.top_n(3)) == [6, 3, 1]
+        with pytest.raises(KeyError):
+            self.index.close(4)
+
+    def test_mark_and_unmark_renegotiated(self):
+        # Testa marcação e desmarcação de renegociados.
+        self.index.mark_renegotiated(4)
+        assert self._ids(self.index.top_n(1)) == [6]
+
+        self.index.unmark_renegotiated(2)
+        self.index.unmark_renegotiated(4)
+        assert self._ids(self.index.top_n(3)) == [4, 2, 6]
+        assert not self.index.is_renegotiated(4)
+
+    def test_update_back_to_same_debt(self):
+        # Testa atualizações que voltam ao mesmo débito (entradas antigas empatadas).
+        self.index.update_debt(1, 7000)
+        self.index.update_debt(1, 1000)
+        self.index.update_debt(1, 1000)
+        assert self._ids(self.index.top_n(4)) == [4, 6, 3, 1]
+
+    def test_version_changes_on_updates(self):
+        # Testa que a versão muda a cada alteração.
+        version = self.index.version
+        self.index.update_debt(1, 10)
+        assert self.index.version > version
+
+    def test_random_workload_matches_contracts(self):
+        # Testa uma carga mista aleatória contra o cálculo completo de Contracts.
+        rng = random.Random(3)
+        contracts = [Contract(i, rng.randint(0, 20)) for i in range(300)]
+        index = ContractIndex(contracts)
+        book = {contract.id: contract for contract in contracts}
+        renegotiated = set()
+        next_id = 300
+
+        for _ in range(3000):
+            operation = rng.random()
+            contract_id = rng.choice(list(book)) if book else None
+            if operation < 0.4 and contract_id is not None:
+                index.update_debt(contract_id, rng.randint(0, 20))
+            elif operation < 0.55:
+                contract = Contract(next_id, rng.randint(0, 20))
+                next_id += 1
+                book[contract.id] = contract
+                index.insert(contract)
+            elif operation < 0.65 and contract_id is not None:
+                del book[contract_id]
+                index.close(contract_id)
+            elif operation < 0.8 and contract_id is not None:
+                renegotiated.add(contract_id)
+                index.mark_renegotiated(contract_id)
+            elif operation < 0.9 and renegotiated:
+                contract_id = rng.choice(sorted(renegotiated))
+                renegotiated.discard(contract_id)
+                index.unmark_renegotiated(contract_id)
+            else:
+                top_n = rng.randint(1, 40)
+                expected = Contracts().get_top_N_open_contracts(
+                    list(book.values()), renegotiated, top_n
+                )
+                assert self._ids(index.top_n(top_n)) == self._ids(expected)
@@ -3,6 +3,8 @@
 import pytest
 from src.contract import Contract
 from src.contracts import Contracts
+from src.instrumentation import Stats
+from src.selection import STRATEGY_QUICKSELECT, STRATEGY_SORT
 
 class TestContracts:
     
@@ -209,4 +211,54 @@ class TestContracts:
         assert len(self.sample_contracts) == len(original_contracts)
         for i, contract in enumerate(self.sample_contracts):
             assert contract.id == original_contracts[i].id
-            assert contract.debt == original_contracts[i].debt
\ No newline at end of file
+            assert contract.debt == original_contracts[i].debt
+
+    def test_get_top_n_accepts_generator(self):
+        # Testa que geradores são aceitos e dão o mesmo resultado da lista.
+        expected = self.contracts_manager.get_top_N_open_contracts(
+            self.sample_contracts, [2, 5], 3
+        )
+        result = self.contracts_manager.get_top_N_open_contracts(
+            (contract for contract in self.sample_contracts), [2, 5], 3
+        )
+        assert result == expected
+
+    @pytest.mark.parametrize('strategy', [STRATEGY_QUICKSELECT, STRATEGY_SORT])
+    def test_get_top_n_generator_uses_requested_strategy(self, strategy):
+        # Testa que geradores com quickselect/sort usam a estratégia pedida
+        # (materializando a entrada) em vez do caminho em streaming.
+        stats = Stats()
+        contracts = Contracts(stats=stats)
+        result = contracts.get_top_N_open_contracts(iter(self.sample_contracts), [2, 5], 3, strategy)
+        assert stats.last.operation == 'top_n'
+        assert stats.last.info['strategy'] == strategy
+        assert result == self.contracts_manager.get_top_N_open_contracts(self.sample_contracts, [2, 5], 3)
+
+    def test_get_top_n_empty_generator(self):
+        # Testa com gerador vazio.
+        result = self.contracts_manager.get_top_N_open_contracts(iter([]), [], 3)
+        assert result == []
+
+    def test_stream_top_n_matches_list_with_ties(self):
+        # Testa que o streaming respeita a mesma ordem de empates da lista.
+        contracts = [Contract(i, (i * 7) % 5) for i in range(100)]
+        expected = self.contracts_manager.get_top_N_open_contracts(contracts, [3, 8], 30)
+        result = self.contracts_manager.stream_top_N_open_contracts(
+            iter(contracts), [3, 8], 30
+        )
+        assert result == expected
+
+    def test_stream_top_n_chunked(self):
+        # Testa a entrada em blocos (leitor em pedaços).
+        chunks = (self.sample_contracts[i:i + 4] for i in range(0, 6, 4))
+        result = self.contracts_manager.stream_top_N_open_contracts(
+            chunks, [2, 5], 3, chunked=True
+        )
+        assert [contract.id for contract in result] == [4, 6, 3]
+
+    def test_stream_top_n_zero_top_n(self):
+        # Testa streaming com top_n = 0.
+        result = self.contracts_manager.stream_top_N_open_contracts(
+            iter(self.sample_contracts), [], 0
+        )
+        assert result == []
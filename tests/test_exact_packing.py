@@ -0,0 +1,124 @@
+# Testes unitários para o modo de otimização do empacotamento.
+
+import itertools
+import random
+import time
+from types import SimpleNamespace
+
+import pytest
+from src import exact_packing
+from src.exact_packing import lower_bound_l2, optimize_packing
+from src.orders import Orders
+from src.packing import pack
+
+
+def _check_groups(groups, requests, n_max):
+    # Todos os pedidos presentes e nenhum grupo acima do limite (exceto os
+    # pedidos que sozinhos já excedem o limite).
+    assert sorted(item for group in groups for item in group) == sorted(requests)
+    for group in groups:
+        assert sum(group) <= n_max or (len(group) >= 1 and max(group) > n_max)
+
+
+class TestExactPacking:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        self.orders_manager = Orders()
+
+    def test_improves_on_ffd(self):
+        # Testa um caso em que o FFD usa um grupo a mais que o ótimo.
+        requests = [42, 42, 30, 30, 28, 28]
+        assert len(pack(requests, 100, 'ffd')) == 3
+
+        solution = self.orders_manager.combine_orders_optimized(requests, 100)
+        _check_groups(solution.groups, requests, 100)
+        assert solution.initial_groups == 3
+        assert len(solution.groups) == 2
+        assert solution.optimal
+
+    @pytest.mark.parametrize('seed', range(10))
+    def test_random_instances_are_valid(self, seed):
+        # Testa instâncias aleatórias com orçamento de nós.
+        rng = random.Random(seed)
+        requests = [rng.randint(10, 70) for _ in range(30)]
+        solution = optimize_packing(requests, 100, time_budget=None, node_budget=20000)
+
+        _check_groups(solution.groups, requests, 100)
+        assert solution.lower_bound <= len(solution.groups) <= solution.initial_groups
+        assert solution.gap >= 0
+
+    def test_node_budget_stops_search(self):
+        # Testa que o orçamento de nós é respeitado.
+        rng = random.Random(1)
+        requests = [rng.randint(20, 60) for _ in range(60)]
+        solution = optimize_packing(requests, 100, time_budget=None, node_budget=500)
+        assert solution.nodes <= 501
+
+    def test_time_budget_bounds_branch_and_bound(self):
+        # Testa que o prazo é respeitado com alvos grandes, em que cada nó do
+        # branch-and-bound examina milhares de grupos.
+        rng = random.Random(1)
+        sizes = sorted((rng.randint(250, 500) for _ in range(6000)), reverse=True)
+        target = len(pack(sizes, 1000, 'ffd')) - 1
+        budget = exact_packing._Budget(0.05, None)
+        started = time.perf_counter()
+        assert exact_packing._branch_and_bound(sizes, 1000, target, budget) == (None, False)
+        assert time.perf_counter() - started < 0.05 + 0.05
+        assert 0 < budget.nodes < 1024
+
+    def test_budget_bounds_local_search(self):
+        # Testa que a busca local conta os itens realocados no orçamento de nós
+        # e consulta o relógio a cada item, sem esperar o fim de uma passada.
+        groups = [[50]] * 8
+        search = exact_packing._local_search
+        assert len(search(groups, [50] * 8, 100, exact_packing._Budget(None, None))) == 4
+
+        budget = exact_packing._Budget(None, 2)
+        assert len(search(groups, [50] * 8, 100, budget)) == 6
+        assert budget.exhausted and budget.nodes == 3
+
+        budget = exact_packing._Budget(0, None)
+        assert search(groups, [50] * 8, 100, budget) == groups
+        assert budget.exhausted and budget.nodes == 0
+
+    def test_local_search_checks_clock_per_item(self, monkeypatch):
+        # Testa que o prazo vence no meio da passada: o relógio falso avança
+        # um segundo por consulta e o prazo é o segundo 2.
+        clock = itertools.count()
+        monkeypatch.setattr(exact_packing, 'time', SimpleNamespace(perf_counter=lambda: next(clock)))
+        budget = exact_packing._Budget(None, None)
+        budget.deadline = 2
+        result = exact_packing._local_search([[25, 25]] * 8, [50] * 8, 100, budget)
+        assert len(result) == 7 and budget.exhausted
+
+    def test_oversize_and_non_positive_requests(self):
+        # Testa pedidos acima do limite e pedidos <= 0.
+        requests = [500, 60, 50, 40, 0, -10]
+        solution = self.orders_manager.combine_orders_optimized(requests, 100)
+
+        assert [500, 0, -10] in solution.groups
+        assert sorted(item for group in solution.groups for item in group) == sorted(requests)
+        assert solution.lower_bound == 3
+
+    def test_invalid_input(self):
+        # Testa entradas vazias e limite inválido.
+        assert self.orders_manager.combine_orders_optimized([], 100).groups == []
+        assert self.orders_manager.combine_orders_optimized([1, 2], 0).groups == []
+
+    def test_lower_bound_l2(self):
+        # Testa o limite L2 em casos conhecidos.
+        assert lower_bound_l2([], 100) == 0
+        assert lower_bound_l2([60, 60, 60], 100) == 3
+        assert lower_bound_l2([50, 50, 50, 50], 100) == 2
+        # L1 = 2, mas os três itens > 50 exigem três grupos
+        assert lower_bound_l2([51, 51, 51, 10], 100) == 3
+        assert lower_bound_l2([0.6, 0.6, 0.3], 1.0) == 2
+
+    def test_lower_bound_without_numpy(self, monkeypatch):
+        # Testa que o cálculo em Python puro coincide com o vetorizado.
+        rng = random.Random(4)
+        sizes = [rng.randint(1, 100) for _ in range(500)]
+        expected = lower_bound_l2(sizes, 100)
+        monkeypatch.setattr(exact_packing, 'np', None)
+        assert lower_bound_l2(sizes, 100) == expected
@@ -0,0 +1,136 @@
+# Testes unitários para a classe ExclusionFilter.
+
+from decimal import Decimal
+from fractions import Fraction
+
+import pytest
+from src import vectorized
+from src.contract import Contract
+from src.contract_batch import ContractBatch
+from src.contracts import Contracts
+from src.exclusion import MODE_BITMAP, MODE_SET, ExclusionFilter
+from src.selection import STRATEGY_AUTO, STRATEGY_SORT
+
+
+class TestExclusionFilter:
+
+    def test_dense_ints_use_bitmap(self):
+        # Testa que IDs inteiros densos usam bitmap.
+        exclusion = ExclusionFilter(range(1000, 2000, 2))
+        assert exclusion.mode == MODE_BITMAP
+        assert len(exclusion) == 500
+        assert 1002 in exclusion
+        assert 1003 not in exclusion
+        assert 5 not in exclusion
+        assert 'ABC' not in exclusion
+
+    def test_sparse_or_mixed_ids_use_set(self):
+        # Testa que IDs esparsos ou não inteiros usam set.
+        assert ExclusionFilter([1, 10 ** 12]).mode == MODE_SET
+        assert ExclusionFilter([1, 'ABC']).mode == MODE_SET
+        assert ExclusionFilter().mode == MODE_SET
+
+    def test_forced_modes(self):
+        # Testa a escolha explícita do modo.
+        assert ExclusionFilter([1, 2], mode=MODE_SET).mode == MODE_SET
+        with pytest.raises(ValueError):
+            ExclusionFilter(['ABC'], mode=MODE_BITMAP)
+        with pytest.raises(ValueError):
+            ExclusionFilter([1], mode='bogus')
+
+    def test_add_and_discard_in_bitmap(self):
+        # Testa inclusão e remoção incrementais, inclusive ampliando o bitmap.
+        exclusion = ExclusionFilter([100, 101, 102])
+        version = exclusion.version
+
+        exclusion.add(90)
+        exclusion.add(130)
+        exclusion.discard(101)
+        exclusion.discard(999)
+
+        assert exclusion.mode == MODE_BITMAP
+        assert sorted(exclusion) == [90, 100, 102, 130]
+        assert len(exclusion) == 4
+        assert exclusion.version == version + 3
+
+    def test_incompatible_add_switches_to_set(self):
+        # Testa a troca automática para set.
+        exclusion = ExclusionFilter([1, 2, 3])
+        exclusion.add('XYZ')
+        exclusion.add(10 ** 15)
+
+        assert exclusion.mode == MODE_SET
+        assert sorted(exclusion, key=str) == sorted([1, 2, 3, 'XYZ', 10 ** 15], key=str)
+
+    def test_bitmap_is_smaller_than_set(self):
+        # Testa que o bitmap ocupa menos memória que o set.
+        ids = range(100000)
+        bitmap = ExclusionFilter(ids)
+        as_set = ExclusionFilter(ids, mode=MODE_SET)
+        assert bitmap.memory_usage() * 10 < as_set.memory_usage()
+
+    @pytest.mark.parametrize('ids', [[2, 5], [2, 5, 'ABC', 10 ** 15]])
+    def test_contracts_accept_filter(self, ids):
+        # Testa que Contracts aceita o filtro pré-construído.
+        contracts = [
+            Contract(1, 1000),
+            Contract(2, 2500),
+            Contract(3, 1500),
+            Contract(4, 3000),
+            Contract(5, 800),
+            Contract(6, 2000)
+        ]
+        exclusion = ExclusionFilter(ids)
+        manager = Contracts()
+
+        for result in (
+            manager.get_top_N_open_contracts(contracts, exclusion, 3),
+            manager.stream_top_N_open_contracts(iter(contracts), exclusion, 3),
+            manager.get_top_N_open_contracts(ContractBatch.from_contracts(contracts), exclusion, 3),
+        ):
+            assert [contract.id for contract in result] == [4, 6, 3]
+
+    def test_vectorized_bitmap_mask(self):
+        # Testa o filtro em bitmap no caminho NumPy.
+        np = pytest.importorskip('numpy')
+        ids = np.arange(5000)
+        debts = np.arange(5000) % 17
+        exclusion = ExclusionFilter(range(0, 5000, 3))
+        assert exclusion.mode == MODE_BITMAP
+
+        result = vectorized.top_n_positions(ids, debts, exclusion, 200)
+        expected = vectorized.top_n_positions(ids, debts, set(range(0, 5000, 3)), 200)
+        assert result.tolist() == expected.tolist()
+
+    def test_mixed_type_keys_match_in_both_modes(self):
+        # Testa que a consulta e a remoção de chaves iguais a inteiros (float,
+        # bool, Decimal, Fraction) dão o mesmo resultado nos dois modos e no set.
+        ids = [0, 1, 2, 5, 9]
+        keys = [5.0, True, False, 3.0, 5.5, Decimal('9'), Decimal('9.5'), Fraction(10, 2),
+                float('nan'), float('inf'), '5', None, -1.0]
+        bitmap = ExclusionFilter(ids, mode=MODE_BITMAP)
+        by_set = ExclusionFilter(ids, mode=MODE_SET)
+        reference = set(ids)
+        for key in keys:
+            assert (key in bitmap) == (key in by_set) == (key in reference), key
+
+        for filter_ in (bitmap, by_set):
+            filter_.discard(5.0)
+            filter_.discard(True)
+            assert sorted(filter_) == [0, 2, 9]
+
+    @pytest.mark.parametrize('strategy', [STRATEGY_SORT, STRATEGY_AUTO])
+    def test_numpy_ids(self, strategy):
+        # Testa IDs NumPy na construção, na consulta e em um lote de colunas NumPy.
+        np = pytest.importorskip('numpy')
+        exclusion = ExclusionFilter(np.array([0, 1, 2]))
+        assert exclusion.mode == MODE_BITMAP
+        assert np.int64(1) in exclusion and np.int32(2) in exclusion
+        assert np.int64(3) not in exclusion and True in exclusion
+        exclusion.add(np.int64(7))
+        exclusion.discard(np.int64(0))
+        assert sorted(exclusion) == [1, 2, 7] and all(type(value) is int for value in exclusion)
+
+        batch = ContractBatch.from_arrays(np.arange(5000), np.full(5000, 10))
+        result = Contracts().get_top_N_open_contracts(batch, ExclusionFilter([0, 1, 2]), 3, strategy)
+        assert [contract.id for contract in result] == [3, 4, 5]
@@ -0,0 +1,195 @@
+# Testes unitários para a instrumentação (instrumentation.py) de Contracts e Orders.
+
+import io
+import os
+import random
+import subprocess
+import sys
+
+import pytest
+from src.contract import Contract
+from src.contract_batch import ContractBatch
+from src.contracts import Contracts
+from src.instrumentation import NULL_RECORDER, CallRecord, Stats, profile_call
+from src.orders import Orders
+
+
+def legacy_scan_probes(requests, n_max):
+    # Grupos examinados pela varredura linear original (FFD com sum(group)).
+    groups = []
+    probes = 0
+    for request in sorted(requests, reverse=True):
+        if request > n_max:
+            groups.append([request])
+            continue
+        for group in groups:
+            probes += 1
+            if sum(group) + request <= n_max:
+                group.append(request)
+                break
+        else:
+            groups.append([request])
+    return probes
+
+
+class TestOrdersStats:
+
+    def test_records_phases_and_counters(self):
+        # Testa fases, contadores e nós examinados de um FFD pequeno.
+        stats = Stats()
+        result = Orders(stats=stats).combine_orders([5, 3, 8, 2, 9, 1], 10)
+
+        assert result == Orders().combine_orders([5, 3, 8, 2, 9, 1], 10)
+        record = stats.last
+        assert record.operation == 'combine_orders'
+        assert set(record.phases) == {'count', 'sort', 'fit', 'build'}
+        assert record.info == {'strategy': 'ffd'}
+        # 6 testes na raiz + 3 descidas de 3 níveis (árvore com 8 folhas)
+        assert record.counters == {'items': 6, 'groups': 3, 'tree_probes': 15, 'scan_probes': 9}
+
+    def test_scan_probes_match_linear_scan(self):
+        # Testa scan_probes contra a contagem da varredura linear original.
+        rng = random.Random(3)
+        requests = [rng.randint(1, 600) for _ in range(500)] + [700, 900]
+        stats = Stats()
+        Orders(stats=stats).combine_orders(requests, 500)
+        assert stats.last.counters['scan_probes'] == legacy_scan_probes(requests, 500)
+        assert stats.last.counters['tree_probes'] < stats.last.counters['scan_probes']
+
+    def test_counting_path_and_other_strategies(self):
+        # Testa o caminho por contagem e estratégias sem contagem de nós.
+        stats = Stats(keep=None)
+        orders = Orders(stats=stats)
+        orders.combine_orders([5] * 40 + [3] * 40, 10)
+        orders.combine_orders([5, 3, 8, 2], 10, strategy='bfd')
+
+        counting, best_fit = stats.records
+        assert counting.info == {'strategy': 'ffd', 'path': 'counting'}
+        assert counting.counters == {'items': 80, 'size_classes': 2, 'groups': 34}
+        assert best_fit.counters == {'items': 4, 'groups': 2}
+        assert stats.calls == {'combine_orders': 2}
+        assert stats.counters['combine_orders']['items'] == 84
+
+    def test_records_and_split(self):
+        # Testa pedidos identificados e divisão de pedidos acima do limite.
+        stats = Stats()
+        orders = Orders(stats=stats)
+        orders.combine_orders([('a', 25), ('b', 4)], 10, split_oversize=True)
+        assert {'records', 'split', 'sort', 'fit', 'build'} <= set(stats.last.phases)
+        assert stats.last.counters['chunks'] == 2
+
+        orders.combine_orders_from_arrays(['x', 'y'], [4, 7], 10)
+        assert stats.last.counters['groups'] == 2
+
+
+class TestContractsStats:
+
+    def setup_method(self):
+        self.contracts = [Contract(i, (i * 37) % 101) for i in range(200)]
+
+    def test_records_phases_and_counters(self):
+        # Testa fases e contadores de uma consulta top N.
+        stats = Stats()
+        result = Contracts(stats=stats).get_top_N_open_contracts(self.contracts, [1, 2, 3, 999], 5)
+
+        assert result == Contracts().get_top_N_open_contracts(self.contracts, [1, 2, 3, 999], 5)
+        record = stats.last
+        assert record.operation == 'top_n'
+        assert set(record.phases) == {'exclusion', 'filter', 'select'}
+        assert record.counters == {'contracts': 200, 'excluded': 3, 'candidates': 197, 'selected': 5}
+        assert record.info == {'strategy': 'quickselect'}
+
+    def test_batch_and_cache(self):
+        # Testa o caminho colunar e os contadores do cache.
+        stats = Stats(keep=None)
+        contracts = Contracts(cache_size=4, stats=stats)
+        batch = ContractBatch.from_contracts(self.contracts[:50])
+        renegotiated = []
+        contracts.get_top_N_open_contracts(batch, renegotiated, 3, strategy='sort')
+        contracts.get_top_N_open_contracts(batch, renegotiated, 3, strategy='sort')
+
+        first, second = stats.records
+        assert {'cache', 'exclusion', 'filter', 'select', 'materialize'} <= set(first.phases)
+        assert first.counters['cache_misses'] == 1
+        assert first.info == {'strategy': 'sort'}
+        assert second.counters == {'cache_hits': 1}
+
+    def test_stream(self):
+        # Testa a consulta em streaming.
+        stats = Stats()
+        Contracts(stats=stats).get_top_N_open_contracts(iter(self.contracts), [], 3)
+        assert stats.last.operation == 'top_n_stream'
+        assert set(stats.last.phases) == {'exclusion', 'select'}
+
+
+class TestStats:
+
+    def test_callback_keep_and_summary(self):
+        # Testa o callback, o limite de registros guardados e os totais.
+        seen = []
+        stats = Stats(callback=seen.append, keep=2)
+        orders = Orders(stats=stats)
+        for _ in range(3):
+            orders.combine_orders([4, 5, 6], 10)
+
+        assert len(seen) == 3 and all(isinstance(record, CallRecord) for record in seen)
+        assert stats.records == seen[1:]
+        summary = stats.summary()['combine_orders']
+        assert summary['calls'] == 3
+        assert summary['counters']['items'] == 9
+        assert set(summary['phases']) == {'count', 'sort', 'fit', 'build'}
+        assert 'combine_orders: 3 chamada(s)' in stats.report()
+
+        stats.reset()
+        assert stats.calls == {} and stats.last is None
+
+    def test_trace_allocations(self):
+        # Testa o pico de memória por chamada.
+        stats = Stats(trace_allocations=True)
+        Orders(stats=stats).combine_orders(list(range(1, 5000)), 10000)
+        assert stats.last.peak_bytes > 0
+        assert stats.summary()['combine_orders']['peak_bytes'] == stats.last.peak_bytes
+
+    def test_failed_call_is_not_recorded(self):
+        # Testa que chamadas com exceção não entram nos totais.
+        stats = Stats()
+        with pytest.raises(ValueError):
+            Orders(stats=stats).combine_orders([1, 2], 10, strategy='desconhecida')
+        assert stats.calls == {}
+
+    def test_null_recorder(self):
+        # Testa que o recorder desligado aceita as mesmas chamadas sem efeito.
+        with NULL_RECORDER.phase('x'):
+            NULL_RECORDER.count('y', 3)
+            NULL_RECORDER.note('z', 'w')
+        assert not NULL_RECORDER.enabled
+
+    def test_profiler_modules_are_imported_on_demand(self):
+        # Testa que importar os módulos de cálculo não carrega cProfile, pstats
+        # nem tracemalloc; só profile_call e trace_allocations os carregam.
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+        code = ('import sys; import src.orders, src.contracts; '
+                "print(sorted({'cProfile', 'pstats', 'tracemalloc'} & set(sys.modules)))")
+        completed = subprocess.run([sys.executable, '-c', code], cwd=root,
+                                   capture_output=True, text=True, check=True)
+        assert completed.stdout.strip() == '[]'
+
+
+class TestProfileCall:
+
+    def test_returns_value_and_report(self, tmp_path):
+        # Testa o valor retornado, o relatório em texto e os arquivos gravados.
+        orders = Orders()
+        report = profile_call(orders.combine_orders, [5, 3, 8, 2, 9, 1], 10)
+        assert report.value == orders.combine_orders([5, 3, 8, 2, 9, 1], 10)
+        assert 'first_fit' in report.text
+        assert 'Pico de memória' in report.text
+
+        path = str(tmp_path / 'perfil.txt')
+        profile_call(orders.combine_orders, [5, 3], 10, output=path)
+        assert 'Pico de memória' in (tmp_path / 'perfil.txt').read_text()
+        assert (tmp_path / 'perfil.txt.prof').exists()
+
+        stream = io.StringIO()
+        profile_call(orders.combine_orders, [5, 3], n_max=10, output=stream)
+        assert 'Pico de memória' in stream.getvalue()
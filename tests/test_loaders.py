@@ -0,0 +1,102 @@
+# Testes unitários para a carga em massa de contratos e pedidos (loaders.py).
+
+import io
+
+import pytest
+from src.contract_batch import ContractBatch
+from src.contracts import Contracts
+from src.loaders import (
+    LoadReport, detect_format, load_contracts, load_orders, read_contracts, read_orders
+)
+from src.orders import Orders
+
+
+def pairs(contracts):
+    return [(contract.id, contract.debt) for contract in contracts]
+
+
+class TestLoaders:
+
+    def test_csv_contracts(self, tmp_path):
+        # Testa a leitura de contratos de um CSV com cabeçalho.
+        path = tmp_path / 'contracts.csv'
+        path.write_text('id,debt,name\n1,1000,a\n2,2500.5,b\n3,1500,"c, d"\n')
+        assert pairs(read_contracts(path)) == [(1, 1000), (2, 2500.5), (3, 1500)]
+
+    def test_jsonl_contracts(self, tmp_path):
+        # Testa a leitura de contratos de um JSONL.
+        path = tmp_path / 'contracts.jsonl'
+        path.write_text('{"id": 1, "debt": 1000}\n\n{"id": 2, "debt": 2500}\n')
+        assert pairs(read_contracts(path)) == [(1, 1000), (2, 2500)]
+
+    @pytest.mark.parametrize('chunk_bytes', [7, 64, 1 << 20])
+    def test_chunk_boundaries(self, chunk_bytes):
+        # Testa que o resultado não depende do tamanho dos blocos.
+        text = 'id,debt\n' + ''.join('{},{}\n'.format(i, i * 10) for i in range(200))
+        contracts = read_contracts(io.StringIO(text), format='csv', chunk_bytes=chunk_bytes)
+        assert pairs(contracts) == [(i, i * 10) for i in range(200)]
+
+    def test_malformed_csv_rows_are_reported(self):
+        # Testa que linhas malformadas são contadas e não interrompem a carga.
+        text = 'id,debt\n1,100\nx,200\n3\n4,abc\n5,nan\n6,600\n'
+        report = LoadReport()
+        contracts = list(read_contracts(io.BytesIO(text.encode()), format='csv', report=report))
+        assert pairs(contracts) == [(1, 100), (6, 600)]
+        assert report.rows == 2 and report.malformed == 4 and not report.ok
+        assert [line for line, _ in report.errors] == [3, 4, 5, 6]
+
+    def test_rows_with_compensating_field_counts(self):
+        # Testa que uma linha com campo a mais e outra com campo a menos não
+        # passam pelo caminho rápido (o total de campos bate, as colunas não).
+        report = LoadReport()
+        contracts = list(read_contracts(io.BytesIO(b'id,debt\n1,100,5\n7\n3,4\n'), format='csv',
+                                        report=report))
+        assert pairs(contracts) == [(1, 100), (3, 4)]
+        assert report.malformed == 1 and [line for line, _ in report.errors] == [3]
+
+    def test_malformed_jsonl_rows_are_reported(self):
+        # Testa que objetos inválidos ou incompletos são contados.
+        text = '{"id": 1, "debt": 10}\n{"id": 2}\nnot json\n[1, 2]\n{"id": "3", "debt": 5}\n{"id": 4, "debt": 40}\n'
+        report = LoadReport()
+        contracts = list(read_contracts(io.StringIO(text), format='jsonl', report=report))
+        assert pairs(contracts) == [(1, 10), (4, 40)]
+        assert report.malformed == 4
+        assert [line for line, _ in report.errors] == [2, 3, 4, 5]
+
+    def test_batches_feed_contracts(self, tmp_path):
+        # Testa que os lotes colunares vão direto para Contracts.
+        path = tmp_path / 'contracts.csv'
+        path.write_text('id,debt\n' + ''.join('{},{}\n'.format(i, (i * 37) % 101) for i in range(500)))
+        batches = list(read_contracts(path, batches=True, chunk_bytes=256))
+        assert len(batches) > 1 and all(isinstance(batch, ContractBatch) for batch in batches)
+
+        batch, report = load_contracts(path)
+        assert report.rows == len(batch) == 500
+        top = Contracts().get_top_N_open_contracts(batch, [1, 2], 3)
+        expected = Contracts().get_top_N_open_contracts(list(read_contracts(path)), [1, 2], 3)
+        assert pairs(top) == pairs(expected)
+
+    def test_orders_and_string_ids(self, tmp_path):
+        # Testa a leitura de pedidos com IDs textuais e o empacotamento das colunas.
+        path = tmp_path / 'orders.csv'
+        path.write_text('order,qty\nA,300\nB,100\nC,250\n')
+        orders = list(read_orders(path, id_field='order', size_field='qty', id_type=str))
+        assert [(order.id, order.size) for order in orders] == [('A', 300), ('B', 100), ('C', 250)]
+
+        columns, _ = load_orders(path, id_field='order', size_field='qty', id_type=str)
+        result = Orders().combine_orders_from_arrays(columns.ids, columns.sizes, 400)
+        assert result == Orders().combine_orders(orders, 400) == [['A', 'B'], ['C']]
+
+    def test_headerless_csv_uses_positions(self):
+        # Testa CSV sem cabeçalho, com colunas por posição.
+        contracts = read_contracts(io.StringIO('9,x,90\n8,y,80\n'), format='csv',
+                                   header=False, id_field=0, debt_field=2)
+        assert pairs(contracts) == [(9, 90), (8, 80)]
+
+    def test_missing_column_and_unknown_format(self, tmp_path):
+        # Testa erros de configuração (fatais, ao contrário de linhas malformadas).
+        with pytest.raises(ValueError):
+            list(read_contracts(io.StringIO('a,b\n1,2\n'), format='csv'))
+        with pytest.raises(ValueError):
+            detect_format(tmp_path / 'contracts.txt')
+        assert detect_format('x.NDJSON') == 'jsonl'
@@ -0,0 +1,181 @@
+# Testes unitários para a linha de comando (main.py).
+
+import io
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+from src.main import EXIT_MALFORMED, EXIT_OK, EXIT_UNREADABLE, PACKING_STRATEGIES, main
+from src.packing import available_strategies
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src', 'main.py')
+
+
+@pytest.fixture
+def contracts_csv(tmp_path):
+    path = tmp_path / 'contratos.csv'
+    path.write_text('id,debt\n1,1000\n2,2500\n3,1500\n4,3000\n5,800\n6,2000\n')
+    return str(path)
+
+
+@pytest.fixture
+def orders_jsonl(tmp_path):
+    path = tmp_path / 'pedidos.jsonl'
+    path.write_text(''.join(json.dumps({'id': order_id, 'size': size}) + '\n' for order_id, size in
+                            [('a', 100), ('b', 200), ('c', 150), ('d', 300), ('e', 50), ('f', 250)]))
+    return str(path)
+
+
+class TestTopContracts:
+
+    def test_csv_output(self, contracts_csv, capsys):
+        # Testa os top N em CSV, excluindo renegociados.
+        code = main(['top-contracts', contracts_csv, '-n', '3', '--renegotiated-ids', '2,5'])
+        assert code == EXIT_OK
+        assert capsys.readouterr().out == 'rank,id,debt\n1,4,3000\n2,6,2000\n3,3,1500\n'
+
+    def test_renegotiated_file_and_jsonl_output(self, contracts_csv, tmp_path, capsys):
+        # Testa o arquivo de renegociados e a saída JSONL em arquivo.
+        renegotiated = tmp_path / 'reneg.txt'
+        renegotiated.write_text('4\n6\n')
+        output = tmp_path / 'top.jsonl'
+        main(['top-contracts', contracts_csv, '-n', '2', '--renegotiated', str(renegotiated),
+              '--output-format', 'jsonl', '-o', str(output)])
+        assert [json.loads(line) for line in output.read_text().splitlines()] == [
+            {'rank': 1, 'id': 2, 'debt': 2500}, {'rank': 2, 'id': 3, 'debt': 1500}]
+        assert capsys.readouterr().out == ''
+
+    def test_stdin_and_malformed_rows(self, monkeypatch, capsys):
+        # Testa a leitura da entrada padrão e o aviso/código de linhas malformadas.
+        monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(b'id,debt\n1,10\n2,x\n3,30\n')))
+        code = main(['top-contracts', '-n', '5', '--strict'])
+        captured = capsys.readouterr()
+        assert code == EXIT_MALFORMED
+        assert captured.out == 'rank,id,debt\n1,3,30\n2,1,10\n'
+        assert '-:3:' in captured.err and '1 linha(s) malformada(s)' in captured.err
+
+    def test_multiple_inputs_with_workers(self, contracts_csv, tmp_path, capsys):
+        # Testa várias entradas (coluna source) no modo em lote.
+        other = tmp_path / 'outros.csv'
+        other.write_text('id,debt\n7,5\n8,9\n')
+        main(['top-contracts', contracts_csv, str(other), '-n', '1', '--workers', '2'])
+        assert capsys.readouterr().out.splitlines() == [
+            'source,rank,id,debt', '{},1,4,3000'.format(contracts_csv), '{},1,8,9'.format(other)]
+
+    def test_each_input_written_before_the_next_is_read(self, contracts_csv, tmp_path,
+                                                          monkeypatch, capsys):
+        # Testa que, em série, o resultado de uma entrada é escrito antes da
+        # leitura da seguinte.
+        from src import loaders
+        other = tmp_path / 'outros.csv'
+        other.write_text('id,debt\n7,5\n')
+        written = []
+        load_contracts = loaders.load_contracts
+
+        def load(source, **options):
+            written.append(capsys.readouterr().out)
+            return load_contracts(source, **options)
+
+        monkeypatch.setattr(loaders, 'load_contracts', load)
+        main(['top-contracts', contracts_csv, str(other), '-n', '1'])
+        assert written[0] == 'source,rank,id,debt\n'
+        assert '{},1,4,3000'.format(contracts_csv) in written[1]
+
+    def test_unreadable_inputs(self, contracts_csv, tmp_path, capsys):
+        # Testa que entradas inexistentes são avisadas na saída de erro, sem
+        # traceback, e que as demais entradas são processadas.
+        missing = str(tmp_path / 'nao_existe.csv')
+        code = main(['top-contracts', missing, contracts_csv, '-n', '1'])
+        captured = capsys.readouterr()
+        assert code == EXIT_UNREADABLE
+        assert captured.err.startswith(missing + ':') and 'Traceback' not in captured.err
+        assert captured.out.splitlines() == ['source,rank,id,debt', '{},1,4,3000'.format(contracts_csv)]
+
+        code = main(['top-contracts', contracts_csv, '-n', '1', '--renegotiated', missing])
+        assert code == EXIT_UNREADABLE
+        assert 'nao_existe.csv' in capsys.readouterr().err
+
+    def test_invalid_renegotiated_ids(self, contracts_csv, tmp_path, capsys):
+        # Testa IDs renegociados que não são do tipo --id-type, na opção e no
+        # arquivo: aviso na saída de erro, sem traceback.
+        code = main(['top-contracts', contracts_csv, '-n', '1', '--renegotiated-ids', 'abc'])
+        err = capsys.readouterr().err
+        assert code == EXIT_UNREADABLE
+        assert err.startswith('main.py: ') and "'abc'" in err and 'Traceback' not in err
+
+        renegotiated = tmp_path / 'reneg.txt'
+        renegotiated.write_text('4\n6x\n')
+        code = main(['top-contracts', contracts_csv, '-n', '1', '--renegotiated', str(renegotiated)])
+        assert code == EXIT_UNREADABLE
+        assert "'6x'" in capsys.readouterr().err
+
+
+class TestCombineOrders:
+
+    def test_csv_output(self, orders_jsonl, capsys):
+        # Testa os grupos em CSV, uma linha por pedido.
+        code = main(['combine-orders', orders_jsonl, '--id-type', 'str', '--n-max', '400'])
+        assert code == EXIT_OK
+        assert capsys.readouterr().out.splitlines() == [
+            'group,id,load', '0,d,400', '0,a,400', '1,f,400', '1,c,400', '2,b,250', '2,e,250']
+
+    def test_jsonl_output_with_split(self, orders_jsonl, capsys):
+        # Testa a saída JSONL por grupo e a divisão de pedidos acima do limite.
+        main(['combine-orders', orders_jsonl, '--id-type', 'str', '--n-max', '250',
+              '--split-oversize', '--output-format', 'jsonl', '--strategy', 'bfd'])
+        groups = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+        assert all(group['load'] <= 250 for group in groups)
+        assert sorted(item for group in groups for item in group['items']).count('d') == 2
+
+    def test_unknown_strategy(self, orders_jsonl, capsys):
+        # Testa que uma estratégia desconhecida é um erro de uso, com as opções.
+        with pytest.raises(SystemExit) as exit_info:
+            main(['combine-orders', orders_jsonl, '--n-max', '400', '--strategy', 'zz'])
+        assert exit_info.value.code == 2
+        err = capsys.readouterr().err
+        assert "invalid choice: 'zz'" in err and 'ffd' in err
+
+    def test_multiple_inputs_with_workers(self, orders_jsonl, tmp_path, capsys):
+        # Testa várias entradas no modo em lote, com entrada de formato desconhecido.
+        unknown = tmp_path / 'pedidos.txt'
+        unknown.write_text('a 1\n')
+        code = main(['combine-orders', orders_jsonl, str(unknown), orders_jsonl, '--id-type', 'str',
+                     '--n-max', '400', '--workers', '2'])
+        captured = capsys.readouterr()
+        assert code == EXIT_UNREADABLE and str(unknown) in captured.err
+        lines = captured.out.splitlines()
+        assert lines[0] == 'source,group,id,load' and len(lines) == 13
+
+    def test_stats_and_profile(self, orders_jsonl, tmp_path, capsys):
+        # Testa o relatório de --stats e o arquivo de --profile.
+        profile = tmp_path / 'perfil.txt'
+        main(['combine-orders', orders_jsonl, '--id-type', 'str', '--n-max', '400',
+              '--stats', '--profile', str(profile)])
+        err = capsys.readouterr().err
+        assert 'combine_orders: 1 chamada(s)' in err
+        assert 'cli: 1 chamada(s)' in err and 'load' in err and 'write' in err
+        assert 'Pico de memória' in profile.read_text()
+
+
+class TestCommandLine:
+
+    def test_demo_without_arguments(self, capsys):
+        # Testa que, sem argumentos, a demonstração é executada.
+        assert main([]) == EXIT_OK
+        assert '=== Testes concluídos ===' in capsys.readouterr().out
+
+    def test_help_does_not_import_algorithms(self):
+        # Testa que --help não carrega os módulos de cálculo nem NumPy.
+        completed = subprocess.run([sys.executable, '-X', 'importtime', MAIN, '--help'],
+                                   capture_output=True, text=True, check=True)
+        imported = [line.rsplit('|', 1)[-1].strip() for line in completed.stderr.splitlines()]
+        assert 'orders' not in imported and 'contracts' not in imported and 'numpy' not in imported
+        assert 'packing' not in imported and 'instrumentation' not in imported
+        assert 'cProfile' not in imported and 'tracemalloc' not in imported
+        assert 'combine-orders' in completed.stdout
+
+    def test_strategy_choices_match_registry(self):
+        # Testa que as estratégias fixas do parser são as do registro.
+        assert list(PACKING_STRATEGIES) == available_strategies()
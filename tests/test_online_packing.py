@@ -0,0 +1,90 @@
+# Testes unitários para o agrupamento online de pedidos.
+
+import random
+
+import pytest
+from src.online_packing import OnlineOrderGrouper, group_orders_online
+from src.orders import Orders
+
+
+class FakeClock:
+    # Relógio controlado pelos testes.
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestOnlinePacking:
+
+    def test_full_group_is_emitted_immediately(self):
+        # Testa que um grupo cheio é emitido assim que completa o limite.
+        grouper = OnlineOrderGrouper(100)
+        assert grouper.add(60) == []
+        assert grouper.add(40) == [[60, 40]]
+        assert grouper.open_groups == []
+
+    def test_best_fit_among_open_groups(self):
+        # Testa que o pedido vai para o grupo aberto mais cheio onde cabe.
+        grouper = OnlineOrderGrouper(100)
+        grouper.extend([50, 70, 60])
+        grouper.add(25)
+        assert grouper.open_groups == [[50], [70, 25], [60]]
+
+    def test_max_open_groups_closes_fullest(self):
+        # Testa que, sem espaço, o grupo mais cheio é fechado.
+        grouper = OnlineOrderGrouper(100, max_open_groups=2)
+        grouper.extend([50, 70])
+        assert grouper.add(60) == [[70]]
+        assert grouper.open_groups == [[50], [60]]
+
+    def test_max_group_items(self):
+        # Testa o fechamento por quantidade de itens.
+        grouper = OnlineOrderGrouper(100, max_group_items=2)
+        assert grouper.extend([10, 10, 10]) == [[10, 10]]
+
+    def test_max_group_age(self):
+        # Testa o fechamento por tempo.
+        clock = FakeClock()
+        grouper = OnlineOrderGrouper(100, max_group_age=5, clock=clock)
+        grouper.add(10)
+        clock.now = 3
+        grouper.add(80)
+        clock.now = 5
+        assert grouper.poll() == [[10, 80]]
+        assert grouper.open_groups == []
+
+    def test_oversize_emitted_alone(self):
+        # Testa que pedidos acima do limite saem em grupo próprio.
+        grouper = OnlineOrderGrouper(100)
+        grouper.add(30)
+        assert grouper.add(150) == [[150]]
+        assert grouper.flush() == [[30]]
+
+    def test_invalid_parameters(self):
+        # Testa parâmetros inválidos.
+        with pytest.raises(ValueError):
+            OnlineOrderGrouper(0)
+        with pytest.raises(ValueError):
+            OnlineOrderGrouper(100, max_open_groups=0)
+
+    @pytest.mark.parametrize('chunked', [False, True])
+    def test_stream_keeps_all_requests(self, chunked):
+        # Testa que o gerador produz todos os pedidos, sem exceder o limite.
+        rng = random.Random(2)
+        requests = [rng.randint(1, 120) for _ in range(1000)]
+        source = [requests[i:i + 37] for i in range(0, 1000, 37)] if chunked else iter(requests)
+
+        groups = list(group_orders_online(source, 100, chunked=chunked, max_open_groups=4))
+
+        assert sorted(item for group in groups for item in group) == sorted(requests)
+        assert all(sum(group) <= 100 or len(group) == 1 for group in groups)
+
+    def test_orders_stream(self):
+        # Testa a API de streaming em Orders.
+        orders = Orders()
+        groups = list(orders.combine_orders_stream(iter([100, 200, 150, 300, 50, 250]), 400))
+        assert sorted(item for group in groups for item in group) == [50, 100, 150, 200, 250, 300]
+        assert list(orders.combine_orders_stream([1, 2], 0)) == []
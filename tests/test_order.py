@@ -0,0 +1,75 @@
+# Testes unitários para a classe Order e pedidos identificados em Orders.
+
+import random
+
+import pytest
+from src.order import Order
+from src.orders import Orders
+
+
+class TestOrder:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        self.orders_manager = Orders()
+
+    def test_init_and_representations(self):
+        # Testa inicialização e representações do pedido.
+        order = Order('A1', 150)
+        assert order.id == 'A1'
+        assert order.size == 150
+        assert str(order) == 'id=A1, size=150'
+        assert repr(order) == 'Order(id=A1, size=150)'
+
+    def test_order_has_no_dict(self):
+        # Testa que Order usa __slots__.
+        assert not hasattr(Order(1, 10), '__dict__')
+
+    def test_combine_orders_with_records(self):
+        # Testa agrupamento de objetos Order, retornando IDs e cargas.
+        orders = [Order('a', 100), Order('b', 200), Order('c', 150),
+                  Order('d', 300), Order('e', 50), Order('f', 250)]
+        result = self.orders_manager.combine_orders(orders, 400)
+
+        assert result == [['d', 'a'], ['f', 'c'], ['b', 'e']]
+        assert list(result.loads) == [400, 400, 250]
+        sizes = {order.id: order.size for order in orders}
+        assert list(result.loads) == [sum(sizes[i] for i in group) for group in result]
+
+    def test_combine_orders_with_pairs(self):
+        # Testa agrupamento de pares (id, tamanho).
+        pairs = [(1, 100), (2, 200), (3, 150), (4, 300), (5, 50), (6, 250)]
+        result = self.orders_manager.combine_orders(pairs, 400)
+        records = self.orders_manager.combine_orders([Order(*pair) for pair in pairs], 400)
+        assert result == records
+
+    def test_duplicate_sizes_keep_input_order(self):
+        # Testa que pedidos com o mesmo tamanho são distinguidos pelo ID.
+        pairs = [('x', 100), ('y', 100), ('z', 100)]
+        result = self.orders_manager.combine_orders(pairs, 200)
+        assert result == [['x', 'y'], ['z']]
+        assert list(result.loads) == [200, 100]
+
+    @pytest.mark.parametrize('strategy', ['ffd', 'ff', 'bfd', 'wf', 'nf'])
+    def test_records_match_plain_sizes(self, strategy):
+        # Testa que os tamanhos agrupados são os mesmos do modo com números.
+        rng = random.Random(9)
+        sizes = [rng.randint(1, 500) for _ in range(300)]
+        pairs = list(enumerate(sizes))
+
+        plain = self.orders_manager.combine_orders(sizes, 400, strategy=strategy)
+        records = self.orders_manager.combine_orders(pairs, 400, strategy=strategy)
+
+        assert [[sizes[i] for i in group] for group in records] == plain
+
+    def test_oversize_record(self):
+        # Testa pedido identificado acima do limite.
+        result = self.orders_manager.combine_orders([('big', 500), ('small', 100)], 400)
+        assert result == [['big'], ['small']]
+        assert list(result.loads) == [500, 100]
+
+    def test_records_from_generator(self):
+        # Testa pedidos identificados vindos de um gerador.
+        result = self.orders_manager.combine_orders((pair for pair in [(1, 10), (2, 20)]), 30)
+        assert result == [[2, 1]]
+        assert self.orders_manager.combine_orders(iter([]), 30) == []
@@ -0,0 +1,310 @@
+# Testes unitários para o núcleo de empacotamento (packing.py).
+
+import random
+
+import pytest
+from src import packing
+from src.instrumentation import Stats
+from src.orders import Orders
+from src.packing import (
+    LoadTree, available_strategies, first_fit, first_fit_decreasing,
+    first_fit_decreasing_counts, pack, register_strategy, size_counts
+)
+
+
+def legacy_combine_orders(requests, n_max):
+    # Implementação original de Orders.combine_orders, usada como referência.
+    requests_sorted = sorted(requests, reverse=True)
+    groups = []
+    for request in requests_sorted:
+        if request > n_max:
+            groups.append([request])
+            continue
+        added = False
+        for group in groups:
+            if sum(group) + request <= n_max:
+                group.append(request)
+                added = True
+                break
+        if not added:
+            groups.append([request])
+    return groups
+
+
+class TestPacking:
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_ffd_matches_legacy_integers(self, seed):
+        # Testa que os grupos são idênticos aos da implementação original.
+        rng = random.Random(seed)
+        requests = [rng.randint(1, 120) for _ in range(rng.randint(1, 300))]
+        n_max = rng.choice([100, 150, 400])
+        assert first_fit_decreasing(requests, n_max) == legacy_combine_orders(requests, n_max)
+
+    @pytest.mark.parametrize('seed', range(20))
+    def test_ffd_matches_legacy_floats_and_negatives(self, seed):
+        # Testa igualdade com floats, zeros, negativos e pedidos acima do limite.
+        rng = random.Random(1000 + seed)
+        requests = [
+            rng.choice([round(rng.uniform(-50, 500), 2), 0, rng.randint(-100, 450)])
+            for _ in range(rng.randint(1, 200))
+        ]
+        assert first_fit_decreasing(requests, 400.5) == legacy_combine_orders(requests, 400.5)
+
+    def test_orders_uses_engine(self):
+        # Testa que Orders produz os mesmos grupos da implementação original.
+        requests = [100, 200, 150, 300, 50, 250]
+        assert Orders().combine_orders(requests, 400) == legacy_combine_orders(requests, 400)
+
+    def test_first_fit_returns_assignment_and_loads(self):
+        # Testa o formato (assignment, loads) do núcleo.
+        assignment, loads = first_fit([300, 250, 200, 150, 100, 50], 400)
+        assert assignment == [0, 1, 2, 1, 0, 2]
+        assert loads == [400, 400, 250]
+
+    def test_load_tree_first_fit(self):
+        # Testa a busca do primeiro grupo com espaço na árvore.
+        tree = LoadTree(5)
+        for group, load in enumerate([90, 40, 70, 10, 95]):
+            tree.set_load(group, load)
+
+        assert tree.first_fit(5, 100) == 0
+        assert tree.first_fit(50, 100) == 1
+        assert tree.first_fit(61, 100) == 3
+        assert tree.first_fit(91, 100) == -1
+
+    def test_load_tree_reset(self):
+        # Testa o reaproveitamento da árvore.
+        tree = LoadTree(2)
+        tree.set_load(0, 100)
+        tree.reset(8)
+        assert tree.size == 8
+        assert tree.first_fit(100, 100) == -1
+        tree.reset(4)
+        assert tree.size == 8
+        assert tree.tree[1] == float('inf')
+
+
+class TestPackingStrategies:
+
+    @pytest.mark.parametrize('strategy', available_strategies())
+    @pytest.mark.parametrize('seed', range(5))
+    def test_strategies_are_valid_packings(self, strategy, seed):
+        # Testa que toda estratégia inclui todos os pedidos sem exceder o limite.
+        rng = random.Random(seed)
+        requests = [rng.randint(1, 500) for _ in range(300)]
+        groups = pack(requests, 400, strategy)
+
+        assert sorted(item for group in groups for item in group) == sorted(requests)
+        for group in groups:
+            assert sum(group) <= 400 or len(group) == 1
+
+    def test_best_fit_picks_fullest_group(self):
+        # Testa que Best Fit escolhe o grupo mais cheio onde o item cabe.
+        assert pack([50, 70, 60, 30], 100, 'bf') == [[50], [70, 30], [60]]
+
+    @pytest.mark.parametrize('seed', range(4))
+    def test_best_fit_blocks_match_linear_reference(self, seed, monkeypatch):
+        # Testa a lista em blocos (com blocos mínimos, para forçar divisões e
+        # remoções de blocos) contra Best Fit por varredura de todos os grupos.
+        monkeypatch.setattr(packing, '_BEST_FIT_BLOCK', 1)
+        rng = random.Random(seed)
+        sizes = [rng.choice([rng.randint(1, 60), rng.randint(50, 100), rng.random() * 40, 150])
+                 for _ in range(400)]
+
+        loads = []
+        expected = []
+        for size in sizes:
+            fitting = [group for group, load in enumerate(loads) if size <= 100 and load + size <= 100]
+            if fitting:
+                group = max(fitting, key=lambda group: (loads[group], -group))
+                loads[group] += size
+            else:
+                group = len(loads)
+                loads.append(size)
+            expected.append(group)
+
+        assert packing.best_fit(sizes, 100) == (expected, loads)
+
+    def test_worst_fit_picks_emptiest_group(self):
+        # Testa que Worst Fit escolhe o grupo menos cheio.
+        assert pack([50, 70, 60, 30, 20], 100, 'wf') == [[50, 30], [70], [60, 20]]
+
+    def test_next_fit_only_uses_current_group(self):
+        # Testa que Next Fit não volta a grupos anteriores.
+        assert pack([60, 50, 30, 40, 500, 10], 100, 'nf') == [[60], [50, 30], [40, 10], [500]]
+
+    def test_bfd_uses_no_more_groups_than_ffd(self):
+        # Testa um caso em que BFD e FFD chegam ao mesmo número de grupos.
+        requests = [40, 40, 35, 30, 25, 20, 10]
+        assert len(pack(requests, 100, 'bfd')) == len(pack(requests, 100, 'ffd')) == 2
+
+    def test_unknown_strategy(self):
+        # Testa que uma estratégia desconhecida gera erro.
+        with pytest.raises(ValueError):
+            pack([1, 2], 10, 'bogus')
+        with pytest.raises(ValueError):
+            Orders().combine_orders([1, 2], 10, strategy='bogus')
+
+    def test_register_custom_strategy(self):
+        # Testa o registro de uma nova estratégia.
+        def one_per_group(sizes, n_max):
+            return list(range(len(sizes))), list(sizes)
+
+        register_strategy('one', one_per_group)
+        try:
+            assert Orders().combine_orders([3, 1, 2], 10, strategy='one') == [[3], [1], [2]]
+        finally:
+            packing._STRATEGIES.pop('one')
+
+
+class TestPackingResult:
+
+    def test_result_carries_group_data(self):
+        # Testa cargas, folga, ocupação e marcação de grupos acima do limite.
+        result = Orders().combine_orders([500, 100, 200, 600, 150], 400)
+        assert result == [[600], [500], [200, 150], [100]]
+        assert list(result.loads) == [600, 500, 350, 100]
+        assert list(result.free) == [-200, -100, 50, 300]
+        assert list(result.fill_ratios) == [1.5, 1.25, 0.875, 0.25]
+        assert list(result.oversize) == [1, 1, 0, 0]
+        assert result.total_load == 1550
+
+    @pytest.mark.parametrize('strategy', available_strategies())
+    def test_loads_match_group_sums(self, strategy):
+        # Testa que as cargas calculadas no empacotamento batem com sum(group).
+        rng = random.Random(5)
+        requests = [rng.uniform(1, 500) for _ in range(500)]
+        result = pack(requests, 400, strategy)
+        assert list(result.loads) == [sum(group) for group in result]
+
+    def test_summary(self):
+        # Testa o resumo de um grupo.
+        result = pack([300, 100, 250], 400)
+        assert result.summary(1) == packing.GroupSummary([250], 250, 150, 0.625, False)
+        assert [summary.load for summary in result.summaries()] == [400, 250]
+
+    def test_behaves_like_list_of_lists(self):
+        # Testa a compatibilidade com a lista de listas original.
+        result = pack([300, 100, 250], 400)
+        assert isinstance(result, list)
+        assert [list(group) for group in result] == [[300, 100], [250]]
+        assert result[0] == [300, 100] and len(result) == 2
+        assert Orders().combine_orders([], 10) == []
+
+    def test_multi_dimensional_summary(self):
+        # Testa folga e ocupação por dimensão no empacotamento multidimensional.
+        result = Orders().combine_orders_multi([(6, 1), (3, 8)], (10, 10))
+        assert list(result.free) == [(1, 1)]
+        assert list(result.fill_ratios) == [0.9]
+        assert list(result.oversize) == [0]
+
+
+class TestCountingPacking:
+
+    @pytest.mark.parametrize('seed', range(5))
+    @pytest.mark.parametrize('distinct', [1, 7, 60])
+    def test_matches_ffd(self, seed, distinct):
+        # Testa que o caminho por contagem produz exatamente os grupos do FFD.
+        rng = random.Random(seed)
+        requests = [rng.randint(1, distinct) * 37 for _ in range(2000)]
+        requests += [rng.choice([1500, 2000]) for _ in range(20)]
+        for n_max in (1000, 999.5, 37, 40):
+            counts = size_counts(requests, n_max)
+            assert counts is not None
+            result = first_fit_decreasing_counts(counts, n_max)
+            assert result == legacy_combine_orders(requests, n_max)
+            assert list(result.loads) == [sum(group) for group in result]
+
+    def test_pack_uses_counting_path(self, monkeypatch):
+        # Testa que pack usa o caminho por contagem em entradas repetitivas.
+        calls = []
+        original = packing.first_fit_decreasing_counts
+        monkeypatch.setattr(packing, 'first_fit_decreasing_counts',
+                            lambda *args: calls.append(1) or original(*args))
+        assert pack([5, 3, 5, 3, 5, 3, 5, 3], 10) == [[5, 5], [5, 5], [3, 3, 3], [3]]
+        assert calls
+
+    def test_non_integer_or_unique_inputs_are_not_counted(self):
+        # Testa que floats, valores não positivos e entradas sem repetição ficam no caminho geral.
+        assert size_counts([1.0, 1.0, 1.0], 10) is None
+        assert size_counts([0, 1, 1, 1], 10) is None
+        assert size_counts([True, True, True], 10) is None
+        assert size_counts(list(range(1, 100)), 10) is None
+        assert size_counts(iter([1, 1, 1]), 10) is None
+        assert size_counts([1, 1, 1], float('inf')) is None
+        assert size_counts([2, 1, 1, 1, 1, 2, 2, 2], 10) == {1: 4, 2: 4}
+
+    def test_size_counts_stops_early(self, monkeypatch):
+        # Testa que a contagem para no bloco em que os tamanhos distintos passam
+        # do limite ou aparece um tipo diferente de int, sem ler o resto.
+        monkeypatch.setattr(packing, '_COUNT_BLOCK', 100)
+
+        class Requests:
+            def __init__(self, values):
+                self.values = values
+                self.read = 0
+
+            def __len__(self):
+                return len(self.values)
+
+            def __iter__(self):
+                for value in self.values:
+                    self.read += 1
+                    yield value
+
+        unique = Requests(list(range(1, 10001)))
+        assert size_counts(unique, 10) is None
+        assert unique.read <= 2600
+        mixed = Requests([1.5] + [1] * 9999)
+        assert size_counts(mixed, 10) is None
+        assert mixed.read <= 101
+        repeated = Requests([1, 2] * 5000)
+        assert size_counts(repeated, 10) == {1: 5000, 2: 5000}
+
+
+class TestSplitOversize:
+
+    def test_oversize_request_is_split(self):
+        # Testa a divisão em pedaços de n_max mais o resto, empacotado com os demais.
+        result = Orders().combine_orders([1000, 100, 250], 400, split_oversize=True)
+        assert result == [[400], [400], [250, 100], [200]]
+        assert list(result.oversize) == [0, 0, 0, 0]
+        assert result.sources[3] == [packing.Chunk(0, 200)]
+        assert result.sources[2] == [packing.Chunk(2, 250), packing.Chunk(1, 100)]
+
+    def test_exact_multiple_has_no_remainder(self):
+        # Testa que um múltiplo exato de n_max gera só pedaços cheios.
+        result = Orders().combine_orders([800, 50], 400, split_oversize=True)
+        assert result == [[400], [400], [50]]
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_provenance_adds_up(self, seed):
+        # Testa que os pedaços de cada pedido somam o tamanho original.
+        rng = random.Random(seed)
+        requests = [rng.randint(1, 2000) for _ in range(500)]
+        result = Orders().combine_orders(requests, 400, split_oversize=True)
+        totals = [0] * len(requests)
+        for group, sources in zip(result, result.sources):
+            assert sum(group) <= 400
+            assert group == [chunk.size for chunk in sources]
+            for chunk in sources:
+                totals[chunk.source] += chunk.size
+        assert totals == requests
+
+    def test_full_chunks_skip_packing(self):
+        # Testa que só os restos passam pelo encaixe: os pedaços cheios viram
+        # grupos diretamente, antes dos demais.
+        stats = Stats()
+        result = Orders(stats=stats).combine_orders([1000000, 3, 2500], 1000, split_oversize=True)
+        assert len(result) == 1003
+        assert result[:1002] == [[1000]] * 1002 and result[1002] == [500, 3]
+        assert result.sources[1001] == [packing.Chunk(2, 1000)]
+        assert stats.last.counters['items'] == 2
+        assert stats.last.counters['chunks'] == 1002
+
+    def test_records_keep_original_ids(self):
+        # Testa que, com pedidos identificados, os pedaços mantêm o ID original.
+        result = Orders().combine_orders([('a', 1000), ('b', 100)], 400, split_oversize=True)
+        assert result == [['a'], ['a'], ['a', 'b']]
+        assert list(result.loads) == [400, 400, 300]
@@ -0,0 +1,202 @@
+# Testes unitários para a paginação por cursor (pagination.py).
+
+import random
+from decimal import Decimal
+
+import pytest
+from src.contract import Contract
+from src.contract_index import ContractIndex
+from src.contracts import Contracts
+from src.instrumentation import Stats
+from src.pagination import Cursor, Page, page_after
+
+
+def _reference(contracts, renegotiated=()):
+    # Ordem de paginação de referência: débito decrescente, id crescente.
+    renegotiated = set(renegotiated)
+    return sorted((contract for contract in contracts if contract.id not in renegotiated),
+                  key=lambda contract: (-contract.debt, contract.id))
+
+
+def _all_pages(fetch, page_size):
+    # Percorre todas as páginas passando o token de cada uma à seguinte.
+    items = []
+    token = None
+    while True:
+        page = fetch(page_size, token)
+        assert len(page.items) <= page_size
+        items.extend(page.items)
+        if not page.has_next:
+            assert page.token is None
+            return items
+        assert len(page.items) == page_size
+        token = page.token
+
+
+class TestPageAfter:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        rng = random.Random(5)
+        # Poucos débitos distintos para forçar empates entre páginas.
+        self.contracts = [Contract(i, rng.randint(0, 30)) for i in rng.sample(range(5000), 1000)]
+
+    @pytest.mark.parametrize('page_size', [1, 7, 100, 999, 1000, 5000])
+    def test_pages_cover_reference_order(self, page_size):
+        # Testa que as páginas encadeadas reproduzem a ordenação completa.
+        pages = _all_pages(lambda size, token: page_after(self.contracts, size, token), page_size)
+        assert pages == _reference(self.contracts)
+
+    def test_cursor_forms(self):
+        # Testa cursor como Cursor, par (débito, id) e texto.
+        first = page_after(self.contracts, 10)
+        expected = _reference(self.contracts)[10:20]
+        assert page_after(self.contracts, 10, first.cursor).items == expected
+        assert page_after(self.contracts, 10, tuple(first.cursor)).items == expected
+        assert page_after(iter(self.contracts), 10, first.token).items == expected
+
+    def test_excluded_ids(self):
+        # Testa a exclusão de IDs junto com o filtro do cursor.
+        excluded = {contract.id for contract in self.contracts[::4]}
+        pages = _all_pages(
+            lambda size, token: page_after(self.contracts, size, token, excluded), 33)
+        assert pages == _reference(self.contracts, excluded)
+
+    def test_changes_between_pages(self):
+        # Testa que alterações antes do cursor não deslocam as páginas seguintes.
+        contracts = [Contract(i, 100 - i) for i in range(10)]
+        first = page_after(contracts, 3)
+        contracts.append(Contract(99, 1000))
+        contracts.pop(0)
+        assert [contract.id for contract in page_after(contracts, 3, first.cursor).items] == [3, 4, 5]
+
+    def test_empty_and_invalid(self):
+        # Testa entrada vazia, tamanho de página inválido e token malformado.
+        assert page_after([], 10) == Page([], None)
+        with pytest.raises(ValueError):
+            page_after(self.contracts, 0)
+        # 'WyJ4IiwxXQ' é ["x",1] (débito em texto) e 'WzFd' é [1]
+        for token in ['???', 'WyJ4IiwxXQ', 'WzFd']:
+            with pytest.raises(ValueError):
+                Cursor.from_token(token)
+
+    def test_token_round_trip(self):
+        # Testa o token com débitos decimais e IDs em texto.
+        cursor = Cursor(1234.5, 'C-42')
+        assert Cursor.from_token(cursor.token()) == cursor
+        assert '=' not in cursor.token()
+
+    def test_token_rejects_other_types(self):
+        # Testa que tipos que não voltam iguais do token são recusados, e que
+        # o Cursor continua utilizável diretamente.
+        for cursor in [Cursor(Decimal('10.5'), 1), Cursor(10, (1, 2)), Cursor(True, 1)]:
+            with pytest.raises(TypeError):
+                cursor.token()
+        contracts = [Contract(i, Decimal(i % 3)) for i in range(10)]
+        first = page_after(contracts, 4)
+        assert page_after(contracts, 4, first.cursor).items == _reference(contracts)[4:8]
+
+
+class TestContractIndexPages:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        rng = random.Random(9)
+        self.contracts = [Contract(i, rng.randint(0, 30)) for i in range(800)]
+        self.renegotiated = list(range(0, 800, 7))
+        self.index = ContractIndex(self.contracts, self.renegotiated)
+
+    @pytest.mark.parametrize('page_size', [1, 50, 800])
+    def test_pages_match_scan(self, page_size):
+        # Testa que as páginas do índice coincidem com a varredura.
+        pages = _all_pages(self.index.page, page_size)
+        assert pages == _reference(self.contracts, self.renegotiated)
+
+    def test_updates_between_pages(self):
+        # Testa que alterações no índice entram na ordenação da página seguinte.
+        first = self.index.page(10)
+        self.index.update_debt(first.items[0].id, 0)
+        self.index.insert(Contract(9999, 0))
+        self.index.close(self.contracts[1].id)
+        expected = page_after(list(self.index), 10, first.cursor, set(self.renegotiated)).items
+        assert self.index.page(10, first.cursor).items == expected
+        assert self.index.page(10).items[0] != first.items[0]
+
+    @pytest.mark.parametrize('seed', range(3))
+    def test_ordering_kept_in_sync(self, seed):
+        # Testa páginas intercaladas com inclusões, atualizações, encerramentos
+        # e (des)marcações de renegociação contra a varredura da carteira.
+        rng = random.Random(seed)
+        book = {contract.id: contract for contract in self.contracts}
+        renegotiated = set(self.renegotiated)
+        next_id = 1000
+        cursor = None
+
+        for _ in range(400):
+            operation = rng.random()
+            contract_id = rng.choice(list(book))
+            if operation < 0.3:
+                self.index.update_debt(contract_id, rng.randint(0, 30))
+            elif operation < 0.45:
+                book[next_id] = Contract(next_id, rng.randint(0, 30))
+                self.index.insert(book[next_id])
+                next_id += 1
+            elif operation < 0.55:
+                del book[contract_id]
+                renegotiated.discard(contract_id)
+                self.index.close(contract_id)
+            elif operation < 0.65:
+                renegotiated.add(contract_id)
+                self.index.mark_renegotiated(contract_id)
+            elif operation < 0.75 and renegotiated & set(book):
+                contract_id = rng.choice(sorted(renegotiated & set(book)))
+                renegotiated.discard(contract_id)
+                self.index.unmark_renegotiated(contract_id)
+            else:
+                page = self.index.page(20, cursor)
+                assert page == page_after(list(book.values()), 20, cursor, renegotiated)
+                cursor = page.cursor
+
+    def test_invalid_page_size(self):
+        # Testa tamanho de página inválido.
+        with pytest.raises(ValueError):
+            self.index.page(0)
+
+
+class TestContractsPages:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        rng = random.Random(13)
+        self.contracts = [Contract(i, rng.randint(0, 50)) for i in range(600)]
+        self.renegotiated = list(range(0, 600, 5))
+
+    def test_scan_and_index(self):
+        # Testa a paginação sobre lista e sobre ContractIndex, com renegociados.
+        api = Contracts()
+        expected = _reference(self.contracts, self.renegotiated)
+        assert _all_pages(lambda size, token: api.get_top_N_page(
+            self.contracts, self.renegotiated, size, token), 40) == expected
+
+        index = ContractIndex(self.contracts, self.renegotiated[:10])
+        assert _all_pages(lambda size, token: api.get_top_N_page(
+            index, self.renegotiated[10:], size, token), 40) == expected
+
+    def test_first_page_matches_top_n_debts(self):
+        # Testa que a primeira página traz os mesmos débitos do top N.
+        page = Contracts().get_top_N_page(self.contracts, self.renegotiated, 25)
+        top = Contracts().get_top_N_open_contracts(self.contracts, self.renegotiated, 25)
+        assert [contract.debt for contract in page.items] == [contract.debt for contract in top]
+
+    def test_stats(self):
+        # Testa o registro da consulta na instrumentação.
+        stats = Stats()
+        contracts = Contracts(stats=stats)
+        contracts.get_top_N_page(self.contracts, self.renegotiated, 10)
+        assert stats.last.operation == 'top_n_page'
+        assert set(stats.last.phases) == {'exclusion', 'select'}
+
+        contracts.get_top_N_page(ContractIndex(self.contracts), [], 10)
+        assert stats.last.info == {'path': 'index'}
+        with pytest.raises(ValueError):
+            contracts.get_top_N_page(self.contracts, [], 0)
@@ -0,0 +1,57 @@
+# Testes unitários para o empacotamento paralelo em shards.
+
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from src.orders import Orders
+from src.packing import pack
+from src.parallel_packing import pack_parallel
+
+
+def _items(groups):
+    return sorted(item for group in groups for item in group)
+
+
+class TestParallelPacking:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        rng = random.Random(3)
+        self.requests = [rng.randint(1, 600) for _ in range(4000)] + [1500, 2000]
+
+    def test_process_pool_keeps_all_requests(self):
+        # Testa o modo paralelo com processos reais.
+        groups = pack_parallel(self.requests, 1000, workers=2)
+
+        assert _items(groups) == sorted(self.requests)
+        assert all(sum(group) <= 1000 or len(group) == 1 for group in groups)
+        assert [1500] in groups and [2000] in groups
+
+    @pytest.mark.parametrize('shards', [2, 3, 8])
+    def test_group_count_close_to_serial(self, shards):
+        # Testa que o número de grupos fica próximo do FFD serial.
+        serial = len(pack(self.requests, 1000, 'ffd'))
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            groups = pack_parallel(self.requests, 1000, shards=shards, executor=executor)
+
+        assert _items(groups) == sorted(self.requests)
+        assert len(groups) <= serial * 1.02 + shards
+
+    def test_float_requests(self):
+        # Testa pedidos float, transportados em buffers 'd'.
+        requests = [request / 3 for request in self.requests]
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            groups = pack_parallel(requests, 333.5, shards=4, executor=executor)
+        assert _items(groups) == sorted(requests)
+
+    def test_small_input_uses_serial_path(self):
+        # Testa que poucos pedidos usam o caminho serial.
+        requests = [100, 200, 150, 300, 50, 250]
+        assert pack_parallel(requests, 400, shards=8) == pack(requests, 400, 'ffd')
+        assert Orders().combine_orders_parallel(requests, 400) == Orders().combine_orders(requests, 400)
+
+    def test_orders_invalid_input(self):
+        # Testa validação de entrada do modo paralelo.
+        assert Orders().combine_orders_parallel([], 400) == []
+        assert Orders().combine_orders_parallel([1, 2], 0) == []
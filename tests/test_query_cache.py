@@ -0,0 +1,103 @@
+# Testes unitários para o cache de consultas top N.
+
+import pytest
+from src.contract import Contract
+from src.contracts import Contracts
+
+
+class TestQueryCache:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        self.sample_contracts = [
+            Contract(1, 1000),
+            Contract(2, 2500),
+            Contract(3, 1500),
+            Contract(4, 3000),
+            Contract(5, 800),
+            Contract(6, 2000)
+        ]
+        self.renegotiated = [2, 5]
+        self.manager = Contracts(cache_size=4)
+
+    def _ids(self, contracts):
+        return [contract.id for contract in contracts]
+
+    def test_cache_disabled_by_default(self):
+        # Testa que o cache é opcional.
+        assert Contracts().cache_info() is None
+
+    def test_smaller_k_served_from_cache(self):
+        # Testa que um k menor é servido como fatia do resultado em cache.
+        self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 3)
+        result = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 2)
+
+        assert self._ids(result) == [4, 6]
+        info = self.manager.cache_info()
+        assert (info.hits, info.misses, info.currsize) == (1, 1, 1)
+
+    def test_larger_k_is_a_miss(self):
+        # Testa que um k maior recalcula a resposta.
+        self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 2)
+        result = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 3)
+
+        assert self._ids(result) == [4, 6, 3]
+        assert self.manager.cache_info().misses == 2
+
+    def test_exhausted_result_serves_larger_k(self):
+        # Testa que um resultado incompleto serve qualquer k maior.
+        self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 10)
+        result = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 50)
+
+        assert len(result) == 4
+        assert self.manager.cache_info().hits == 1
+
+    def test_returned_list_is_a_copy(self):
+        # Testa que modificar o resultado não altera o cache.
+        result = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 3)
+        result.clear()
+        again = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 3)
+        assert self._ids(again) == [4, 6, 3]
+
+    def test_size_change_invalidates(self):
+        # Testa que mudar o tamanho da lista invalida a resposta.
+        self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 1)
+        self.sample_contracts.append(Contract(7, 9999))
+        result = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 1)
+        assert self._ids(result) == [7]
+
+    def test_version_invalidates(self):
+        # Testa que uma nova versão invalida a resposta.
+        self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 1, version=1)
+        self.sample_contracts[0].debt = 9999
+        cached = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 1, version=1)
+        fresh = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 1, version=2)
+
+        assert self._ids(cached) == [4]
+        assert self._ids(fresh) == [1]
+
+    def test_invalidate_cache(self):
+        # Testa a invalidação explícita.
+        self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 1)
+        self.sample_contracts[0].debt = 9999
+        self.manager.invalidate_cache()
+        result = self.manager.get_top_N_open_contracts(self.sample_contracts, self.renegotiated, 1)
+        assert self._ids(result) == [1]
+
+    def test_lru_eviction(self):
+        # Testa o descarte da entrada usada há mais tempo.
+        lists = [list(self.sample_contracts) for _ in range(5)]
+        for contracts in lists:
+            self.manager.get_top_N_open_contracts(contracts, self.renegotiated, 1)
+
+        assert self.manager.cache_info().currsize == 4
+        self.manager.get_top_N_open_contracts(lists[0], self.renegotiated, 1)
+        assert self.manager.cache_info().hits == 0
+
+    def test_generators_are_not_cached(self):
+        # Testa que entradas sem tamanho passam direto, sem cache.
+        result = self.manager.get_top_N_open_contracts(
+            iter(self.sample_contracts), self.renegotiated, 2
+        )
+        assert self._ids(result) == [4, 6]
+        assert self.manager.cache_info().misses == 0
@@ -0,0 +1,133 @@
+# Testes unitários para o ranking por chaves compostas (ranking.py).
+
+import random
+from collections import namedtuple
+
+import pytest
+from src.contract import Contract
+from src.contracts import Contracts
+from src.instrumentation import Stats
+from src.ranking import Ranking, asc, desc, where
+from src.selection import STRATEGY_AUTO, STRATEGY_HEAP, STRATEGY_QUICKSELECT, STRATEGY_SORT
+
+STRATEGIES = [STRATEGY_AUTO, STRATEGY_HEAP, STRATEGY_QUICKSELECT, STRATEGY_SORT]
+
+Account = namedtuple('Account', 'id debt days_overdue region')
+
+
+def _accounts(n, seed=7):
+    # Contas com poucos valores distintos, para forçar empates.
+    rng = random.Random(seed)
+    return [Account(i, rng.randint(0, 20) * 100, rng.randint(0, 5), rng.choice('ABC'))
+            for i in range(n)]
+
+
+class TestRanking:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        self.accounts = _accounts(3000)
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    @pytest.mark.parametrize('top_n', [1, 10, 200, 2999, 5000])
+    def test_matches_sorted_reference(self, strategy, top_n):
+        # Testa chaves mistas (decrescentes e crescente) contra sorted().
+        ranking = Ranking(['-debt', 'days_overdue', '-id'])
+        expected = sorted(self.accounts, key=lambda a: (-a.debt, a.days_overdue, -a.id))[:top_n]
+        assert ranking.top(self.accounts, top_n, strategy) == expected
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    @pytest.mark.parametrize('top_n', [5, 300, 1000])
+    def test_filters_in_the_same_pass(self, strategy, top_n):
+        # Testa filtros por where() e por função, com entrada em iterador.
+        ranking = Ranking([desc('debt'), desc('days_overdue'), asc('id')],
+                          filters=[where('region', '==', 'A'), where('debt', '>=', 500),
+                                   lambda a: a.id % 2 == 0])
+        candidates = [a for a in self.accounts if a.region == 'A' and a.debt >= 500 and a.id % 2 == 0]
+        expected = sorted(candidates, key=lambda a: (-a.debt, -a.days_overdue, a.id))[:top_n]
+        assert ranking.top(self.accounts, top_n, strategy) == expected
+        assert ranking.top(iter(self.accounts), top_n, strategy) == expected
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    def test_full_ties_keep_input_order(self, strategy):
+        # Testa que empates em todas as chaves mantêm a ordem de entrada.
+        accounts = [Account(i, 100, 1, 'A') for i in range(10)]
+        assert Ranking(['-debt', 'days_overdue']).top(accounts, 4, strategy) == accounts[:4]
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    def test_ascending_text_key(self, strategy):
+        # Testa chave crescente não numérica (texto), usada no desempate.
+        accounts = [Account(name, debt, 0, 'A') for name, debt in
+                    [('c', 10), ('a', 10), ('b', 20), ('d', 10), ('e', 5)]]
+        ranking = Ranking([desc('debt'), asc('id', numeric=False)])
+        assert [a.id for a in ranking.top(accounts, 4, strategy)] == ['b', 'a', 'c', 'd']
+        # Textos decrescentes não precisam de numeric=False
+        assert [a.id for a in Ranking('-id').top(accounts, 2, strategy)] == ['e', 'd']
+
+    def test_callable_keys_and_fields(self):
+        # Testa funções como chave e como campo de filtro.
+        ranking = Ranking([lambda a: a.debt % 300, '-id'], filters=[where(len, '==', 4)])
+        expected = sorted(self.accounts, key=lambda a: (a.debt % 300, -a.id))[:15]
+        assert ranking.top(self.accounts, 15) == expected
+
+    def test_matches_and_filtered(self):
+        # Testa matches() e filtros extras sobre um ranking compilado.
+        ranking = Ranking('-debt', filters=[where('region', 'in', {'A', 'B'})])
+        assert ranking.matches(Account(1, 0, 0, 'B'))
+        assert not ranking.matches(Account(1, 0, 0, 'C'))
+
+        narrowed = ranking.filtered(where('id', 'not in', {1}))
+        assert not narrowed.matches(Account(1, 0, 0, 'A'))
+        assert narrowed.matches(Account(2, 0, 0, 'A'))
+        assert narrowed.key is ranking.key
+        assert Ranking('-debt').matches(Account(1, 0, 0, 'C'))
+
+    def test_top_n_not_positive(self):
+        # Testa que top_n <= 0 retorna lista vazia.
+        assert Ranking('-debt').top(self.accounts, 0) == []
+        assert Ranking('-debt').top(self.accounts, -1) == []
+
+    def test_invalid_specifications(self):
+        # Testa operador desconhecido, ranking sem chaves e especificações inválidas.
+        with pytest.raises(ValueError):
+            where('debt', '=>', 1)
+        with pytest.raises(ValueError):
+            Ranking([])
+        with pytest.raises(TypeError):
+            Ranking([42])
+        with pytest.raises(TypeError):
+            Ranking('-debt', filters=['debt > 1'])
+
+
+class TestContractsRanked:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        self.contracts = Contracts()
+        self.accounts = _accounts(500, seed=11)
+        self.renegotiated = list(range(0, 500, 3))
+
+    def test_excludes_renegotiated(self):
+        # Testa a exclusão dos renegociados junto com os filtros do ranking.
+        ranking = Ranking(['-debt', '-days_overdue', 'id'], filters=[where('region', '!=', 'C')])
+        excluded = set(self.renegotiated)
+        candidates = [a for a in self.accounts if a.id not in excluded and a.region != 'C']
+        expected = sorted(candidates, key=lambda a: (-a.debt, -a.days_overdue, a.id))[:25]
+
+        assert self.contracts.get_top_N_ranked(self.accounts, self.renegotiated, 25, ranking) == expected
+        assert self.contracts.get_top_N_ranked(
+            iter(self.accounts), frozenset(self.renegotiated), 25, ranking) == expected
+
+    def test_specification_list_and_contracts(self):
+        # Testa ranking como lista de chaves sobre objetos Contract.
+        contracts = [Contract(1, 100), Contract(2, 300), Contract(3, 300), Contract(4, 200)]
+        result = self.contracts.get_top_N_ranked(contracts, [4], 3, ['-debt', '-id'])
+        assert [contract.id for contract in result] == [3, 2, 1]
+        assert self.contracts.get_top_N_ranked(contracts, [], 0, ['-debt']) == []
+
+    def test_stats(self):
+        # Testa o registro da consulta na instrumentação.
+        stats = Stats()
+        Contracts(stats=stats).get_top_N_ranked(self.accounts, self.renegotiated, 5, ['-debt'])
+        assert stats.last.operation == 'top_n_ranked'
+        assert set(stats.last.phases) == {'exclusion', 'select'}
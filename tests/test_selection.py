@@ -0,0 +1,76 @@
+# Testes unitários para o motor de seleção parcial.
+
+import random
+
+import pytest
+from src.contract import Contract
+from src.contracts import Contracts
+from src.selection import (
+    STRATEGY_HEAP, STRATEGY_QUICKSELECT, STRATEGY_SORT,
+    choose_strategy, select_top_n
+)
+
+STRATEGIES = [STRATEGY_HEAP, STRATEGY_QUICKSELECT, STRATEGY_SORT]
+
+
+def _reference(contracts, top_n):
+    # Ordenação estável original, usada como referência.
+    return sorted(contracts, key=lambda contract: contract.debt, reverse=True)[:top_n]
+
+
+class TestSelection:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        rng = random.Random(42)
+        # Poucos valores distintos para forçar muitos empates.
+        self.contracts = [Contract(i, rng.randint(0, 50)) for i in range(2000)]
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    @pytest.mark.parametrize('top_n', [1, 7, 40, 500, 1999, 2000, 5000])
+    def test_strategies_match_stable_sort(self, strategy, top_n):
+        # Testa que todas as estratégias reproduzem a ordem da ordenação estável.
+        result = select_top_n(self.contracts, top_n, lambda c: c.debt, strategy=strategy)
+        assert result == _reference(self.contracts, top_n)
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    def test_ties_keep_input_order(self, strategy):
+        # Testa que empates mantêm a ordem de entrada.
+        contracts = [Contract(i, 100) for i in range(10)]
+        result = select_top_n(contracts, 4, lambda c: c.debt, strategy=strategy)
+        assert [contract.id for contract in result] == [0, 1, 2, 3]
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    def test_empty_input(self, strategy):
+        # Testa com entrada vazia.
+        assert select_top_n([], 3, lambda c: c.debt, strategy=strategy) == []
+
+    def test_non_positive_top_n(self):
+        # Testa com top_n zero ou negativo.
+        assert select_top_n(self.contracts, 0, lambda c: c.debt) == []
+        assert select_top_n(self.contracts, -2, lambda c: c.debt) == []
+
+    def test_unknown_strategy(self):
+        # Testa que uma estratégia desconhecida gera erro.
+        with pytest.raises(ValueError):
+            select_top_n(self.contracts, 3, lambda c: c.debt, strategy='bogus')
+
+    def test_choose_strategy(self):
+        # Testa a escolha automática da estratégia.
+        assert choose_strategy(10, None) == STRATEGY_HEAP
+        assert choose_strategy(10, 1000000) == STRATEGY_HEAP
+        assert choose_strategy(100000, 1000000) == STRATEGY_QUICKSELECT
+        assert choose_strategy(900000, 1000000) == STRATEGY_SORT
+
+    @pytest.mark.parametrize('strategy', STRATEGIES)
+    def test_contracts_accepts_strategy(self, strategy):
+        # Testa que Contracts repassa a estratégia escolhida.
+        renegotiated = list(range(0, 2000, 3))
+        result = Contracts().get_top_N_open_contracts(
+            self.contracts, renegotiated, 100, strategy=strategy
+        )
+        excluded = set(renegotiated)
+        expected = _reference(
+            [contract for contract in self.contracts if contract.id not in excluded], 100
+        )
+        assert result == expected
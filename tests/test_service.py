@@ -0,0 +1,111 @@
+# Testes unitários para o serviço asyncio (protocolo JSON por linha).
+
+import asyncio
+import json
+
+import pytest
+from src.service import OrderService
+
+
+async def exchange(service, lines):
+    # Abre o serviço em uma porta livre, envia as linhas por uma conexão e
+    # retorna as respostas indexadas pelo id.
+    await service.start('127.0.0.1', 0)
+    try:
+        reader, writer = await asyncio.open_connection(*service.address)
+        for line in lines:
+            writer.write(line if isinstance(line, bytes) else json.dumps(line).encode() + b'\n')
+        await writer.drain()
+        writer.write_eof()
+        responses = {}
+        async for raw in reader:
+            response = json.loads(raw)
+            responses[response['id']] = response
+        writer.close()
+        return responses
+    finally:
+        await service.close()
+
+
+class TestOrderService:
+
+    def test_top_n_and_combine_orders(self):
+        # Testa as duas operações por uma conexão TCP local.
+        responses = asyncio.run(exchange(OrderService(), [
+            {'id': 1, 'op': 'top_n', 'contracts': [[1, 1000], [2, 2500], [3, 1500]],
+             'renegotiated': [2], 'top_n': 2},
+            {'id': 2, 'op': 'combine_orders', 'requests': [100, 200, 150, 300, 50, 250], 'n_max': 400},
+            {'id': 3, 'op': 'combine_orders', 'requests': [['a', 300], ['b', 100]], 'n_max': 400},
+        ]))
+        assert responses[1] == {'id': 1, 'ok': True,
+                                'result': [{'id': 3, 'debt': 1500}, {'id': 1, 'debt': 1000}]}
+        assert responses[2]['result'] == {'groups': [[300, 100], [250, 150], [200, 50]],
+                                          'loads': [400, 400, 250]}
+        assert responses[3]['result']['groups'] == [['a', 'b']]
+
+    def test_errors_are_reported_per_request(self):
+        # Testa que pedidos inválidos recebem erro sem derrubar a conexão.
+        responses = asyncio.run(exchange(OrderService(), [
+            b'not json\n',
+            {'id': 1, 'op': 'bogus'},
+            {'id': 2, 'op': 'combine_orders', 'requests': [1, 2], 'n_max': 10, 'strategy': 'nope'},
+            {'id': 3, 'op': 'combine_orders', 'requests': [1, 2], 'n_max': 10},
+        ]))
+        assert responses[None]['ok'] is False
+        assert responses[1]['ok'] is False
+        assert responses[2]['ok'] is False and 'nope' in responses[2]['error']
+        assert responses[3] == {'id': 3, 'ok': True, 'result': {'groups': [[2, 1]], 'loads': [3]}}
+
+    def test_concurrent_requests_are_micro_batched(self, monkeypatch):
+        # Testa que pedidos concorrentes são executados em um único lote.
+        from src import service as service_module
+        sizes = []
+        original = service_module._run_combine_orders
+        monkeypatch.setattr(service_module, '_run_combine_orders',
+                            lambda jobs: sizes.append(len(jobs)) or original(jobs))
+
+        async def run():
+            service = OrderService(max_batch=100, batch_delay=0.05)
+            return await asyncio.gather(*[
+                service.handle({'id': index, 'op': 'combine_orders', 'requests': [index, 1], 'n_max': 100})
+                for index in range(20)
+            ])
+
+        responses = asyncio.run(run())
+        assert sizes == [20]
+        assert [response['result']['loads'] for response in responses] == [[index + 1] for index in range(20)]
+
+    def test_backpressure_limits_pending_requests(self, monkeypatch):
+        # Testa que no máximo max_pending pedidos ficam em andamento.
+        from src import service as service_module
+        active = []
+        peak = []
+        original = OrderService.handle
+
+        async def tracked(self, request):
+            active.append(1)
+            peak.append(len(active))
+            await asyncio.sleep(0.01)
+            try:
+                return await original(self, request)
+            finally:
+                active.pop()
+
+        monkeypatch.setattr(service_module.OrderService, 'handle', tracked)
+        lines = [{'id': index, 'op': 'combine_orders', 'requests': [1], 'n_max': 10} for index in range(30)]
+        responses = asyncio.run(exchange(OrderService(max_pending=4, batch_delay=0.001), lines))
+        assert len(responses) == 30
+        assert max(peak) <= 4
+
+    def test_line_too_long_closes_connection(self):
+        # Testa que linhas acima do limite são recusadas.
+        responses = asyncio.run(exchange(OrderService(max_line_bytes=64), [
+            {'id': 1, 'op': 'combine_orders', 'requests': list(range(100)), 'n_max': 10}]))
+        assert responses[None]['ok'] is False
+
+    def test_invalid_options(self):
+        # Testa a validação dos parâmetros do serviço.
+        with pytest.raises(ValueError):
+            OrderService(max_batch=0)
+        with pytest.raises(ValueError):
+            OrderService(max_pending=0)
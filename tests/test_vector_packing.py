@@ -0,0 +1,96 @@
+# Testes unitários para o empacotamento multidimensional.
+
+import random
+
+import pytest
+from src import vector_packing
+from src.order import Order
+from src.orders import Orders
+from src.vector_packing import pack_vectors
+
+
+def assert_valid(requests, capacities, assignment, loads):
+    # Verifica que as cargas batem com a atribuição e respeitam os limites
+    # (exceto em grupos de um único pedido acima do limite).
+    totals = {}
+    counts = {}
+    for request, group in zip(requests, assignment):
+        current = totals.get(group, (0,) * len(capacities))
+        totals[group] = tuple(a + b for a, b in zip(current, request))
+        counts[group] = counts.get(group, 0) + 1
+    assert [totals[group] for group in range(len(loads))] == list(loads)
+    for group, load in enumerate(loads):
+        if counts[group] > 1:
+            assert all(a <= c for a, c in zip(load, capacities))
+
+
+class TestVectorPacking:
+
+    def test_groups_respect_every_dimension(self):
+        # Testa que nenhum grupo excede o limite de qualquer dimensão.
+        rng = random.Random(3)
+        capacities = (100, 50, 10)
+        requests = [(rng.randint(1, 60), rng.randint(1, 30), rng.randint(1, 5))
+                    for _ in range(2000)]
+        assignment, loads = pack_vectors(requests, capacities)
+        assert_valid(requests, capacities, assignment, loads)
+
+    def test_basic_grouping(self):
+        # Testa um caso pequeno com resultado conhecido.
+        result = Orders().combine_orders_multi(
+            [(10, 1, 1), (5, 5, 1), (8, 2, 1), (20, 1, 1)], (15, 6, 3))
+        assert result == [[(20, 1, 1)], [(10, 1, 1), (5, 5, 1)], [(8, 2, 1)]]
+        assert list(result.loads) == [(20, 1, 1), (15, 6, 2), (8, 2, 1)]
+
+    def test_oversize_request_gets_own_group(self):
+        # Testa que um pedido acima do limite em alguma dimensão fica sozinho.
+        requests = [(5, 50), (5, 5), (5, 5)]
+        assignment, loads = pack_vectors(requests, (10, 10))
+        assert assignment[0] != assignment[1]
+        assert loads[assignment[0]] == (5, 50)
+        assert loads[assignment[1]] == (10, 10)
+
+    def test_dimension_mismatch_raises(self):
+        # Testa que pedidos com número errado de dimensões são rejeitados.
+        with pytest.raises(ValueError):
+            pack_vectors([(1, 2), (1, 2, 3)], (10, 10))
+
+    def test_unknown_ordering_and_placement_raise(self):
+        # Testa que ordenações e posicionamentos desconhecidos são rejeitados.
+        with pytest.raises(ValueError):
+            pack_vectors([(1, 2)], (10, 10), ordering='nope')
+        with pytest.raises(ValueError):
+            pack_vectors([(1, 2)], (10, 10), placement='nope')
+
+    @pytest.mark.parametrize('ordering', [None, 'norm', 'sum', 'max'])
+    @pytest.mark.parametrize('placement', ['first', 'dot'])
+    def test_numpy_matches_pure_python(self, monkeypatch, ordering, placement):
+        # Testa que o caminho NumPy e o Python puro produzem o mesmo resultado.
+        pytest.importorskip('numpy')
+        rng = random.Random(7)
+        capacities = (1000, 300)
+        requests = [(rng.randint(1, 700), rng.randint(0, 200)) for _ in range(1500)]
+        expected = pack_vectors(requests, capacities, ordering, placement)
+        monkeypatch.setattr(vector_packing, 'np', None)
+        assert pack_vectors(requests, capacities, ordering, placement) == expected
+
+    def test_single_dimension_matches_ffd(self):
+        # Testa que, com uma dimensão e First Fit, o resultado equivale ao FFD.
+        rng = random.Random(11)
+        sizes = [rng.randint(1, 600) for _ in range(1000)]
+        result = Orders().combine_orders_multi([(size,) for size in sizes], (1000,))
+        expected = Orders().combine_orders(sizes, 1000)
+        # Dentro de cada grupo os pedidos ficam na ordem de entrada
+        assert [sorted((vector[0] for vector in group), reverse=True) for group in result] == expected
+
+    def test_order_records_return_ids(self):
+        # Testa que objetos Order produzem grupos de IDs.
+        requests = [Order('a', (6, 1)), Order('b', (5, 5)), Order('c', (4, 4))]
+        result = Orders().combine_orders_multi(requests, (10, 10))
+        # (5, 5) tem a maior norma normalizada e é encaixado primeiro
+        assert result == [['b', 'c'], ['a']]
+        assert list(result.loads) == [(9, 9), (6, 1)]
+
+    def test_empty_input(self):
+        # Testa que a lista vazia retorna nenhum grupo.
+        assert Orders().combine_orders_multi([], (10, 10)) == []
@@ -0,0 +1,86 @@
+# Testes unitários para o caminho vetorizado (NumPy) de top N.
+
+import random
+
+import pytest
+from src import vectorized
+from src.contract_batch import ContractBatch
+from src.contracts import Contracts
+from src.selection import STRATEGY_SORT
+
+
+class TestVectorized:
+
+    def setup_method(self):
+        # Setup executado antes de cada teste.
+        rng = random.Random(7)
+        self.size = 5000
+        self.ids = list(range(self.size))
+        # Poucos valores distintos para forçar empates.
+        self.debts = [rng.randint(0, 40) for _ in range(self.size)]
+        self.renegotiated = rng.sample(self.ids, 700) + ['ABC', 999999]
+        self.manager = Contracts()
+
+    def _pairs(self, contracts):
+        return [(contract.id, contract.debt) for contract in contracts]
+
+    def test_from_arrays_matches_pure_python(self):
+        # Testa que o resultado por colunas é igual ao caminho em Python puro.
+        expected = self.manager.get_top_N_open_contracts(
+            ContractBatch(self.ids, self.debts), self.renegotiated, 300, strategy=STRATEGY_SORT
+        )
+        result = self.manager.get_top_N_open_contracts_from_arrays(
+            self.ids, self.debts, self.renegotiated, 300
+        )
+        assert self._pairs(result) == self._pairs(expected)
+
+    @pytest.mark.parametrize('top_n', [1, 50, 1000, 4300, 10000])
+    def test_numpy_positions_match_stable_sort(self, top_n):
+        # Testa que argpartition + limiar reproduz a ordem da ordenação estável.
+        np = pytest.importorskip('numpy')
+        excluded = set(self.renegotiated)
+        expected = sorted(
+            (position for position in range(self.size) if self.ids[position] not in excluded),
+            key=lambda position: self.debts[position], reverse=True
+        )[:top_n]
+        result = vectorized.top_n_positions(
+            np.array(self.ids), np.array(self.debts), excluded, top_n
+        )
+        assert result.tolist() == expected
+
+    def test_numpy_path_returns_python_scalars(self):
+        # Testa que os contratos gerados pelo caminho NumPy usam tipos Python.
+        np = pytest.importorskip('numpy')
+        result = self.manager.get_top_N_open_contracts_from_arrays(
+            np.array(self.ids), np.array(self.debts, dtype=float), [], 5
+        )
+        assert all(type(contract.id) is int for contract in result)
+        assert all(type(contract.debt) is float for contract in result)
+
+    @pytest.mark.parametrize('as_array', [False, True])
+    def test_numpy_ids_and_exclusions_match_pure_python(self, as_array):
+        # Testa IDs e renegociados NumPy (lista de np.int64 ou array) nos dois
+        # caminhos, com o mesmo resultado e os mesmos tipos.
+        np = pytest.importorskip('numpy')
+        ids = np.arange(self.size)
+        debts = np.array(self.debts)
+        renegotiated = np.array(self.renegotiated[:700])
+        if not as_array:
+            renegotiated = list(renegotiated)
+
+        vectorized_result = self.manager.get_top_N_open_contracts_from_arrays(
+            ids, debts, renegotiated, 300)
+        pure_result = self.manager.get_top_N_open_contracts_from_arrays(
+            ids, debts, renegotiated, 300, strategy=STRATEGY_SORT)
+        assert self._pairs(vectorized_result) == self._pairs(pure_result)
+        assert not set(self.renegotiated[:700]) & {contract.id for contract in pure_result}
+        assert all(type(contract.id) is int for contract in vectorized_result + pure_result)
+
+    def test_fallback_without_numpy(self, monkeypatch):
+        # Testa que, sem NumPy, o caminho em Python puro é usado.
+        monkeypatch.setattr(vectorized, 'np', None)
+        assert not vectorized.available()
+        result = self.manager.get_top_N_open_contracts_from_arrays(
+            self.ids, self.debts, self.renegotiated, 10
+        )
+        assert len(result) == 10